@@ -0,0 +1,79 @@
+"""Measures how a burst of concurrent full-vault calls affects the server.
+
+Starts the server over stdio with the result cache disabled, then fires
+`--burst` identical calls of an expensive tool at once, together with a
+stream of cheap single-note reads. Reports the wall time of the burst and the
+latency of the cheap reads issued while it was running.
+
+Usage:
+    python benchmarks/concurrency_benchmark.py --vault /path/to/vault --note some/note.md
+        [--burst 8] [--tool get_all_tags] [--args '{}'] [--reads 20]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+
+async def _timed(session, tool, tool_args):
+    started = time.perf_counter()
+    result = await session.call_tool(tool, tool_args)
+    if result.isError:
+        raise RuntimeError(f"{tool} failed: {result.content}")
+    return time.perf_counter() - started
+
+
+async def _cheap_reads(session, note, reads):
+    timings = []
+    for _ in range(reads):
+        timings.append(await _timed(session, "get_note_content", {"note_path": note}))
+        await asyncio.sleep(0.01)
+    return timings
+
+
+async def bench(env, options):
+    params = StdioServerParameters(command=sys.executable, args=["-m", "obsidian_mcp_server", "--transport", "stdio"], env=env)
+    tool_args = json.loads(options.args)
+    with open(os.devnull, "w") as server_log:
+        async with stdio_client(params, errlog=server_log) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                await session.initialize()
+                single = await _timed(session, options.tool, tool_args) # Also builds the index
+                single = await _timed(session, options.tool, tool_args)
+                started = time.perf_counter()
+                burst = asyncio.gather(*(_timed(session, options.tool, tool_args) for _ in range(options.burst)))
+                reads = await _cheap_reads(session, options.note, options.reads)
+                await burst
+                burst_time = time.perf_counter() - started
+    print(f"single {options.tool}: {single * 1000:8.1f} ms")
+    print(f"burst of {options.burst}:    {burst_time * 1000:8.1f} ms wall")
+    print(f"cheap reads during burst: median {statistics.median(reads) * 1000:.1f} ms   max {max(reads) * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vault", help="Vault to serve (defaults to the configured OMCP_OBSIDIAN_VAULT_PATH)")
+    parser.add_argument("--note", required=True, help="Note read by the cheap calls (vault-relative path)")
+    parser.add_argument("--burst", type=int, default=8)
+    parser.add_argument("--tool", default="get_all_tags")
+    parser.add_argument("--args", default="{}", help="JSON arguments for the tool")
+    parser.add_argument("--reads", type=int, default=20)
+    options = parser.parse_args()
+
+    env = dict(os.environ, OMCP_RESULT_CACHE_MB="0")
+    if options.vault:
+        env["OMCP_OBSIDIAN_VAULT_PATH"] = os.path.abspath(options.vault)
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [repo_root, env.get("PYTHONPATH")]))
+    asyncio.run(bench(env, options))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Measures the memory footprint of the vault index, in bytes per note.
+
+Builds the catalog, the link graph and each derived index (BM25, frontmatter,
+trigram signatures, tasks, MinHash) in-process and reports what each costs,
+measured with tracemalloc, next to the index's own estimate (which the memory budget,
+OMCP_INDEX_MEMORY_BUDGET_MB, relies on). Without --vault, a synthetic vault
+with links, tags, headings, frontmatter and tasks is generated first.
+
+Usage:
+    python benchmarks/memory_benchmark.py [--notes 20000] [--vault /path/to/vault]
+"""
+
+import argparse
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+WORDS = ("alpha beta gamma delta epsilon zeta theta kappa lambda sigma omega river mountain forest "
+         "project meeting review design budget travel reading garden music health").split()
+
+
+def generate_vault(root, notes, seed=7):
+    """Writes `notes` synthetic notes spread over nested folders."""
+    rng = random.Random(seed)
+    folders = [f"Area {a}/Topic {t}" for a in range(20) for t in range(10)]
+    for folder in folders:
+        os.makedirs(os.path.join(root, folder), exist_ok=True)
+    for i in range(notes):
+        links = " ".join(f"[[Note {rng.randrange(notes)}]]" for _ in range(5))
+        tags = " ".join(f"#{rng.choice(WORDS)}" for _ in range(3))
+        body = " ".join(rng.choice(WORDS) for _ in range(120))
+        text = (f"---\nstatus: {rng.choice(('open', 'done'))}\naliases: [N{i}]\n---\n"
+                f"# Note {i}\n{body}\n\n## Links\n{links} {tags}\n\n## Tasks\n"
+                f"- [ ] follow up on {rng.choice(WORDS)} 📅 2024-0{rng.randrange(1, 10)}-1{rng.randrange(10)}\n")
+        with open(os.path.join(root, folders[i % len(folders)], f"Note {i}.md"), "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+def measure(build):
+    """Runs build() under tracemalloc; returns its result, the bytes it retained and the seconds it took."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    return result, tracemalloc.get_traced_memory()[0] - before, elapsed
+
+
+def report(label, retained, count, elapsed, estimate=None):
+    line = f"{label:<14} {retained / count:>9.0f} B/note  {retained / 2**20:>8.1f} MB  {elapsed:>6.2f}s"
+    if estimate is not None:
+        line += f"  (estimate {estimate / count:.0f} B/note)"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--notes", type=int, default=20000, help="Notes in the generated vault")
+    parser.add_argument("--vault", help="Measure this vault instead of a generated one")
+    options = parser.parse_args()
+
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sys.path.insert(0, repo_root)
+    temporary = None
+    vault = options.vault
+    if not vault:
+        temporary = tempfile.TemporaryDirectory()
+        vault = temporary.name
+        print(f"Generating {options.notes} notes...")
+        generate_vault(vault, options.notes)
+    os.environ["OMCP_OBSIDIAN_VAULT_PATH"] = os.path.abspath(vault)
+
+    from obsidian_mcp_server.utils.vault_index import VaultIndex
+    from obsidian_mcp_server.utils.text_similarity import BM25Model
+    from obsidian_mcp_server.utils.bulk_edit import FrontmatterIndex, TrigramSignatures
+    from obsidian_mcp_server.utils.task_index import TaskIndex
+    from obsidian_mcp_server.utils.near_duplicates import MinHashIndex
+    from obsidian_mcp_server.utils import vault_registry
+
+    with vault_registry.use_vault():
+        VaultIndex(vault).refresh() # Warm imports and the I/O pool outside the measurements
+        tracemalloc.start()
+        index = VaultIndex(vault)
+        _, retained, elapsed = measure(index.refresh)
+        count = len(index.note_paths())
+        print(f"{count} notes")
+        report("catalog", retained, count, elapsed, index.estimated_bytes())
+        _, retained, elapsed = measure(index.link_graph)
+        report("link graph", retained, count, elapsed)
+        for name, factory in (("bm25", BM25Model), ("frontmatter", FrontmatterIndex),
+                              ("trigrams", TrigramSignatures), ("tasks", TaskIndex),
+                              ("minhash", MinHashIndex)):
+            component, retained, elapsed = measure(lambda: index.get_component(name, factory))
+            report(name, retained, count, elapsed, component.estimated_bytes())
+        total = tracemalloc.get_traced_memory()[0]
+        print(f"{'total':<14} {total / count:>9.0f} B/note  {total / 2**20:>8.1f} MB"
+              f"  (index estimate {index.estimated_bytes() / count:.0f} B/note)")
+    if temporary:
+        temporary.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Measures server startup: time from process spawn to the first responses.
+
+Spawns the server over stdio (as MCP clients do), then reports the time until
+the `initialize` response, the latency of a first tool call, and the total time
+to that first tool response. `--delay` waits between the two, like a client
+that lists tools or waits for user input first; the background index warm-up
+runs during that gap.
+
+Usage:
+    python benchmarks/startup_benchmark.py --vault /path/to/vault [--runs 5]
+        [--tool get_unresolved_links] [--args '{}'] [--delay 0]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+SERVER_COMMAND = [sys.executable, "-m", "obsidian_mcp_server", "--transport", "stdio"]
+
+
+def _request(proc, message):
+    proc.stdin.write((json.dumps(message) + "\n").encode("utf-8"))
+    proc.stdin.flush()
+
+
+def _read_response(proc, request_id):
+    """Reads stdout lines until the JSON-RPC response with the given id arrives."""
+    while True:
+        line = proc.stdout.readline()
+        if not line:
+            raise RuntimeError("Server exited before responding")
+        message = json.loads(line)
+        if message.get("id") == request_id:
+            if "error" in message:
+                raise RuntimeError(f"Server returned an error: {message['error']}")
+            return message
+
+
+def measure_once(env, tool, tool_args, delay):
+    """Returns seconds to the initialize response, first tool call latency, and seconds to its response."""
+    started = time.perf_counter()
+    proc = subprocess.Popen(SERVER_COMMAND, env=env,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        _request(proc, {"jsonrpc": "2.0", "id": 1, "method": "initialize", "params": {
+            "protocolVersion": "2024-11-05", "capabilities": {},
+            "clientInfo": {"name": "startup-benchmark", "version": "1.0"}}})
+        _read_response(proc, 1)
+        initialized = time.perf_counter() - started
+        _request(proc, {"jsonrpc": "2.0", "method": "notifications/initialized"})
+        time.sleep(delay)
+        called = time.perf_counter()
+        _request(proc, {"jsonrpc": "2.0", "id": 2, "method": "tools/call",
+                        "params": {"name": tool, "arguments": tool_args}})
+        _read_response(proc, 2)
+        answered = time.perf_counter()
+    finally:
+        proc.stdin.close()
+        proc.wait(timeout=10)
+    return initialized, answered - called, answered - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vault", help="Vault to serve (defaults to the configured OMCP_OBSIDIAN_VAULT_PATH)")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--tool", default="get_unresolved_links", help="Tool used for the first call")
+    parser.add_argument("--args", default="{}", help="JSON arguments for the first call")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds between initialize and the first call")
+    options = parser.parse_args()
+
+    env = dict(os.environ)
+    if options.vault:
+        env["OMCP_OBSIDIAN_VAULT_PATH"] = os.path.abspath(options.vault)
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [repo_root, env.get("PYTHONPATH")]))
+
+    results = [measure_once(env, options.tool, json.loads(options.args), options.delay) for _ in range(options.runs)]
+    labels = ("initialize response", f"{options.tool} latency", "first tool response")
+    for label, values in zip(labels, zip(*results)):
+        print(f"{label:>32}: median {statistics.median(values) * 1000:8.1f} ms   "
+              f"min {min(values) * 1000:8.1f} ms   max {max(values) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Compares per-call round-trip latency of the stdio and SSE transports.
+
+Starts the server once per transport (`python -m obsidian_mcp_server --transport ...`),
+connects with the MCP client library, and times repeated calls of one tool.
+The default tool, list_vaults, does no vault I/O, so the numbers are dominated
+by transport overhead (framing, HTTP, event loop hops).
+
+Usage:
+    python benchmarks/transport_benchmark.py --vault /path/to/vault [--calls 500]
+        [--tool list_vaults] [--args '{}'] [--port 8765]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.sse import sse_client
+from mcp.client.stdio import stdio_client
+
+
+async def _time_calls(session, tool, tool_args, calls):
+    await session.initialize()
+    await session.call_tool(tool, tool_args) # Warm-up call (first-use imports, index load)
+    timings = []
+    for _ in range(calls):
+        started = time.perf_counter()
+        await session.call_tool(tool, tool_args)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def bench_stdio(env, tool, tool_args, calls):
+    params = StdioServerParameters(command=sys.executable, args=["-m", "obsidian_mcp_server", "--transport", "stdio"], env=env)
+    with open(os.devnull, "w") as server_log:
+        async with stdio_client(params, errlog=server_log) as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                return await _time_calls(session, tool, tool_args, calls)
+
+
+def _wait_for_port(host, port, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f"SSE server did not start listening on {host}:{port}")
+
+
+async def bench_sse(env, tool, tool_args, calls, port):
+    env = dict(env, OMCP_SERVER_HOST="127.0.0.1", OMCP_SERVER_PORT=str(port))
+    server = subprocess.Popen([sys.executable, "-m", "obsidian_mcp_server", "--transport", "sse"], env=env,
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_for_port("127.0.0.1", port)
+        async with sse_client(f"http://127.0.0.1:{port}/sse") as (read_stream, write_stream):
+            async with ClientSession(read_stream, write_stream) as session:
+                return await _time_calls(session, tool, tool_args, calls)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+def _report(label, timings):
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:>6}: median {statistics.median(timings) * 1000:7.3f} ms   "
+          f"mean {statistics.mean(timings) * 1000:7.3f} ms   p95 {p95 * 1000:7.3f} ms   ({len(timings)} calls)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vault", help="Vault to serve (defaults to the configured OMCP_OBSIDIAN_VAULT_PATH)")
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--tool", default="list_vaults")
+    parser.add_argument("--args", default="{}", help="JSON arguments for the tool")
+    parser.add_argument("--port", type=int, default=8765, help="Port for the SSE server")
+    options = parser.parse_args()
+
+    env = dict(os.environ)
+    if options.vault:
+        env["OMCP_OBSIDIAN_VAULT_PATH"] = os.path.abspath(options.vault)
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [repo_root, env.get("PYTHONPATH")]))
+    tool_args = json.loads(options.args)
+
+    _report("stdio", await bench_stdio(env, options.tool, tool_args, options.calls))
+    _report("sse", await bench_sse(env, options.tool, tool_args, options.calls, options.port))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,109 @@
+"""Measures read throughput of multi-worker serving as the worker count grows.
+
+For each worker count, starts `python -m obsidian_mcp_server --transport
+streamable-http --workers N`, then runs several client processes that call one
+tool back to back over HTTP for a fixed time, and reports calls per second.
+Scaling is bounded by the number of CPU cores.
+
+Usage:
+    python benchmarks/workers_benchmark.py --vault /path/to/vault [--workers 1 2 4]
+        [--clients 8] [--seconds 10] [--tool search_notes_content] [--args '{"query": "project"}']
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+HOST = "127.0.0.1"
+
+
+def _wait_for_port(port, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((HOST, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Server did not start listening on port {port}")
+
+
+def _post(connection, message, headers):
+    """POSTs a JSON-RPC message; returns (response, decoded JSON reply or None)."""
+    connection.request("POST", "/mcp", json.dumps(message), headers)
+    response = connection.getresponse()
+    data = response.read()
+    if response.getheader("Content-Type", "").startswith("text/event-stream"):
+        # Stateful single-process mode answers with a one-event SSE stream
+        data = next((line[5:] for line in data.splitlines() if line.startswith(b"data:")), b"")
+    return response, json.loads(data) if data.strip() else None
+
+
+def _client(port, tool, tool_args, seconds):
+    """Calls the tool repeatedly on one keep-alive connection; returns the number of calls."""
+    headers = {"Content-Type": "application/json", "Accept": "application/json, text/event-stream"}
+    connection = http.client.HTTPConnection(HOST, port)
+    response, _ = _post(connection, {"jsonrpc": "2.0", "id": 0, "method": "initialize", "params": {
+        "protocolVersion": "2025-03-26", "capabilities": {}, "clientInfo": {"name": "workers-benchmark", "version": "1.0"}}}, headers)
+    session_id = response.getheader("mcp-session-id")
+    if session_id:
+        headers["mcp-session-id"] = session_id
+    _post(connection, {"jsonrpc": "2.0", "method": "notifications/initialized"}, headers)
+    call = {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {"name": tool, "arguments": tool_args}}
+    calls = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        response, payload = _post(connection, call, headers)
+        if response.status != 200 or payload["result"].get("isError"):
+            raise RuntimeError(f"Tool call failed: {payload}")
+        calls += 1
+    return calls
+
+
+def run(workers, options, env):
+    env = dict(env, OMCP_SERVER_HOST=HOST, OMCP_SERVER_PORT=str(options.port))
+    command = [sys.executable, "-m", "obsidian_mcp_server", "--transport", "streamable-http", "--workers", str(workers)]
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        _wait_for_port(options.port)
+        tool_args = json.loads(options.args)
+        _client(options.port, options.tool, tool_args, 1.0) # Warm up every worker's index
+        with ProcessPoolExecutor(options.clients) as pool:
+            futures = [pool.submit(_client, options.port, options.tool, tool_args, options.seconds)
+                       for _ in range(options.clients)]
+            calls = sum(f.result() for f in futures)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    print(f"workers={workers:<3} {calls / options.seconds:9.1f} calls/s   ({calls} calls, {options.clients} clients)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vault", help="Vault to serve (defaults to the configured OMCP_OBSIDIAN_VAULT_PATH)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--tool", default="search_notes_content")
+    parser.add_argument("--args", default='{"query": "project"}', help="JSON arguments for the tool")
+    parser.add_argument("--port", type=int, default=8766)
+    options = parser.parse_args()
+
+    env = dict(os.environ)
+    if options.vault:
+        env["OMCP_OBSIDIAN_VAULT_PATH"] = os.path.abspath(options.vault)
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [repo_root, env.get("PYTHONPATH")]))
+    print(f"{os.cpu_count()} CPU cores")
+    for workers in options.workers:
+        run(workers, options, env)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""Allows running the server with `python -m obsidian_mcp_server [--transport stdio|sse]`."""
+
+from obsidian_mcp_server.main import main
+
+main()
@@ -1,8 +1,11 @@
 """Configuration loading for the Obsidian MCP Server."""
 
 import os
+import logging
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
 
 class Settings(BaseSettings):
     """Defines application settings, loadable from env vars or .env file."""
@@ -23,10 +26,51 @@ class Settings(BaseSettings):
     daily_note_location: str = "Journal/Daily" # Default to Vault Root
     daily_note_format: str = "%Y-%m-%d" # Default to YYYY-MM-DD
     daily_note_template_path: Optional[str] = None # Default to no template
+    # Custom {{placeholders}} for daily-note templates, as a JSON object of name -> value
+    daily_note_template_variables: Dict[str, str] = {}
+
+    # --- Multi-Vault Configuration ---
+    # Additional vaults served by this process, as a JSON object of name -> path.
+    # The vault above is always available under the name "default".
+    vaults: Dict[str, str] = {}
+    io_workers: int = 8               # Thread pool shared by all vaults for file reads
+    index_memory_budget_mb: int = 0   # Shared cap on index and cached-result memory (0 = unlimited)
 
     # --- Backup Configuration ---
     backup_dir_name: str = "_mcp_backups"
 
+    # --- Change Journal Configuration ---
+    # Journal file of note changes, at each vault's root (empty disables the journal)
+    change_journal_name: str = ".mcp_changes.jsonl"
+
+    # --- Index Configuration ---
+    # Minimum seconds between stat walks that detect external edits to the vault
+    index_rescan_interval: float = 2.0
+    # Build each vault's index in the background once the server is up
+    index_warm_up: bool = True
+
+    # --- Result Cache Configuration ---
+    # Memory for cached search/aggregate tool results, in MB (0 disables the cache)
+    result_cache_mb: int = 64
+
+    # --- Admission Control Configuration ---
+    # Concurrent calls per cost class as JSON, e.g. {"scan": 4} (see utils/admission.py)
+    admission_limits: Dict[str, int] = {}
+    # Calls of one class allowed to wait for a slot before new ones are rejected (0 = unlimited)
+    admission_queue_limit: int = 64
+
+    # --- Diagnostics Configuration ---
+    # Tool calls taking at least this long are logged with phase timings (0 disables)
+    slow_call_threshold_ms: int = 1000
+    # Directory receiving cProfile output of profiled tools (profiling is off while unset)
+    profile_dir: Optional[str] = None
+    # Tools profiled from startup; more can be switched on with the set_tool_profiling tool
+    profile_tools: List[str] = []
+
+    # --- Append Queue Configuration ---
+    # Seconds over which daily-note appends are coalesced into one write (0 disables)
+    append_coalesce_window: float = 0.0
+
     # Pydantic Settings configuration
     model_config = SettingsConfigDict(
         env_file='.env',          # Load .env file if it exists
@@ -39,18 +83,18 @@ class Settings(BaseSettings):
 # Create a single instance of the settings to be imported by other modules
 settings = Settings()
 
-# --- Optional: Add some validation or path resolution logic here ---
-# Example: Resolve vault path to absolute path immediately
+# --- Path resolution and validation ---
+# Only pure path checks happen at import time; the vault directories themselves
+# are checked on first use (see vault_registry), keeping server startup fast.
 settings.obsidian_vault_path = os.path.abspath(settings.obsidian_vault_path)
 
-# Example: Basic validation for daily note location (more complex needed for {{date}} syntax)
-if settings.daily_note_location not in ["/", "."] and not os.path.isdir(os.path.join(settings.obsidian_vault_path, settings.daily_note_location)):
-    # Check if it's a *potential* directory within the vault, even if it doesn't exist yet
+# Basic validation for daily note location (more complex needed for {{date}} syntax)
+if settings.daily_note_location not in ["/", "."]:
+    # The folder may not exist yet (it is created with the first daily note), but it must be within the vault
     potential_path = os.path.abspath(os.path.join(settings.obsidian_vault_path, settings.daily_note_location))
     if not potential_path.startswith(settings.obsidian_vault_path):
-         print(f"Warning: Daily note location '{settings.daily_note_location}' seems invalid or outside vault. Defaulting to root.")
+         logger.warning(f"Daily note location '{settings.daily_note_location}' seems invalid or outside vault. Defaulting to root.")
          settings.daily_note_location = "/"
-    # Else: Assume it's a valid relative path that might be created later #
 
 # print(f"Configuration loaded. Vault Path: {settings.obsidian_vault_path}") # REMOVED - Interferes with MCP stdio communication #
 
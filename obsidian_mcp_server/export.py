@@ -0,0 +1,51 @@
+"""Command-line bulk export: `obsidian-mcp-export [--format jsonl|tar] [filters]`.
+
+Streams every matching note of a vault to stdout (or a file) without starting
+the MCP server, for ingestion pipelines that would otherwise rebuild the vault
+through thousands of list_notes/get_note_content calls.
+"""
+
+import sys
+import argparse
+import logging
+# Import export utilities and the registry
+from obsidian_mcp_server.utils import vault_export, vault_registry
+from obsidian_mcp_server.utils.exceptions import VaultError
+
+
+def main(argv=None):
+    """Command-line entry point (`obsidian-mcp-export`).
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:]).
+    """
+    parser = argparse.ArgumentParser(prog="obsidian-mcp-export", description="Stream the notes of an Obsidian vault as JSONL or tar.")
+    parser.add_argument("--format", choices=["jsonl", "tar"], default="jsonl",
+                        help="jsonl: one JSON object per note (path, modified, frontmatter, body, links, tags). "
+                             "tar: the note files unchanged, as an uncompressed tar stream.")
+    parser.add_argument("--vault", help="Name of the vault to export (see OMCP_VAULTS; defaults to the default vault)")
+    parser.add_argument("--folder", help="Only notes in this vault-relative folder (recursive)")
+    parser.add_argument("--tag", help="Only notes with this tag or a tag nested under it")
+    parser.add_argument("--modified-since", help="Only notes modified at or after this ISO date or datetime")
+    parser.add_argument("-o", "--output", help="Write to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    # Diagnostics go to stderr; stdout carries the export
+    logging.basicConfig(stream=sys.stderr, level=logging.WARNING, format="%(name)s - %(levelname)s - %(message)s")
+    write = vault_export.write_tar if args.format == "tar" else vault_export.write_jsonl
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        with vault_registry.use_vault(args.vault):
+            count = write(out, folder=args.folder, tag=args.tag, modified_since=args.modified_since)
+    except VaultError as e:
+        parser.exit(1, f"obsidian-mcp-export: {e}\n")
+    finally:
+        if args.output:
+            out.close()
+        else:
+            out.flush()
+    print(f"Exported {count} notes", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
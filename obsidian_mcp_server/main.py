@@ -10,9 +10,13 @@
 # Import the FastMCP application instance from mcp_server
 # Use absolute import based on package structure
 from obsidian_mcp_server.mcp_server import mcp_app
+from obsidian_mcp_server import workers
 
 # Import logging and config
+import sys
+import argparse
 import logging
+import logging.config
 from obsidian_mcp_server.config import settings # Assuming config might be needed
 
 # Configure logging explicitly for DEBUG level
@@ -50,9 +54,8 @@ LOGGING_CONFIG = {
             "level": "DEBUG",
             # "propagate": False, # Try removing this - let messages propagate
         },
-        # Explicitly set the vault_writer logger to DEBUG
+        # Explicitly set the vault_writer logger to DEBUG (its records reach stderr via the parent)
         "obsidian_mcp_server.utils.vault_writer": {
-            "handlers": ["default"],
             "level": "DEBUG",
             "propagate": True, # Ensure messages also go to parent if needed
         },
@@ -62,20 +65,49 @@ LOGGING_CONFIG = {
 # --- End Uvicorn Logging Configuration ---
 
 # --- Main Execution Block ---
-if __name__ == "__main__":
-    # Configuration (use settings from config.py if available)
-    HOST = settings.server_host # Get host from config
-    PORT = settings.server_port # Get port from config
+def main(argv=None):
+    """Command-line entry point (`obsidian-mcp-server`): runs the server on the chosen transport.
+
+    Args:
+        argv: Command-line arguments (defaults to sys.argv[1:]).
+    """
+    parser = argparse.ArgumentParser(prog="obsidian-mcp-server", description="MCP server exposing an Obsidian vault.")
+    parser.add_argument(
+        "--transport", choices=["stdio", "sse", "streamable-http"], default="sse",
+        help="stdio: speak MCP over stdin/stdout (for clients that launch the server, e.g. Claude Desktop). "
+             "sse: serve HTTP + Server-Sent Events on OMCP_SERVER_HOST:OMCP_SERVER_PORT (default). "
+             "streamable-http: serve MCP's streamable HTTP transport (at /mcp) on the same address."
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Number of request worker processes (streamable-http only). With more than one, an indexer "
+             "process owns the vault indexes and executes writes; workers serve reads from shared snapshots."
+    )
+    args = parser.parse_args(argv)
+    if args.workers > 1 and args.transport != "streamable-http":
+        parser.error("--workers requires --transport streamable-http")
+
+    # All logging goes to stderr; with the stdio transport stdout carries only protocol messages
+    logging.config.dictConfig(LOGGING_CONFIG)
+
+    if args.transport != "stdio":
+        # Configuration (use settings from config.py if available)
+        HOST = settings.server_host # Get host from config
+        PORT = settings.server_port # Get port from config
+        print(f"Starting Obsidian MCP Server (via FastMCP internal server) on http://{HOST}:{PORT}", file=sys.stderr)
 
-    print(f"Starting Obsidian MCP Server (via FastMCP internal server) on http://{HOST}:{PORT}")
-    
-    # Directly run the FastMCP app, specifying SSE transport
     # Host/Port are configured during FastMCP initialization in mcp_server.py
     # log_config is not directly supported by FastMCP.run() (uses internal logging)
     try:
-        mcp_app.run(transport="sse") # Specify transport="sse"
+        if args.workers > 1:
+            workers.serve(args.workers)
+        else:
+            mcp_app.run(transport=args.transport)
     except Exception as run_e:
-         print(f"An unexpected error occurred trying to run the MCP server: {run_e}")
+         print(f"An unexpected error occurred trying to run the MCP server: {run_e}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
 
 # Remove old FastAPI app instantiation and uvicorn.run call
 # app = FastAPI(...) 
@@ -1,19 +1,33 @@
 import datetime
+import time
+import functools
+import inspect
+from contextlib import asynccontextmanager
 from typing import Any, Dict, Optional, List
 import json # Import json
+import logging
 
 # Import the high-level server interface
 from mcp.server.fastmcp import FastMCP, Context # Assuming Context might be needed later
 
 # Import utility functions
 # Use absolute import based on package structure
-from obsidian_mcp_server.utils import vault_reader, vault_writer, vault_search, daily_notes
+from obsidian_mcp_server.utils import vault_reader, vault_writer, vault_search, daily_notes, vault_graph, vault_index, note_ranges, text_similarity, vault_export, change_journal, note_mover, bulk_edit, task_index, transclusion, near_duplicates, vault_registry, result_cache, admission, call_trace
 
 # Import our custom exceptions
-from obsidian_mcp_server.utils.exceptions import VaultError, NoteNotFoundError, InvalidPathError, MetadataError, BackupError, NoteCreationError
+from obsidian_mcp_server.utils.exceptions import VaultError, NoteNotFoundError, InvalidPathError, MetadataError, BackupError, NoteCreationError, SectionNotFoundError
 
 # Import our central config
 from obsidian_mcp_server.config import settings
+from obsidian_mcp_server import workers
+
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def server_lifespan(server):
+    """Entered once the transport is up: starts building the vault indexes in the background."""
+    vault_registry.start_warm_up()
+    yield {}
 
 # --- Instantiate FastMCP Server ---
 # Give it a name relevant to its function
@@ -21,48 +35,118 @@ from obsidian_mcp_server.config import settings
 mcp_app = FastMCP(
     "Obsidian Vault Access", 
     host=settings.server_host, 
-    port=settings.server_port
+    port=settings.server_port,
+    lifespan=server_lifespan
 )
 
+# Tools that modify the vault, by name (run by the indexer process in multi-worker mode)
+WRITE_TOOLS = {}
+
+def vault_tool(cost="read", writes=False, cached=False):
+    """Registers a tool with an extra optional `vault` argument (defaults to the default vault).
+
+    The wrapped function runs with that vault selected (see vault_registry.use_vault),
+    so the utility functions it calls act on the chosen vault. It runs on the thread
+    pool of its cost class (see utils/admission.py), off the event loop, and is
+    traced for the slow-call log and profiling (see utils/call_trace.py).
+
+    Args:
+        cost: Cost class: "read" for single-note reads, "scan" for tools that walk
+            or aggregate the whole vault. Write tools always use "write".
+        writes: True for tools that modify the vault. In a request worker (see
+            workers.py) these are forwarded to the indexer process.
+        cached: True for read-only tools whose results depend only on their arguments
+            and the vault's notes; results are reused until the vault changes. "links"
+            for tools that depend only on which notes exist and how they link; their
+            results survive edits that leave links and aliases alone (see
+            utils/result_cache.py). Tools returning note content are not cached.
+    """
+    def decorator(func):
+        if writes:
+            WRITE_TOOLS[func.__name__] = func
+        signature = inspect.signature(func)
+        @functools.wraps(func)
+        async def wrapper(*args, vault: Optional[str] = None, **kwargs):
+            submitted = time.perf_counter()
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults() # f(x) and f(x, limit=20) are the same call
+            def call():
+                if writes and workers.is_worker():
+                    forward = lambda: workers.forward_write(func.__name__, vault, args, kwargs)
+                    return call_trace.traced_call(func.__name__, bound.arguments, vault or vault_registry.DEFAULT_VAULT_NAME, forward, submitted)
+                with vault_registry.use_vault(vault) as selected:
+                    if cached:
+                        depends = "links" if cached == "links" else "notes"
+                        body = lambda: result_cache.cached_call(func.__name__, bound.arguments, lambda: func(*args, **kwargs), depends)
+                    else:
+                        body = lambda: func(*args, **kwargs)
+                    return call_trace.traced_call(func.__name__, bound.arguments, selected.name, body, submitted)
+            if writes:
+                return await admission.run("write", None, call)
+            # Identical concurrent reads share one computation
+            key = (vault or vault_registry.DEFAULT_VAULT_NAME, func.__name__, json.dumps(bound.arguments, sort_keys=True, default=str))
+            return await admission.run(cost, key, call)
+        vault_param = inspect.Parameter("vault", inspect.Parameter.KEYWORD_ONLY, default=None, annotation=Optional[str])
+        wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), vault_param])
+        return mcp_app.tool()(wrapper)
+    return decorator
+
 # --- Define MCP Resources (Read-only operations IDENTIFIED BY URI) ---
 
 # (No resources defined for now, as all require parameters)
 
 # --- Define MCP Tools (Actions / Reads requiring parameters) ---
 
-# Changed from resource to tool
 @mcp_app.tool()
+def list_vaults() -> List[Dict[str, Any]]:
+    """MCP Tool: Lists the vaults this server serves. Pass a vault's name as `vault` to any other tool to use it."""
+    return vault_registry.list_vaults()
+
+@mcp_app.tool()
+def get_cache_stats() -> Dict[str, Any]:
+    """MCP Tool: Reports result cache hit/miss counts and hit rates (overall and per tool) and its size."""
+    return result_cache.get_cache_stats()
+
+@mcp_app.tool()
+async def set_tool_profiling(tool_name: str, enabled: bool = True) -> List[str]:
+    """MCP Tool: Starts or stops profiling every call of a tool (cProfile output goes to OMCP_PROFILE_DIR). Returns the profiled tools. With several workers, affects only the worker serving this call."""
+    if tool_name not in {tool.name for tool in await mcp_app.list_tools()}:
+        raise VaultError(f"Unknown tool: {tool_name}")
+    return call_trace.set_profiling(tool_name, enabled)
+
+# Changed from resource to tool
+@vault_tool(cost="scan", cached=True)
 def search_notes_content(query: str) -> List[str]:
     """MCP Tool: Searches the content of all notes for a query string."""
     try:
         return vault_search.search_notes_content(query)
     except VaultError as e:
         # TODO: Map to specific MCP error (e.g., Internal Server Error)
-        print(f"Error in search_notes_content tool: {e}")
+        logger.error(f"Error in search_notes_content tool: {e}")
         raise # Let FastMCP handle for now
 
 # Changed from resource to tool
-@mcp_app.tool()
+@vault_tool(cost="scan", cached=True)
 def search_notes_metadata(query: str) -> List[str]:
     """MCP Tool: Searches the metadata of all notes for a query string."""
     try:
         return vault_search.search_notes_metadata(query)
     except VaultError as e:
-        print(f"Error in search_notes_metadata tool: {e}")
+        logger.error(f"Error in search_notes_metadata tool: {e}")
         raise
 
 # Changed from resource to tool
-@mcp_app.tool()
+@vault_tool(cost="scan")
 def search_folders(query: str) -> List[str]:
     """MCP Tool: Searches for folders whose names contain the query string."""
     try:
         return vault_search.search_folders(query)
     except VaultError as e:
-        print(f"Error in search_folders tool: {e}")
+        logger.error(f"Error in search_folders tool: {e}")
         raise
 
 # Changed from resource to tool
-@mcp_app.tool()
+@vault_tool()
 def get_daily_note_path(target_date_iso: Optional[str] = None) -> str:
     """MCP Tool: Calculates the path for a daily note. Raises error if path invalid."""
     target_dt = None
@@ -77,103 +161,260 @@ def get_daily_note_path(target_date_iso: Optional[str] = None) -> str:
         # get_daily_note_path now raises error instead of returning None
         return path
     except (VaultError, InvalidPathError) as e:
-        print(f"Error in get_daily_note_path tool: {e}")
+        logger.error(f"Error in get_daily_note_path tool: {e}")
         raise
 
 
 # --- Tools (Previously Resources, now Tools) ---
 
 # Changed from resource to tool
-@mcp_app.tool()
+@vault_tool()
 def list_folders(relative_path: str = ".") -> List[str]:
     """MCP Tool: Lists subfolders within a given relative path."""
     try:
         # list_folders now raises error instead of returning None
         return vault_reader.list_folders(relative_path)
     except (VaultError, InvalidPathError) as e:
-        print(f"Error in list_folders tool: {e}")
+        logger.error(f"Error in list_folders tool: {e}")
         raise # Let FastMCP handle exceptions
 
-@mcp_app.tool()
+@vault_tool()
 def list_notes(relative_path: str = ".") -> List[str]:
     """MCP Tool: Lists markdown notes within a given relative path."""
     try:
         # list_notes now raises error instead of returning None
         return vault_reader.list_notes(relative_path)
     except (VaultError, InvalidPathError) as e:
-        print(f"Error in list_notes tool: {e}")
+        logger.error(f"Error in list_notes tool: {e}")
         raise
 
-@mcp_app.tool()
+@vault_tool()
 def get_note_content(note_path: str) -> str:
     """MCP Tool: Reads the full content of a specific note file."""
     try:
         # get_note_content now raises error instead of returning None
         return vault_reader.get_note_content(note_path)
     except (VaultError, InvalidPathError, NoteNotFoundError) as e:
-        print(f"Error in get_note_content tool: {e}")
+        logger.error(f"Error in get_note_content tool: {e}")
         raise
 
-@mcp_app.tool()
+@vault_tool()
+def get_note_range(note_path: str, start_line: int = 1, end_line: Optional[int] = None) -> Dict[str, Any]:
+    """MCP Tool: Reads lines start_line..end_line (1-based, inclusive) of a note. 'next_line' is the continuation point (None at end of file)."""
+    try:
+        return note_ranges.get_note_range(note_path, start_line, end_line)
+    except (VaultError, InvalidPathError, NoteNotFoundError) as e:
+        logger.error(f"Error in get_note_range tool: {e}")
+        raise
+
+@vault_tool()
+def get_note_tail(note_path: str, n_lines: int = 50, end_offset: Optional[int] = None) -> Dict[str, Any]:
+    """MCP Tool: Reads the last n_lines of a note. Pass the returned 'start_offset' as end_offset to page further back."""
+    try:
+        return note_ranges.get_note_tail(note_path, n_lines, end_offset)
+    except (VaultError, InvalidPathError, NoteNotFoundError) as e:
+        logger.error(f"Error in get_note_tail tool: {e}")
+        raise
+
+@vault_tool()
+def get_note_outline(note_path: str) -> List[Dict[str, Any]]:
+    """MCP Tool: Lists a note's headings with their level and byte range, without returning the note body."""
+    try:
+        return vault_index.get_note_outline(note_path)
+    except (VaultError, InvalidPathError, NoteNotFoundError) as e:
+        logger.error(f"Error in get_note_outline tool: {e}")
+        raise
+
+@vault_tool()
+def get_note_section(note_path: str, heading: str, include_heading: bool = True) -> str:
+    """MCP Tool: Reads only the section under a heading (up to the next heading of the same or higher level)."""
+    try:
+        return vault_index.get_note_section(note_path, heading, include_heading)
+    except (VaultError, InvalidPathError, NoteNotFoundError, SectionNotFoundError) as e:
+        logger.error(f"Error in get_note_section tool: {e}")
+        raise
+
+@vault_tool()
+def get_note_expanded(note_path: str, max_depth: int = 3, max_bytes: int = 200000) -> Dict[str, Any]:
+    """MCP Tool: Reads a note with its ![[embeds]] (notes, #sections, #^blocks) replaced by their content, recursively up to max_depth levels and max_bytes. Embeds that are unresolved or cyclic are listed and left as written."""
+    try:
+        return transclusion.get_note_expanded(note_path, max_depth, max_bytes)
+    except (VaultError, InvalidPathError, NoteNotFoundError) as e:
+        logger.error(f"Error in get_note_expanded tool: {e}")
+        raise
+
+@vault_tool()
 def get_note_metadata(note_path: str) -> Dict[str, Any]:
     """MCP Tool: Reads the YAML frontmatter metadata from a note file."""
     try:
         # get_note_metadata returns {} on parse error, raises on read error
         return vault_reader.get_note_metadata(note_path)
     except (VaultError, InvalidPathError, NoteNotFoundError, MetadataError) as e:
-        print(f"Error in get_note_metadata tool: {e}")
+        logger.error(f"Error in get_note_metadata tool: {e}")
         raise
 
-@mcp_app.tool()
+@vault_tool()
 def get_outgoing_links(note_path: str) -> List[str]:
     """MCP Tool: Finds all outgoing Obsidian links [[...]] in a note."""
     try:
         return vault_reader.get_outgoing_links(note_path)
     except (VaultError, InvalidPathError, NoteNotFoundError) as e:
-        print(f"Error in get_outgoing_links tool: {e}")
+        logger.error(f"Error in get_outgoing_links tool: {e}")
         raise
 
-@mcp_app.tool()
+@vault_tool(cost="scan", cached="links")
 def get_backlinks(note_path: str) -> str:
     """MCP Tool: Finds all notes linking to the target note_path. Returns a JSON list of paths."""
     try:
         backlink_list = vault_reader.get_backlinks(note_path)
         return json.dumps(backlink_list) # Return as JSON string
     except (NoteNotFoundError, InvalidPathError, VaultError) as e:
-        print(f"Error in get_backlinks tool: {e}")
+        logger.error(f"Error in get_backlinks tool: {e}")
         raise # Propagate known errors
     except Exception as e:
-        print(f"Unexpected error in get_backlinks tool: {e}")
+        logger.error(f"Unexpected error in get_backlinks tool: {e}")
         raise VaultError(f"Unexpected error finding backlinks for {note_path}: {e}") from e
 
-@mcp_app.tool()
+@vault_tool()
+def get_resolved_links(note_path: str) -> List[Dict[str, Any]]:
+    """MCP Tool: Resolves each outgoing link of a note to the note path it points to (None if unresolved)."""
+    try:
+        return vault_index.get_resolved_links(note_path)
+    except (VaultError, InvalidPathError, NoteNotFoundError) as e:
+        logger.error(f"Error in get_resolved_links tool: {e}")
+        raise
+
+@vault_tool(cost="scan", cached="links")
+def get_unresolved_links() -> Dict[str, List[str]]:
+    """MCP Tool: Lists links that point to no existing note, grouped by the note containing them."""
+    try:
+        return vault_index.get_unresolved_links()
+    except VaultError as e:
+        logger.error(f"Error in get_unresolved_links tool: {e}")
+        raise
+
+@vault_tool(cost="scan", cached=True)
 def get_all_tags() -> str: # Return type is now a JSON string
     """MCP Tool: Scans the entire vault for tags (frontmatter and inline) and returns a unique list as a JSON string."""
     try:
         tag_list = vault_reader.get_all_tags()
         return json.dumps(tag_list) # Explicitly dump list to JSON string
     except VaultError as e: # Catch potential general VaultErrors from os.walk etc.
-        print(f"Error in get_all_tags tool: {e}")
+        logger.error(f"Error in get_all_tags tool: {e}")
+        raise
+
+# --- Graph Tools (served from the in-memory link graph) ---
+
+@vault_tool()
+def get_note_neighborhood(note_path: str, depth: int = 1, direction: str = "both") -> Dict[str, int]:
+    """MCP Tool: Returns all notes within `depth` link hops of a note, mapped to their distance. direction: 'out', 'in' or 'both'."""
+    try:
+        return vault_graph.get_neighborhood(note_path, depth, direction)
+    except (VaultError, InvalidPathError, NoteNotFoundError) as e:
+        logger.error(f"Error in get_note_neighborhood tool: {e}")
+        raise
+
+@vault_tool()
+def find_link_path(source_note_path: str, target_note_path: str, directed: bool = False) -> List[str]:
+    """MCP Tool: Finds the shortest chain of links between two notes. Returns an empty list if they are not connected."""
+    try:
+        return vault_graph.find_shortest_path(source_note_path, target_note_path, directed)
+    except (VaultError, InvalidPathError, NoteNotFoundError) as e:
+        logger.error(f"Error in find_link_path tool: {e}")
+        raise
+
+@vault_tool(cost="scan", cached="links")
+def find_orphan_notes() -> List[str]:
+    """MCP Tool: Lists notes that have neither outgoing links nor backlinks."""
+    try:
+        return vault_graph.find_orphan_notes()
+    except VaultError as e:
+        logger.error(f"Error in find_orphan_notes tool: {e}")
+        raise
+
+@vault_tool(cost="scan", cached="links")
+def find_dead_end_notes() -> List[str]:
+    """MCP Tool: Lists notes that are linked to but contain no outgoing links."""
+    try:
+        return vault_graph.find_dead_end_notes()
+    except VaultError as e:
+        logger.error(f"Error in find_dead_end_notes tool: {e}")
+        raise
+
+@vault_tool(cost="scan", cached="links")
+def get_central_notes(limit: int = 20) -> List[Dict[str, Any]]:
+    """MCP Tool: Ranks notes by PageRank centrality over the link graph and returns the top `limit`."""
+    try:
+        return vault_graph.get_central_notes(limit)
+    except VaultError as e:
+        logger.error(f"Error in get_central_notes tool: {e}")
+        raise
+
+@vault_tool(cost="scan", cached=True)
+def find_related_notes(note_path: str, k: int = 10) -> List[Dict[str, Any]]:
+    """MCP Tool: Finds the k notes whose text is most similar to a note (local BM25, no external service)."""
+    try:
+        return text_similarity.find_related_notes(note_path, k)
+    except (VaultError, InvalidPathError, NoteNotFoundError) as e:
+        logger.error(f"Error in find_related_notes tool: {e}")
+        raise
+
+@vault_tool(cost="scan", cached=True)
+def find_duplicate_notes(threshold: float = 0.8, limit: int = 100) -> Dict[str, Any]:
+    """MCP Tool: Finds pairs of near-duplicate notes (estimated Jaccard similarity of word shingles >= threshold, via MinHash/LSH). Returns 'pairs' (most similar first) and 'total'."""
+    try:
+        return near_duplicates.find_duplicate_notes(threshold, limit)
+    except VaultError as e:
+        logger.error(f"Error in find_duplicate_notes tool: {e}")
+        raise
+
+@vault_tool(cost="scan", cached=True)
+def find_similar_by_content(note_path: str, threshold: float = 0.5, k: int = 10) -> List[Dict[str, Any]]:
+    """MCP Tool: Finds up to k notes sharing word sequences with a note (copies, near-duplicates), with estimated similarity >= threshold."""
+    try:
+        return near_duplicates.find_similar_by_content(note_path, threshold, k)
+    except (VaultError, InvalidPathError, NoteNotFoundError) as e:
+        logger.error(f"Error in find_similar_by_content tool: {e}")
+        raise
+
+@vault_tool()
+def get_changes_since(cursor: int = 0, limit: int = 100) -> Dict[str, Any]:
+    """MCP Tool: Lists note changes (create, edit, append, metadata, delete; made through the server or externally) after sequence number `cursor`. Pass the returned 'next_cursor' next time to sync incrementally."""
+    try:
+        vault_index.get_index().refresh() # Journals external edits made since the last rescan
+        return change_journal.get_changes_since(cursor, limit)
+    except VaultError as e:
+        logger.error(f"Error in get_changes_since tool: {e}")
+        raise
+
+@vault_tool(cost="scan")
+def export_notes(folder: Optional[str] = None, tag: Optional[str] = None, modified_since: Optional[str] = None,
+                 after: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+    """MCP Tool: Exports notes (path, modified, frontmatter, body, links, tags) a page at a time, optionally filtered by folder, tag or modified_since (ISO date). Pass the returned 'next_after' as `after` to get the next page. For whole-vault exports use the obsidian-mcp-export command."""
+    try:
+        return vault_export.export_page(folder, tag, modified_since, after, limit)
+    except (VaultError, InvalidPathError) as e:
+        logger.error(f"Error in export_notes tool: {e}")
         raise
 
 # --- Writer Tools (Already tools, unchanged) ---
 
-@mcp_app.tool()
+@vault_tool(writes=True)
 def create_note(relative_note_path: str, content: str = "", metadata: Optional[Dict[str, Any]] = None) -> bool:
     """MCP Tool: Creates a new note file with optional YAML frontmatter."""
     return vault_writer.create_note(relative_note_path, content, metadata=metadata)
 
-@mcp_app.tool()
+@vault_tool(writes=True)
 def edit_note(relative_note_path: str, new_content: str, backup: bool = True) -> bool:
     """MCP Tool: Overwrites an existing note with new content, with backup option."""
     return vault_writer.edit_note(relative_note_path, new_content, backup)
 
-@mcp_app.tool()
+@vault_tool(writes=True)
 def append_to_note(relative_note_path: str, content: str, backup: bool = True) -> bool:
     """MCP Tool: Appends content to the end of an existing note, with backup option."""
     return vault_writer.append_to_note(relative_note_path, content, backup)
 
-@mcp_app.tool()
+@vault_tool(writes=True)
 def update_note_metadata(relative_note_path: str, metadata_updates: Dict[str, Any], backup: bool = True) -> bool:
     """MCP Tool: Updates the YAML frontmatter of an existing note, with backup option."""
     # Return the boolean or raise the VaultError
@@ -182,38 +423,126 @@ def update_note_metadata(relative_note_path: str, metadata_updates: Dict[str, An
         raise result # Let FastMCP handle the error
     return result # Return the boolean
 
-@mcp_app.tool()
+@vault_tool(writes=True)
+def bulk_update_metadata(updates: Dict[str, Any], folder: Optional[str] = None, tag: Optional[str] = None,
+                         where: Optional[Dict[str, Any]] = None, dry_run: bool = False, backup: bool = True) -> Dict[str, Any]:
+    """MCP Tool: Sets frontmatter `updates` on every note matching all given selectors: folder ('.' for the whole vault), tag, and `where` (frontmatter key -> value; list fields match if they contain the value). With dry_run, only returns the matching paths. Changed notes are backed up together in one backup set; returns per-note results."""
+    try:
+        return bulk_edit.bulk_update_metadata(updates, folder, tag, where, dry_run, backup)
+    except (VaultError, InvalidPathError) as e:
+        logger.error(f"Error in bulk_update_metadata tool: {e}")
+        raise
+
+@vault_tool(writes=True)
+def replace_in_notes(pattern: str, replacement: str, folder: Optional[str] = None, tag: Optional[str] = None,
+                     where: Optional[Dict[str, Any]] = None, regex: bool = False, case_sensitive: bool = True,
+                     dry_run: bool = True, backup: bool = True) -> Dict[str, Any]:
+    """MCP Tool: Finds and replaces text (or a regex with `regex`) in every note matching all given selectors: folder ('.' for the whole vault), tag, and `where` (frontmatter key -> value). Dry run by default; returns per-note replacement counts and a short diff instead of note contents. Changed notes are backed up together in one backup set."""
+    try:
+        return bulk_edit.replace_in_notes(pattern, replacement, folder, tag, where, regex, case_sensitive, dry_run, backup)
+    except (VaultError, InvalidPathError) as e:
+        logger.error(f"Error in replace_in_notes tool: {e}")
+        raise
+
+@vault_tool(writes=True)
 def delete_note(relative_note_path: str, backup: bool = True) -> bool:
     """MCP Tool: Deletes a note file, optionally creating a backup first."""
     try:
         # vault_writer.delete_note raises exceptions on failure
         return vault_writer.delete_note(relative_note_path, backup)
     except (NoteNotFoundError, InvalidPathError, BackupError, VaultError) as e:
-        print(f"Error in delete_note tool: {e}")
+        logger.error(f"Error in delete_note tool: {e}")
         raise # Let FastMCP handle the error propagation
 
-@mcp_app.tool()
-def create_daily_note(target_date_iso: Optional[str] = None, force_create: bool = False) -> Optional[str]:
-    """MCP Tool: Creates a daily note (date optional, defaults today). Returns path or None."""
+@vault_tool(writes=True)
+def move_note(source_path: str, destination_path: str, backup: bool = True) -> Dict[str, Any]:
+    """MCP Tool: Moves or renames a note and rewrites the [[links]] pointing to it. Returns moved paths and rewritten notes."""
+    try:
+        return note_mover.move_note(source_path, destination_path, backup)
+    except (NoteNotFoundError, InvalidPathError, NoteCreationError, VaultError) as e:
+        logger.error(f"Error in move_note tool: {e}")
+        raise
+
+@vault_tool(writes=True)
+def move_folder(source_folder: str, destination_folder: str, backup: bool = True) -> Dict[str, Any]:
+    """MCP Tool: Moves or renames a folder and rewrites the [[links]] pointing to notes in it."""
+    try:
+        return note_mover.move_folder(source_folder, destination_folder, backup)
+    except (NoteNotFoundError, InvalidPathError, NoteCreationError, VaultError) as e:
+        logger.error(f"Error in move_folder tool: {e}")
+        raise
+
+@vault_tool(cost="scan", cached=True)
+def query_tasks(status: str = "open", due_before: Optional[str] = None, tag: Optional[str] = None,
+                folder: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+    """MCP Tool: Finds checkbox tasks across the vault from the task index. status: open, done, cancelled, in_progress, a comma-separated list, or all. due_before: YYYY-MM-DD (due dates come from '📅 YYYY-MM-DD' or 'due:: YYYY-MM-DD'). Returns tasks with path, line, status, text, due and tags, plus the total count."""
+    try:
+        return task_index.query_tasks(status, due_before, tag, folder, limit)
+    except (VaultError, InvalidPathError) as e:
+        logger.error(f"Error in query_tasks tool: {e}")
+        raise
+
+@vault_tool(cost="scan")
+def get_daily_notes(start_date_iso: str, end_date_iso: str, sections: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """MCP Tool: Returns the existing daily notes from start to end (YYYY-MM-DD, inclusive, at most a year) in date order. With `sections` (headings), returns only those sections of each note instead of the full content."""
+    try:
+        start_dt = datetime.date.fromisoformat(start_date_iso)
+        end_dt = datetime.date.fromisoformat(end_date_iso)
+    except ValueError as e:
+        logger.error(f"Error in get_daily_notes tool: invalid date ({e}). Use YYYY-MM-DD.")
+        raise VaultError(f"Invalid date: {e}. Use YYYY-MM-DD.") from e
+    try:
+        return daily_notes.get_daily_notes(start_dt, end_dt, sections)
+    except VaultError as e:
+        logger.error(f"Error in get_daily_notes tool: {e}")
+        raise
+
+@vault_tool(writes=True)
+def toggle_task(note_path: str, line: int, backup: bool = True) -> Dict[str, Any]:
+    """MCP Tool: Toggles the task checkbox on one line of a note (open -> done, anything else -> open), changing only that character."""
+    try:
+        return task_index.toggle_task(note_path, line, backup)
+    except (VaultError, InvalidPathError, NoteNotFoundError, BackupError) as e:
+        logger.error(f"Error in toggle_task tool: {e}")
+        raise
+
+@vault_tool(writes=True)
+def create_daily_note(target_date_iso: Optional[str] = None, force_create: bool = False, variables: Optional[Dict[str, str]] = None) -> Optional[str]:
+    """MCP Tool: Creates a daily note (date optional, defaults today) from the daily template, filling {{date}}, {{title}}, {{time}} and custom `variables`. Returns path or None."""
     target_dt = None
     if target_date_iso:
         try:
             target_dt = datetime.date.fromisoformat(target_date_iso)
         except ValueError:
-            print(f"Error: Invalid date format: {target_date_iso}. Use YYYY-MM-DD.")
+            logger.error(f"Invalid date format: {target_date_iso}. Use YYYY-MM-DD.")
             return None # Or raise?
-    return daily_notes.create_daily_note(target_dt, force_create)
+    return daily_notes.create_daily_note(target_dt, force_create, variables)
 
-@mcp_app.tool()
-def append_to_daily_note(content_to_append: str, target_date_iso: Optional[str] = None, backup: bool = True) -> bool:
-    """MCP Tool: Appends content to a daily note (date optional, defaults today)."""
+@vault_tool(writes=True)
+def create_daily_notes(start_date_iso: str, end_date_iso: str, variables: Optional[Dict[str, str]] = None) -> Dict[str, List[str]]:
+    """MCP Tool: Creates the daily notes for every date from start to end (YYYY-MM-DD, inclusive, at most a year) in one batch. Existing notes are left alone. Returns the 'created' and 'existing' paths."""
+    try:
+        start_dt = datetime.date.fromisoformat(start_date_iso)
+        end_dt = datetime.date.fromisoformat(end_date_iso)
+    except ValueError as e:
+        logger.error(f"Error in create_daily_notes tool: invalid date ({e}). Use YYYY-MM-DD.")
+        raise VaultError(f"Invalid date: {e}. Use YYYY-MM-DD.") from e
+    try:
+        return daily_notes.create_daily_notes(start_dt, end_dt, variables)
+    except (VaultError, InvalidPathError, NoteCreationError) as e:
+        logger.error(f"Error in create_daily_notes tool: {e}")
+        raise
+
+@vault_tool(writes=True)
+def append_to_daily_note(content_to_append: str, target_date_iso: Optional[str] = None, backup: bool = True, wait_durable: bool = False) -> bool:
+    """MCP Tool: Appends content to a daily note (date optional, defaults today). wait_durable=True waits until the append is fsynced."""
     target_dt = None
     if target_date_iso:
         try:
             target_dt = datetime.date.fromisoformat(target_date_iso)
         except ValueError:
-            print(f"Error: Invalid date format: {target_date_iso}. Use YYYY-MM-DD.")
+            logger.error(f"Invalid date format: {target_date_iso}. Use YYYY-MM-DD.")
             return False # Or raise?
-    return daily_notes.append_to_daily_note(content_to_append, target_dt, backup)
+    return daily_notes.append_to_daily_note(content_to_append, target_dt, backup, wait_durable)
 
 # Note: The old handle_mcp_request and ACTION_MAP are removed. 
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""Admission control and request coalescing for tool calls.
+
+Every tool belongs to a cost class:
+
+*   "read":  single-note reads and bounded graph walks (cheap).
+*   "scan":  tools that walk or aggregate the whole vault (expensive).
+*   "write": tools that modify the vault.
+
+Each class runs its calls on its own thread pool, sized by its concurrency
+limit, so a burst of full-vault scans queues behind other scans but never in
+front of cheap reads. When a class already has OMCP_ADMISSION_QUEUE_LIMIT
+calls waiting, new calls of that class are rejected instead of piling up.
+
+Identical read calls (same vault, tool and arguments) that arrive while one is
+already running share that one computation (singleflight) instead of each
+starting its own walk of the vault.
+"""
+
+import asyncio
+import contextvars
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+# Import config and exceptions
+from obsidian_mcp_server.config import settings
+from obsidian_mcp_server.utils.exceptions import VaultError
+
+logger = logging.getLogger(__name__)
+
+# Concurrent calls per cost class; OMCP_ADMISSION_LIMITS overrides individual classes.
+# One write at a time keeps writes serialized, as when tools ran on the event loop.
+DEFAULT_LIMITS = {"read": 16, "scan": 2, "write": 1}
+
+
+class CostClass:
+    """Thread pool plus queue accounting for one cost class."""
+
+    def __init__(self, name, limit):
+        self.name = name
+        self.limit = max(1, limit)
+        self.pool = ThreadPoolExecutor(max_workers=self.limit, thread_name_prefix=f"omcp-{name}")
+        self.pending = 0 # Running plus queued calls (only touched on the event loop)
+
+
+_classes = {}
+_classes_lock = threading.Lock()
+_in_flight = {} # key -> asyncio.Future shared by identical concurrent calls
+
+
+def _get_class(name):
+    with _classes_lock:
+        cost_class = _classes.get(name)
+        if cost_class is None:
+            limits = {**DEFAULT_LIMITS, **settings.admission_limits}
+            if name not in limits:
+                raise ValueError(f"Unknown cost class '{name}'")
+            cost_class = _classes[name] = CostClass(name, limits[name])
+        return cost_class
+
+
+async def run(cost, key, fn):
+    """Runs fn() on the cost class's thread pool and returns its result.
+
+    Args:
+        cost: Cost class name ("read", "scan" or "write").
+        key: Hashable identity of the call for coalescing, or None to never
+            share the result (writes).
+        fn: Zero-argument callable. It runs in a copy of the caller's context.
+
+    Raises:
+        VaultError: If the cost class's queue is full. Exceptions raised by fn
+            propagate to every caller sharing the computation.
+    """
+    cost_class = _get_class(cost)
+    if key is not None:
+        shared = _in_flight.get(key)
+        if shared is not None:
+            return await asyncio.shield(shared) # A cancelled caller must not cancel the others
+    queue_limit = settings.admission_queue_limit
+    if queue_limit > 0 and cost_class.pending >= cost_class.limit + queue_limit:
+        logger.warning(f"[Admission] Rejected '{cost}' call: {cost_class.pending} already running or queued")
+        raise VaultError(f"Server busy: too many '{cost}' calls in progress. Retry shortly.")
+    cost_class.pending += 1
+    context = contextvars.copy_context()
+    future = asyncio.get_running_loop().run_in_executor(cost_class.pool, context.run, fn)
+    future.add_done_callback(lambda _: _finish(cost_class, key, future))
+    if key is not None:
+        _in_flight[key] = future
+    return await asyncio.shield(future)
+
+
+def submit(cost, fn, *args):
+    """Queues fn(*args) on the cost class's thread pool from a background thread.
+
+    For work started outside a tool call (e.g. flushing queued appends) that
+    must be serialized with that class's tool calls. It runs in a copy of the
+    caller's context and does not count against the queue limit.
+
+    Returns:
+        A concurrent.futures.Future.
+    """
+    context = contextvars.copy_context()
+    return _get_class(cost).pool.submit(context.run, fn, *args)
+
+
+def _finish(cost_class, key, future):
+    cost_class.pending -= 1
+    if key is not None and _in_flight.get(key) is future:
+        del _in_flight[key]
@@ -0,0 +1,124 @@
+"""Write-behind queue that coalesces bursts of appends to the same note."""
+
+import atexit
+import threading
+import logging
+# Import config and writers
+from obsidian_mcp_server.config import settings
+from obsidian_mcp_server.utils.vault_writer import append_to_note
+from obsidian_mcp_server.utils import vault_registry, admission
+from obsidian_mcp_server.utils.exceptions import VaultError
+
+logger = logging.getLogger(__name__)
+
+
+class _PendingAppend:
+    """Appends waiting to be written to one note."""
+    __slots__ = ("chunks", "backup", "done", "error")
+
+    def __init__(self):
+        self.chunks = []
+        self.backup = False
+        self.done = threading.Event()
+        self.error = None
+
+
+class AppendQueue:
+    """Per-note append buffers flushed at most once per coalescing window.
+
+    Every append in a window ends up in a single write (and at most one
+    backup) of the target note, followed by an fsync. Each vault has its own
+    queue; flushes run with that vault selected.
+
+    When the window ends, the flush is queued on the "write" cost class (see
+    admission.py), so it is serialized with the write tools like any other
+    write: an edit or metadata update never interleaves with it. Flushes of
+    the same note also hold that note's flush lock, so batches are written in
+    the order they were queued.
+    """
+
+    def __init__(self, window, vault_name=None):
+        self.window = window
+        self.vault_name = vault_name
+        self._lock = threading.Lock()
+        self._pending = {} # relative path -> _PendingAppend
+        self._flush_locks = {} # relative path -> lock held while that note's batch is written
+
+    def enqueue(self, relative_note_path, content, backup=True, wait_durable=False):
+        """Queues content for appending.
+
+        Args:
+            relative_note_path: The note to append to (must exist).
+            content: The string content to append.
+            backup: If True, the flush backs up the note before writing.
+            wait_durable: If True, block until the content is written and fsynced.
+
+        Returns:
+            True once queued (or, with wait_durable, once durable).
+        Raises:
+            VaultError (or subclasses): If a waited-for flush fails.
+        """
+        with self._lock:
+            pending = self._pending.get(relative_note_path)
+            if pending is None:
+                pending = self._pending[relative_note_path] = _PendingAppend()
+                timer = threading.Timer(self.window, admission.submit, args=("write", self.flush, relative_note_path))
+                timer.daemon = True
+                timer.start()
+            pending.chunks.append(content)
+            pending.backup = pending.backup or backup
+        if wait_durable:
+            # Flush now, on this thread: the caller is a write call, and the queued
+            # flush could only run after it. If a flush already took the batch, wait for it.
+            self.flush(relative_note_path)
+            pending.done.wait()
+            if pending.error is not None:
+                raise pending.error
+        return True
+
+    def flush(self, relative_note_path):
+        """Writes everything queued for one note in a single durable append."""
+        with self._lock:
+            flush_lock = self._flush_locks.setdefault(relative_note_path, threading.Lock())
+        with flush_lock:
+            with self._lock:
+                pending = self._pending.pop(relative_note_path, None)
+                if pending is None:
+                    return
+            self._write(relative_note_path, pending)
+
+    def _write(self, relative_note_path, pending):
+        try:
+            # Joining with '\n' gives the same bytes as appending each chunk separately
+            with vault_registry.use_vault(self.vault_name):
+                append_to_note(relative_note_path, "\n".join(pending.chunks), backup=pending.backup, durable=True)
+        except VaultError as e:
+            logger.error(f"[AppendQueue] Failed to flush {len(pending.chunks)} append(s) to {relative_note_path}: {e}")
+            pending.error = e
+        except Exception as e:
+            logger.error(f"[AppendQueue] Unexpected error flushing {relative_note_path}: {e}")
+            pending.error = VaultError(f"[AppendQueue] Unexpected error flushing {relative_note_path}: {e}")
+        finally:
+            pending.done.set()
+
+    def flush_all(self):
+        """Flushes every note with queued appends (called at interpreter exit)."""
+        with self._lock:
+            paths = list(self._pending)
+        for relative_note_path in paths:
+            self.flush(relative_note_path)
+
+
+_queue_lock = threading.Lock()
+
+
+def get_append_queue():
+    """Returns the current vault's AppendQueue, or None if coalescing is disabled."""
+    if settings.append_coalesce_window <= 0:
+        return None
+    vault = vault_registry.current_vault()
+    with _queue_lock:
+        if vault.append_queue is None:
+            vault.append_queue = AppendQueue(settings.append_coalesce_window, vault.name)
+            atexit.register(vault.append_queue.flush_all)
+        return vault.append_queue
@@ -0,0 +1,329 @@
+"""Edits applied to a whole selection of notes in one call.
+
+Notes are selected from the index (folder and tag from the catalog, metadata
+predicates from a frontmatter index kept current like the other derived
+indexes), so selecting never re-reads the vault. Find-and-replace narrows the
+selection further with per-note trigram signatures: only notes that may
+contain the searched text are opened. The edits themselves run in parallel on
+the shared I/O pool, each note under its own lock. Every note about to change
+is first copied into one backup set, `<backup dir>/bulk_<timestamp>/`, which
+mirrors the vault layout, and all changes are journaled in a single append.
+"""
+
+import os
+import re
+import shutil
+import difflib
+import datetime
+import threading
+import logging
+# Import config, index, writer and exceptions
+from obsidian_mcp_server.config import settings
+from obsidian_mcp_server.utils import vault_index, vault_writer, vault_export, markdown_parser, change_journal, call_trace
+from obsidian_mcp_server.utils.vault_registry import vault_root, submit_io
+from obsidian_mcp_server.utils.exceptions import VaultError
+
+logger = logging.getLogger(__name__)
+
+
+class FrontmatterIndex:
+    """Index component holding the parsed frontmatter of every note (see VaultIndex.get_component)."""
+
+    def __init__(self):
+        self._metadata = {} # note path -> frontmatter dict (notes without frontmatter are absent)
+
+    def note_indexed(self, path, text):
+        metadata = markdown_parser.parse_frontmatter(text)
+        if metadata:
+            self._metadata[path] = metadata
+        else:
+            self._metadata.pop(path, None)
+
+    def note_removed(self, path):
+        self._metadata.pop(path, None)
+
+    def estimated_bytes(self):
+        return len(self._metadata) * 512
+
+    def matches(self, path, where):
+        """True if the note's frontmatter satisfies every key/value pair of `where`."""
+        return _metadata_matches(self._metadata.get(path, {}), where)
+
+
+class TrigramSignatures:
+    """Index component keeping a Bloom-filter signature of each note's lowercase trigrams.
+
+    A note whose signature lacks any trigram of a search literal cannot contain
+    it; the rare false positive only costs one extra file read. Signatures are
+    sized to the note (about 8 bits per distinct trigram), so memory stays at
+    roughly one byte per distinct trigram.
+    """
+
+    MIN_BITS = 512
+    MAX_BITS = 1 << 16
+
+    def __init__(self):
+        self._signatures = {} # note path -> (bits, signature as int)
+
+    def note_indexed(self, path, text):
+        text = text.lower()
+        trigrams = {text[i:i + 3] for i in range(len(text) - 2)}
+        bits = self.MIN_BITS
+        while bits < 8 * len(trigrams) and bits < self.MAX_BITS:
+            bits *= 2
+        signature = bytearray(bits // 8)
+        for trigram in trigrams:
+            h = hash(trigram) & (bits - 1)
+            signature[h >> 3] |= 1 << (h & 7)
+        self._signatures[path] = (bits, int.from_bytes(signature, 'little'))
+
+    def note_removed(self, path):
+        self._signatures.pop(path, None)
+
+    def estimated_bytes(self):
+        return sum(bits // 8 + 80 for bits, _ in self._signatures.values())
+
+    def may_contain(self, path, literals):
+        """False only if the note certainly lacks one of the literals (compared case-insensitively)."""
+        entry = self._signatures.get(path)
+        if entry is None:
+            return True
+        bits, signature = entry
+        for literal in literals:
+            literal = literal.lower()
+            mask = 0
+            for i in range(len(literal) - 2):
+                mask |= 1 << (hash(literal[i:i + 3]) & (bits - 1))
+            if signature & mask != mask:
+                return False
+        return True
+
+
+def _required_literals(pattern):
+    """Returns substrings every match of the regex must contain (empty if unknown).
+
+    Only runs of plain characters at the top level of the pattern count;
+    anything optional, repeated or alternated ends a run.
+    """
+    try:
+        from re import _parser as sre_parse
+    except ImportError: # Python < 3.11
+        import sre_parse
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return []
+    literals, run = [], []
+    for op, value in parsed:
+        if op is sre_parse.LITERAL:
+            run.append(chr(value))
+            continue
+        if len(run) >= 3:
+            literals.append("".join(run))
+        run = []
+    if len(run) >= 3:
+        literals.append("".join(run))
+    return literals
+
+
+def _metadata_matches(metadata, where):
+    """True if a frontmatter dict satisfies every key/value pair of `where`."""
+    return all(key in metadata and _value_matches(metadata[key], expected) for key, expected in where.items())
+
+
+def _value_matches(actual, expected):
+    """Equality, or membership for list fields. Compares as text too, since YAML turns 2024-01-01 into a date."""
+    if isinstance(actual, list) and not isinstance(expected, list):
+        return any(_value_matches(item, expected) for item in actual)
+    return actual == expected or (not isinstance(actual, (list, dict)) and str(actual) == str(expected))
+
+
+def select_paths(folder=None, tag=None, where=None):
+    """Returns the sorted paths of the notes matching every given selector.
+
+    Args:
+        folder: Only notes in this folder (vault-relative, recursive).
+        tag: Only notes with this tag or one nested under it.
+        where: Dict of frontmatter key -> value the notes must have (a list
+            field matches if it contains the value).
+
+    The index is refreshed first (a stat walk; only changed notes are re-read),
+    so notes edited on disk since the last rescan are selected by their
+    current folder, tags and frontmatter.
+
+    Raises:
+        VaultError: If no selector is given (use folder="." for the whole vault).
+    """
+    if not (folder or tag or where):
+        raise VaultError("[Bulk] Give at least one of folder, tag or where (folder='.' selects the whole vault).")
+    vault_index.get_index().refresh(force=True)
+    paths = [record.path for record in vault_export.select_notes(folder=folder, tag=tag)]
+    if where:
+        index = vault_index.get_index()
+        frontmatter = index.get_component("frontmatter", FrontmatterIndex)
+        with index.lock:
+            paths = [path for path in paths if frontmatter.matches(path, where)]
+    return paths
+
+
+_note_locks = [threading.Lock() for _ in range(64)] # Striped per-note locks
+
+
+def _note_lock(relative_path):
+    return _note_locks[hash(relative_path) % len(_note_locks)]
+
+
+def _backup_set_dir():
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return os.path.join(vault_root(), settings.backup_dir_name, f"bulk_{timestamp}")
+
+
+def _edit_note(relative_path, transform, backup_dir, dry_run=False, where=None):
+    """Applies transform(content, path) -> (new content, details) to one note.
+
+    With `where`, the frontmatter of the content actually read is checked
+    again, and a note that no longer matches is left alone (skipped).
+
+    Returns:
+        The note's result: path, status (updated, unchanged, would_update,
+        skipped or error) and the details returned by transform.
+    """
+    full_path = os.path.join(vault_root(), relative_path)
+    try:
+        with _note_lock(relative_path):
+            with call_trace.phase("read"), open(full_path, 'r', encoding='utf-8', newline='') as f:
+                content = f.read()
+            call_trace.count_read(len(content))
+            if where and not _metadata_matches(markdown_parser.parse_frontmatter(content) or {}, where):
+                return {"path": relative_path, "status": "skipped", "reason": "frontmatter no longer matches where"}
+            new_content, details = transform(content, relative_path)
+            if new_content == content:
+                return {"path": relative_path, "status": "unchanged"}
+            if dry_run:
+                return {"path": relative_path, "status": "would_update", **details}
+            if backup_dir:
+                backup_path = os.path.join(backup_dir, relative_path)
+                os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+                shutil.copy2(full_path, backup_path)
+            with call_trace.phase("write"), open(full_path, 'w', encoding='utf-8', newline='') as f:
+                f.write(new_content)
+        vault_index.notify_changed(relative_path)
+        return {"path": relative_path, "status": "updated", **details}
+    except Exception as e:
+        logger.warning(f"[Bulk] Failed to update {relative_path}: {e}")
+        return {"path": relative_path, "status": "error", "error": str(e)}
+
+
+def apply_to_notes(paths, transform, op, backup=True, dry_run=False, where=None):
+    """Runs transform on every note in parallel, backing up and journaling the changed ones.
+
+    Args:
+        where: The frontmatter selector the paths were chosen with, checked
+            again against each note's content as it is read.
+
+    Returns:
+        A dict with the number of notes 'updated' (or that would be, with
+        dry_run), 'unchanged', 'skipped' and 'failed', the 'backup_dir'
+        (vault-relative, or None) and per-note 'results' in path order.
+    """
+    backup_dir = _backup_set_dir() if backup and not dry_run else None
+    futures = [submit_io(_edit_note, path, transform, backup_dir, dry_run, where) for path in paths]
+    results = [future.result() for future in futures]
+    changed = [r["path"] for r in results if r["status"] == "updated"]
+    change_journal.record_changes((op, path) for path in changed)
+    count = lambda *statuses: sum(1 for r in results if r["status"] in statuses)
+    return {
+        "updated": count("updated", "would_update"),
+        "unchanged": count("unchanged"),
+        "skipped": count("skipped"),
+        "failed": count("error"),
+        "backup_dir": os.path.relpath(backup_dir, vault_root()).replace('\\', '/') if changed and backup_dir else None,
+        "results": results,
+    }
+
+
+def bulk_update_metadata(updates, folder=None, tag=None, where=None, dry_run=False, backup=True):
+    """Merges `updates` into the frontmatter of every selected note.
+
+    Args:
+        updates: Dict of frontmatter keys/values to add or overwrite.
+        folder, tag, where: Selectors (see select_paths); notes must match all given.
+        dry_run: If True, only returns the number and paths of the selected notes.
+        backup: If True (default), copies every changed note into one backup set first.
+
+    Returns:
+        With dry_run, a dict with 'matched' and 'paths'. Otherwise the result of
+        apply_to_notes plus 'matched'.
+    Raises:
+        VaultError: If no selector or no updates are given.
+    """
+    if not isinstance(updates, dict) or not updates:
+        raise VaultError("[Bulk] updates must be a non-empty dict of frontmatter keys and values.")
+    paths = select_paths(folder, tag, where)
+    if dry_run:
+        return {"matched": len(paths), "paths": paths}
+    transform = lambda content, path: (vault_writer.merge_metadata(content, updates, path), {})
+    return {"matched": len(paths), **apply_to_notes(paths, transform, "metadata", backup, where=where)}
+
+
+MAX_DIFF_LINES = 20 # Per note, in replace_in_notes results
+
+
+def _diff_summary(content, new_content, replacements):
+    diff = list(difflib.unified_diff(content.splitlines(), new_content.splitlines(), lineterm="", n=0))[2:] # Skip file headers
+    details = {"replacements": replacements, "diff": diff[:MAX_DIFF_LINES]}
+    if len(diff) > MAX_DIFF_LINES:
+        details["diff_truncated"] = len(diff) - MAX_DIFF_LINES
+    return details
+
+
+def replace_in_notes(pattern, replacement, folder=None, tag=None, where=None, regex=False, case_sensitive=True, dry_run=True, backup=True):
+    """Replaces every occurrence of `pattern` in the selected notes.
+
+    Args:
+        pattern: Text to find, or a regular expression if `regex` is True.
+        replacement: Replacement text (with regex, may use \\1 or \\g<name>).
+        folder, tag, where: Selectors (see select_paths); notes must match all given.
+        regex: Treat `pattern` as a Python regular expression (multiline mode).
+        case_sensitive: If False, matches regardless of case.
+        dry_run: If True (default), reports what would change without writing.
+        backup: If True (default), copies every changed note into one backup set first.
+
+    Returns:
+        The result of apply_to_notes plus 'matched' (selected notes) and
+        'candidates' (notes opened after trigram filtering). Each changed note's
+        result has its number of 'replacements' and a unified 'diff' (no context,
+        at most MAX_DIFF_LINES lines) instead of its content.
+    Raises:
+        VaultError: If the pattern is empty or invalid, or no selector is given.
+    """
+    if not pattern:
+        raise VaultError("[Replace] pattern must not be empty.")
+    flags = re.MULTILINE | (0 if case_sensitive else re.IGNORECASE)
+    try:
+        compiled = re.compile(pattern if regex else re.escape(pattern), flags)
+    except re.error as e:
+        raise VaultError(f"[Replace] Invalid regular expression '{pattern}': {e}") from e
+    if not regex:
+        replacement = replacement.replace('\\', '\\\\') # Plain text: no group references
+    paths = select_paths(folder, tag, where) # Refreshes the index, so the signatures below are current
+    literals = _required_literals(pattern) if regex else [pattern]
+    candidates = paths
+    if any(len(literal) >= 3 for literal in literals):
+        index = vault_index.get_index()
+        signatures = index.get_component("trigrams", TrigramSignatures)
+        with index.lock:
+            candidates = [path for path in paths if signatures.may_contain(path, literals)]
+
+    def transform(content, path):
+        try:
+            new_content, replacements = compiled.subn(replacement, content)
+        except (re.error, IndexError) as e:
+            raise VaultError(f"[Replace] Invalid replacement '{replacement}': {e}") from e
+        if not replacements:
+            return content, {}
+        return new_content, _diff_summary(content, new_content, replacements)
+
+    result = apply_to_notes(candidates, transform, "edit", backup, dry_run, where)
+    result["results"] = [r for r in result["results"] if r["status"] != "unchanged"]
+    return {"matched": len(paths), "candidates": len(candidates), "dry_run": dry_run, **result}
@@ -0,0 +1,166 @@
+"""Per-call timings, the slow-call log and on-demand profiling of tool calls.
+
+Each tool call runs through `traced_call()`. Utility code marks where its time goes
+with `phase(name)` ("walk", "read", "parse", "yaml", ...) and reports file
+reads with `count_read(nbytes)` (text-mode reads count characters). Phase
+times are exclusive: time spent in a nested phase counts only towards the
+nested one, and time outside any phase is reported as "other" (e.g. directory
+walks). Reads done on the shared I/O pool count as well, so phases can add up
+to more than the wall time.
+
+A call taking at least OMCP_SLOW_CALL_THRESHOLD_MS is logged with its
+arguments, queue wait, phase timings, files touched and bytes read. Tools
+switched on with `set_profiling()` (or OMCP_PROFILE_TOOLS) are also run under
+cProfile, and each call's profile is written to OMCP_PROFILE_DIR.
+"""
+
+import os
+import time
+import threading
+import contextvars
+import logging
+from contextlib import nullcontext
+# Import config and exceptions
+from obsidian_mcp_server.config import settings
+from obsidian_mcp_server.utils.exceptions import VaultError
+
+logger = logging.getLogger(__name__)
+
+_current_trace = contextvars.ContextVar("omcp_call_trace", default=None)
+_current_phase = contextvars.ContextVar("omcp_call_phase", default=None)
+_NO_PHASE = nullcontext()
+
+
+class CallTrace:
+    """Timings and I/O counters of one tool call."""
+
+    def __init__(self):
+        self.thread = threading.get_ident()
+        self.phases = {} # name -> exclusive seconds
+        self.in_phases = 0.0 # Time inside top-level phases on the call's own thread
+        self.files = 0
+        self.bytes_read = 0
+        self.lock = threading.Lock() # Reads may be counted from I/O pool threads
+
+    def add(self, name, seconds):
+        with self.lock:
+            self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+
+class _Phase:
+    __slots__ = ("trace", "name", "thread", "started", "nested", "token")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+        self.thread = threading.get_ident()
+
+    def __enter__(self):
+        self.nested = 0.0 # Time spent in phases entered inside this one
+        self.token = _current_phase.set(self)
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.started
+        _current_phase.reset(self.token)
+        parent = _current_phase.get()
+        if parent is not None and parent.thread == self.thread:
+            parent.nested += elapsed
+        elif parent is None and self.trace.thread == self.thread:
+            self.trace.in_phases += elapsed
+        # Otherwise the phase ran on another thread, overlapping the time of the call
+        self.trace.add(self.name, elapsed - self.nested)
+
+
+def phase(name):
+    """Context manager attributing the enclosed time to `name` (a no-op outside a traced call)."""
+    trace = _current_trace.get()
+    return _NO_PHASE if trace is None else _Phase(trace, name)
+
+
+def count_read(nbytes):
+    """Records that one file was read (`nbytes` bytes) by the current call."""
+    trace = _current_trace.get()
+    if trace is not None:
+        with trace.lock:
+            trace.files += 1
+            trace.bytes_read += nbytes
+
+
+# --- Profiling ---
+
+_profiled_tools = set(settings.profile_tools)
+_profiler_lock = threading.Lock() # cProfile can only profile one call at a time
+
+
+def set_profiling(tool_name, enabled=True):
+    """Starts or stops profiling every call of a tool.
+
+    Returns:
+        The sorted names of the tools being profiled.
+    Raises:
+        VaultError: If OMCP_PROFILE_DIR is not configured.
+    """
+    if enabled:
+        if not settings.profile_dir:
+            raise VaultError("[Profile] Set OMCP_PROFILE_DIR to enable profiling.")
+        _profiled_tools.add(tool_name)
+    else:
+        _profiled_tools.discard(tool_name)
+    return sorted(_profiled_tools)
+
+
+def _run_profiled(tool_name, fn):
+    import cProfile
+    if not settings.profile_dir or not _profiler_lock.acquire(blocking=False):
+        return fn() # Not configured, or another call is being profiled
+    try:
+        profiler = cProfile.Profile()
+        try:
+            return profiler.runcall(fn)
+        finally:
+            os.makedirs(settings.profile_dir, exist_ok=True)
+            path = os.path.join(settings.profile_dir, f"{tool_name}-{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 10**9:09d}.prof")
+            profiler.dump_stats(path)
+            logger.info(f"[Profile] Wrote {path}")
+    finally:
+        _profiler_lock.release()
+
+
+# --- Tracing ---
+
+def _summarize(arguments, limit=80):
+    return {name: (value if len(repr(value)) <= limit else repr(value)[:limit] + "...") for name, value in arguments.items()}
+
+
+def traced_call(tool_name, arguments, vault_name, fn, queued_since=None):
+    """Runs fn() as one traced tool call and returns its result; logs the call if slow.
+
+    Args:
+        tool_name: Name of the tool.
+        arguments: Dict of the call's arguments (logged, truncated, for slow calls).
+        vault_name: Vault the call acts on.
+        fn: Zero-argument callable running the tool. Runs under cProfile if the
+            tool is being profiled.
+        queued_since: perf_counter() value when the call was submitted, to report
+            the time it waited for a slot (see utils/admission.py).
+    """
+    started = time.perf_counter()
+    call_trace = CallTrace()
+    token = _current_trace.set(call_trace)
+    try:
+        if tool_name in _profiled_tools:
+            return _run_profiled(tool_name, fn)
+        return fn()
+    finally:
+        _current_trace.reset(token)
+        elapsed = time.perf_counter() - started
+        threshold = settings.slow_call_threshold_ms
+        if threshold > 0 and elapsed * 1000 >= threshold:
+            call_trace.phases["other"] = elapsed - call_trace.in_phases
+            phases = " ".join(f"{name}={seconds * 1000:.1f}ms" for name, seconds in sorted(call_trace.phases.items(), key=lambda p: -p[1]))
+            queued = (started - queued_since) * 1000 if queued_since is not None else 0.0
+            logger.warning(
+                f"[SlowCall] {tool_name} took {elapsed * 1000:.1f}ms (queued {queued:.1f}ms) vault={vault_name} "
+                f"args={_summarize(arguments)} files={call_trace.files} bytes_read={call_trace.bytes_read} phases: {phases}"
+            )
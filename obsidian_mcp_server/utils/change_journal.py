@@ -0,0 +1,188 @@
+"""Durable, append-only journal of note changes, for clients syncing incrementally.
+
+Each vault has one journal file (OMCP_CHANGE_JOURNAL_NAME, at the vault root)
+with one JSON entry per line:
+
+    {"seq": 42, "time": "2025-01-01T12:00:00", "op": "edit", "path": "Notes/A.md", "source": "server"}
+
+`op` is create, edit, append, metadata, delete or move (move entries also
+carry the note's previous path as "old_path"). `source` is "server" for
+changes made through the tools and "external" for changes found on disk by the
+index rescan (e.g. edits in Obsidian itself). Changes made while no server is
+running are not journaled. Sequence numbers increase monotonically and survive
+restarts, and since they are written in order, get_changes_since() finds its
+starting point by bisecting the file: its cost depends on the number of
+changes returned, not on the size of the journal.
+"""
+
+import os
+import json
+import datetime
+import threading
+import logging
+# Import config and registry
+from obsidian_mcp_server.config import settings
+from obsidian_mcp_server.utils import vault_registry
+from obsidian_mcp_server.utils.exceptions import VaultError
+
+logger = logging.getLogger(__name__)
+
+TAIL_BYTES = 4096 # Enough to hold the last entry
+
+
+def _entry_seq(line):
+    """Returns the sequence number of a journal line, or None if it is not a complete entry."""
+    try:
+        return json.loads(line)["seq"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class ChangeJournal:
+    """The journal file of one vault."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._last_seq = None
+        self._known_size = -1 # File size after our last append; another process may have appended since
+
+    def _read_last_seq(self):
+        try:
+            with open(self.path, 'rb') as f:
+                size = f.seek(0, os.SEEK_END)
+                f.seek(max(0, size - TAIL_BYTES))
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return 0, 0
+        for line in reversed(lines):
+            seq = _entry_seq(line)
+            if seq is not None:
+                return seq, size
+        return 0, size
+
+    def record(self, changes, source="server"):
+        """Appends entries for (op, path) or (op, path, old_path) tuples with consecutive sequence numbers, then fsyncs.
+
+        Journal failures are logged, never raised: the vault change itself already happened.
+        """
+        if not changes:
+            return
+        with self._lock:
+            try:
+                size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+                if self._last_seq is None or size != self._known_size:
+                    self._last_seq, _ = self._read_last_seq()
+                now = datetime.datetime.now().isoformat(timespec='seconds')
+                lines = []
+                for op, path, *old_path in changes:
+                    self._last_seq += 1
+                    entry = {"seq": self._last_seq, "time": now, "op": op, "path": path, "source": source}
+                    if old_path:
+                        entry["old_path"] = old_path[0]
+                    lines.append(json.dumps(entry, ensure_ascii=False))
+                with open(self.path, 'ab') as f:
+                    f.write(("\n".join(lines) + "\n").encode('utf-8'))
+                    f.flush()
+                    os.fsync(f.fileno())
+                    self._known_size = f.tell()
+            except OSError as e:
+                self._last_seq = None # Re-read from the file next time
+                logger.error(f"[Journal] Failed to record {len(changes)} change(s) in {self.path}: {e}")
+
+    def _seek_after(self, f, size, cursor):
+        """Positions f at (or shortly before) the first entry with seq > cursor."""
+        lo, hi = 0, size # lo is always the start of a line
+        while lo < hi:
+            mid = (lo + hi) // 2
+            f.seek(mid)
+            if mid > 0:
+                f.readline() # Skip to the next line start
+            line = f.readline()
+            seq = _entry_seq(line) if line else None
+            if seq is None or seq > cursor:
+                hi = mid
+            else:
+                lo = f.tell()
+        f.seek(lo)
+
+    def changes_since(self, cursor=0, limit=100):
+        """Returns up to `limit` entries with seq > cursor, in order."""
+        try:
+            f = open(self.path, 'rb')
+        except FileNotFoundError:
+            return [], 0
+        with f:
+            size = f.seek(0, os.SEEK_END)
+            self._seek_after(f, size, cursor)
+            entries = []
+            for line in f:
+                if len(entries) > limit:
+                    break
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue # Torn last line of an interrupted append
+                if entry["seq"] > cursor:
+                    entries.append(entry)
+        latest, _ = self._read_last_seq()
+        return entries, latest
+
+
+_journals = {}
+_journals_lock = threading.Lock()
+
+
+def get_change_journal(vault_path=None):
+    """Returns the journal of the vault at vault_path (default: the current vault), or None if disabled."""
+    if not settings.change_journal_name:
+        return None
+    vault_path = os.path.abspath(vault_path or vault_registry.vault_root())
+    with _journals_lock:
+        journal = _journals.get(vault_path)
+        if journal is None:
+            journal = _journals[vault_path] = ChangeJournal(os.path.join(vault_path, settings.change_journal_name))
+        return journal
+
+
+def record_change(op, relative_path):
+    """Journals one change made through the server in the current vault."""
+    journal = get_change_journal()
+    if journal is not None:
+        journal.record([(op, os.path.normpath(relative_path).replace('\\', '/'))])
+
+
+def record_changes(changes):
+    """Journals a batch of changes made through the server in the current vault as one append."""
+    journal = get_change_journal()
+    if journal is not None:
+        journal.record(list(changes))
+
+
+def get_changes_since(cursor=0, limit=100):
+    """Returns the current vault's changes after `cursor`.
+
+    Args:
+        cursor: Sequence number of the last change already processed (0 for all).
+        limit: Maximum number of changes to return.
+
+    Returns:
+        A dict with 'changes' (entries in sequence order), 'next_cursor' (pass
+        it as `cursor` next time), 'has_more', and 'latest_seq' of the journal.
+    Raises:
+        VaultError: If the journal is disabled or the arguments are invalid.
+    """
+    journal = get_change_journal()
+    if journal is None:
+        raise VaultError("[Journal] The change journal is disabled (OMCP_CHANGE_JOURNAL_NAME is empty).")
+    if cursor < 0 or limit < 1:
+        raise VaultError(f"[Journal] Invalid cursor {cursor} or limit {limit}")
+    entries, latest = journal.changes_since(cursor, limit)
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+    return {
+        "changes": entries,
+        "next_cursor": entries[-1]["seq"] if entries else cursor,
+        "has_more": has_more,
+        "latest_seq": max(latest, entries[-1]["seq"] if entries else 0),
+    }
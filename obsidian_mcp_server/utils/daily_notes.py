@@ -2,17 +2,45 @@ import os
 import datetime
 import shutil
 import re # Import regular expressions
+import logging
+from functools import lru_cache
 # Import config, exceptions, and writers
 from obsidian_mcp_server.config import settings
 from obsidian_mcp_server.utils.vault_writer import create_note, append_to_note # VAULT_PATH no longer needed from here
-from obsidian_mcp_server.utils.exceptions import VaultError, NoteNotFoundError, InvalidPathError, NoteCreationError, MetadataError, BackupError
+from obsidian_mcp_server.utils import vault_index, change_journal, note_templates, markdown_parser, call_trace
+from obsidian_mcp_server.utils.exceptions import VaultError, NoteNotFoundError, InvalidPathError, NoteCreationError, MetadataError, BackupError, SectionNotFoundError
+from obsidian_mcp_server.utils.append_queue import get_append_queue
+from obsidian_mcp_server.utils.vault_registry import vault_root, submit_io
+
+logger = logging.getLogger(__name__)
 
 # Use config settings
-VAULT_PATH = settings.obsidian_vault_path
 DAILY_NOTE_LOCATION = settings.daily_note_location
 DAILY_NOTE_FORMAT = settings.daily_note_format
 DAILY_NOTE_TEMPLATE_PATH = settings.daily_note_template_path # Can be None
 
+# {{date:CODE}} placeholders in DAILY_NOTE_LOCATION
+LOCATION_PLACEHOLDER_REGEX = re.compile(r"{{date:([^{}]+)}}")
+
+# Map common placeholders to strftime codes
+LOCATION_STRFTIME_MAP = {
+    'YYYY': '%Y',
+    'MM': '%m',
+    'DD': '%d',
+    'YY': '%y',
+    'M': '%#m' if os.name != 'nt' else '%m', # Month without leading zero (platform dependent)
+    'D': '%#d' if os.name != 'nt' else '%d', # Day without leading zero (platform dependent)
+    # Add more mappings as needed
+}
+
+MAX_DAILY_NOTES_RANGE = 366 # Days create_daily_notes creates in one call
+
+# (vault root, daily note path) pairs known to exist, so repeated appends skip create_daily_note
+_existing_daily_notes = set()
+
+# vault root -> (index path generation, {date: daily note path}), see daily_note_dates()
+_date_indexes = {}
+
 def get_daily_note_path(target_date=None):
     """Calculates the relative path for a daily note based on config.
 
@@ -24,7 +52,11 @@ def get_daily_note_path(target_date=None):
     """
     if target_date is None:
         target_date = datetime.date.today()
+    return _daily_note_path_for(target_date)
 
+@lru_cache(maxsize=1024)
+def _daily_note_path_for(target_date):
+    """Computes (and caches per date) the daily note path; the config is fixed for the process."""
     try:
         # Format the filename
         filename = target_date.strftime(DAILY_NOTE_FORMAT) + ".md"
@@ -35,17 +67,7 @@ def get_daily_note_path(target_date=None):
         # Define a function to replace placeholders using regex
         def replace_date_placeholder(match):
             format_code = match.group(1) # Get the code inside {{date: ... }}
-            # Map common placeholders to strftime codes
-            strftime_map = {
-                'YYYY': '%Y',
-                'MM': '%m',
-                'DD': '%d',
-                'YY': '%y',
-                'M': '%#m' if os.name != 'nt' else '%m', # Month without leading zero (platform dependent)
-                'D': '%#d' if os.name != 'nt' else '%d', # Day without leading zero (platform dependent)
-                # Add more mappings as needed
-            }
-            strftime_code = strftime_map.get(format_code)
+            strftime_code = LOCATION_STRFTIME_MAP.get(format_code)
             if strftime_code:
                 try:
                     return target_date.strftime(strftime_code)
@@ -53,14 +75,14 @@ def get_daily_note_path(target_date=None):
                     return match.group(0) # Return original if format invalid
             else:
                 # If format code unknown, return the original placeholder
-                print(f"Warning: Unknown daily note location format code '{{{{date:{format_code}}}}}'")
+                logger.warning(f"Unknown daily note location format code '{{{{date:{format_code}}}}}'")
                 return match.group(0)
 
         # Use re.sub to find and replace all placeholders
         try:
-            processed_location = re.sub(r"{{date:([^{}]+)}}", replace_date_placeholder, location_template)
+            processed_location = LOCATION_PLACEHOLDER_REGEX.sub(replace_date_placeholder, location_template)
         except Exception as regex_e:
-            print(f"Warning: Error processing daily_note_location template '{location_template}'. Using as is. Error: {regex_e}")
+            logger.warning(f"Error processing daily_note_location template '{location_template}'. Using as is. Error: {regex_e}")
             processed_location = location_template # Fallback
 
         if processed_location == "/" or processed_location == "." or not processed_location:
@@ -78,14 +100,28 @@ def get_daily_note_path(target_date=None):
     except Exception as e:
         raise VaultError(f"Error calculating daily note path for {target_date}: {e}") from e
 
-def create_daily_note(target_date=None, force_create=False):
+def _render_daily_note(target_date, relative_path, variables=None):
+    """Returns the content of a new daily note: the rendered template, or "" without one."""
+    if not DAILY_NOTE_TEMPLATE_PATH:
+        return ""
+    try:
+        template = note_templates.get_template(vault_root(), DAILY_NOTE_TEMPLATE_PATH)
+    except (VaultError, InvalidPathError) as e:
+        logger.warning(f"Template not found or invalid: {DAILY_NOTE_TEMPLATE_PATH} ({e}). Creating empty.")
+        return ""
+    title = os.path.splitext(os.path.basename(relative_path))[0]
+    return template.render(target_date, title, DAILY_NOTE_FORMAT, {**settings.daily_note_template_variables, **(variables or {})})
+
+def create_daily_note(target_date=None, force_create=False, variables=None):
     """Creates a daily note for the given date if it doesn't exist.
 
-    Uses the configured template if available.
+    Uses the configured template if available, filling in its placeholders
+    (see utils/note_templates.py).
 
     Args:
         target_date: A datetime.date object. Defaults to today.
         force_create: If True, creates the note even if it exists (potentially dangerous!). Defaults to False.
+        variables: Dict of custom template placeholder values (merged over OMCP_DAILY_NOTE_TEMPLATE_VARIABLES).
 
     Returns:
         The relative path of the created or existing note, or None on error.
@@ -96,25 +132,13 @@ def create_daily_note(target_date=None, force_create=False):
         # Propagate path calculation errors
         raise VaultError(f"Failed to get daily note path for {target_date}: {e}") from e
 
-    full_path = os.path.join(VAULT_PATH, relative_path)
+    full_path = os.path.join(vault_root(), relative_path)
 
     if os.path.exists(full_path) and not force_create:
         # print(f"Daily note already exists: {relative_path}") # Less verbose
         return relative_path # Return path if already exists
 
-    # Determine content (template or empty)
-    content = ""
-    if DAILY_NOTE_TEMPLATE_PATH:
-        template_full_path = os.path.join(VAULT_PATH, DAILY_NOTE_TEMPLATE_PATH)
-        if os.path.abspath(template_full_path).startswith(os.path.abspath(VAULT_PATH)) and os.path.isfile(template_full_path):
-            try:
-                with open(template_full_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                # print(f"Using template: {DAILY_NOTE_TEMPLATE_PATH}")
-            except Exception as e:
-                print(f"Warning: Failed to read template {DAILY_NOTE_TEMPLATE_PATH}: {e}. Creating empty.")
-        else:
-            print(f"Warning: Template not found or invalid: {DAILY_NOTE_TEMPLATE_PATH}. Creating empty.")
+    content = _render_daily_note(target_date or datetime.date.today(), relative_path, variables)
 
     try:
         # create_note raises InvalidPathError, NoteCreationError, MetadataError, VaultError
@@ -131,29 +155,175 @@ def create_daily_note(target_date=None, force_create=False):
         # Catch other unexpected errors during creation
         raise NoteCreationError(f"Unexpected error creating daily note {relative_path}: {e}") from e
 
-def append_to_daily_note(content_to_append, target_date=None, backup=True):
+def create_daily_notes(start_date, end_date, variables=None):
+    """Creates the daily notes of every date from start_date to end_date (inclusive).
+
+    The template is compiled once for the whole range, notes that already
+    exist are left alone, and the new notes are indexed and journaled as one batch.
+
+    Args:
+        start_date: First date (datetime.date).
+        end_date: Last date (datetime.date).
+        variables: Dict of custom template placeholder values.
+
+    Returns:
+        A dict with the paths 'created' and the paths of notes already 'existing'.
+    Raises:
+        VaultError: If the range is reversed or longer than MAX_DAILY_NOTES_RANGE days.
+        NoteCreationError: If a note cannot be written (notes created before it are kept).
+    """
+    days = (end_date - start_date).days + 1
+    if days < 1 or days > MAX_DAILY_NOTES_RANGE:
+        raise VaultError(f"[DailyRange] Range must cover 1 to {MAX_DAILY_NOTES_RANGE} days, got {start_date} to {end_date}.")
+    root = vault_root()
+    created, existing = [], []
+    try:
+        for offset in range(days):
+            target_date = start_date + datetime.timedelta(days=offset)
+            relative_path = get_daily_note_path(target_date)
+            full_path = os.path.join(root, relative_path)
+            if not os.path.abspath(full_path).startswith(os.path.abspath(root)):
+                raise InvalidPathError(f"[DailyRange] Attempted access outside vault: {relative_path}")
+            if os.path.exists(full_path):
+                existing.append(relative_path)
+                continue
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            try:
+                with open(full_path, 'x', encoding='utf-8') as f:
+                    f.write(_render_daily_note(target_date, relative_path, variables))
+            except FileExistsError:
+                existing.append(relative_path) # Created concurrently, e.g. by Obsidian
+                continue
+            created.append(relative_path)
+            _existing_daily_notes.add((root, relative_path))
+    except OSError as e:
+        raise NoteCreationError(f"[DailyRange] Error creating daily notes from {start_date} to {end_date}: {e}") from e
+    finally:
+        for relative_path in created:
+            vault_index.notify_changed(relative_path)
+        change_journal.record_changes(("create", relative_path) for relative_path in created)
+    return {"created": created, "existing": existing}
+
+def daily_note_dates():
+    """Returns {date: relative path} for every existing daily note of the current vault.
+
+    Derived from the index catalog: a note is a daily note if its file name
+    parses with DAILY_NOTE_FORMAT and DAILY_NOTE_LOCATION puts that date's note
+    exactly at its path. Rebuilt only when notes were created, deleted or
+    moved (the index's path_generation), not when existing notes are edited.
+    """
+    index = vault_index.get_index()
+    index.refresh()
+    generation = index.path_generation # Read before listing, so a note added meanwhile forces a rebuild next time
+    cached = _date_indexes.get(index.vault_path)
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+    paths = index.note_paths()
+    dates = {}
+    for relative_path in paths:
+        name = os.path.splitext(os.path.basename(relative_path))[0]
+        try:
+            note_date = datetime.datetime.strptime(name, DAILY_NOTE_FORMAT).date()
+            if get_daily_note_path(note_date) == relative_path:
+                dates[note_date] = relative_path
+        except (ValueError, VaultError):
+            continue # Not a daily note
+    _date_indexes[index.vault_path] = (generation, dates)
+    return dates
+
+def _read_daily_note(full_path):
+    with call_trace.phase("read"), open(full_path, 'rb') as f:
+        data = f.read()
+    call_trace.count_read(len(data))
+    return data
+
+def _extract_section(data, headings, heading):
+    """Returns the text of a section (without its heading line), or None if the note lacks it."""
+    try:
+        _, _, start, end = markdown_parser.find_section(headings, heading)
+    except SectionNotFoundError:
+        return None
+    text = data[start:end].decode('utf-8', errors='replace')
+    return text.split('\n', 1)[1] if '\n' in text else ""
+
+def get_daily_notes(start_date, end_date, sections=None):
+    """Returns the existing daily notes from start_date to end_date (inclusive), read in parallel.
+
+    Args:
+        start_date: First date (datetime.date).
+        end_date: Last date (datetime.date).
+        sections: Optional list of headings. If given, only these sections of
+            each note are returned instead of the full content.
+
+    Returns:
+        A list of dicts with 'date' (ISO), 'path' and either 'content' or
+        'sections' ({heading: text, or None if the note lacks it}), in date order.
+    Raises:
+        VaultError: If the range is reversed or longer than MAX_DAILY_NOTES_RANGE days.
+    """
+    days = (end_date - start_date).days + 1
+    if days < 1 or days > MAX_DAILY_NOTES_RANGE:
+        raise VaultError(f"[DailyRange] Range must cover 1 to {MAX_DAILY_NOTES_RANGE} days, got {start_date} to {end_date}.")
+    dates = daily_note_dates()
+    selected = sorted((d, p) for d, p in dates.items() if start_date <= d <= end_date)
+    root = vault_root()
+    futures = [submit_io(_read_daily_note, os.path.join(root, p)) for _, p in selected]
+    notes = []
+    for (note_date, relative_path), future in zip(selected, futures):
+        try:
+            data = future.result()
+        except OSError as e:
+            logger.warning(f"[DailyRange] Skipping unreadable daily note {relative_path}: {e}")
+            continue
+        note = {"date": note_date.isoformat(), "path": relative_path}
+        if sections:
+            with call_trace.phase("parse"):
+                headings = markdown_parser.parse_headings(data, markdown_parser.frontmatter_end(data))
+            note["sections"] = {heading: _extract_section(data, headings, heading) for heading in sections}
+        else:
+            note["content"] = data.decode('utf-8', errors='replace')
+        notes.append(note)
+    return notes
+
+def _ensure_daily_note(target_date):
+    """Returns the daily note path, creating the note only if it is not known to exist."""
+    relative_path = get_daily_note_path(target_date)
+    root = vault_root()
+    if (root, relative_path) in _existing_daily_notes and os.path.isfile(os.path.join(root, relative_path)):
+        return relative_path
+    relative_path = create_daily_note(target_date, force_create=False)
+    _existing_daily_notes.add((root, relative_path))
+    return relative_path
+
+def append_to_daily_note(content_to_append, target_date=None, backup=True, wait_durable=False):
     """Appends content to the daily note for the given date.
 
-    Creates the daily note if it doesn't exist.
+    Creates the daily note if it doesn't exist. When OMCP_APPEND_COALESCE_WINDOW
+    is set, the append is queued and written together with any other appends to
+    the same note in that window (one write, one backup, fsync).
 
     Args:
         content_to_append: The string content to append.
         target_date: A datetime.date object. Defaults to today.
         backup: If True (default), creates a backup before appending (if note exists).
+        wait_durable: If True, only return once the content is fsynced to disk.
 
     Returns:
-        True if append was successful, False otherwise.
+        True if append was successful (or queued), False otherwise.
     """
     try:
         # Ensure the daily note exists, get its path
-        relative_path = create_daily_note(target_date, force_create=False)
+        relative_path = _ensure_daily_note(target_date)
     except (VaultError, NoteCreationError) as e:
         # Failed to get/create the note path
         raise VaultError(f"[AppendDaily] Failed to find or create daily note for {target_date or 'today'}: {e}") from e
 
     try:
+        queue = get_append_queue()
+        if queue is not None:
+            return queue.enqueue(relative_path, content_to_append, backup=backup, wait_durable=wait_durable)
         # append_to_note raises InvalidPathError, NoteNotFoundError, BackupError, VaultError
-        if append_to_note(relative_path, content_to_append, backup=backup):
+        if append_to_note(relative_path, content_to_append, backup=backup, durable=wait_durable):
              return True
         else:
             # Should not happen if append_to_note raises exceptions
@@ -182,7 +352,7 @@ if __name__ == '__main__':
     if created_path:
         print(f"Ensured daily note exists at: {created_path}")
         # Clean up the created note (optional)
-        # note_to_delete = os.path.join(VAULT_PATH, created_path)
+        # note_to_delete = os.path.join(vault_root(), created_path)
         # if os.path.exists(note_to_delete):
         #     os.remove(note_to_delete)
         #     print(f"Cleaned up: {created_path}")
@@ -197,10 +367,10 @@ if __name__ == '__main__':
         # Verify (optional)
         # today_note_path = get_daily_note_path()
         # if today_note_path:
-        #     with open(os.path.join(VAULT_PATH, today_note_path), 'r', encoding='utf-8') as f:
+        #     with open(os.path.join(vault_root(), today_note_path), 'r', encoding='utf-8') as f:
         #         print("\nContent after append:\n", f.read())
         # Clean up note created/appended during tests
-        today_note_full_path = os.path.join(VAULT_PATH, get_daily_note_path())
+        today_note_full_path = os.path.join(vault_root(), get_daily_note_path())
         if os.path.exists(today_note_full_path):
              os.remove(today_note_full_path)
              print(f"Cleaned up test daily note: {get_daily_note_path()}")
@@ -209,7 +379,7 @@ if __name__ == '__main__':
 
     # Final backup cleanup (ensure it runs after all tests)
     # This might be better placed in vault_writer.py's __main__ if running tests together
-    backup_path = os.path.join(VAULT_PATH, ".vault_backups") # Use constant if defined elsewhere
+    backup_path = os.path.join(vault_root(), ".vault_backups") # Use constant if defined elsewhere
     if os.path.isdir(backup_path):
         try:
             shutil.rmtree(backup_path)
@@ -22,4 +22,8 @@ class BackupError(VaultError):
 
 class NoteCreationError(VaultError):
     """Raised when creating a note fails (e.g., already exists)."""
-    pass 
\ No newline at end of file
+    pass 
+
+class SectionNotFoundError(VaultError):
+    """Raised when a heading/section cannot be found in a note."""
+    pass
\ No newline at end of file
@@ -0,0 +1,192 @@
+"""Immutable, mmap-able snapshots of a vault index for multi-worker serving.
+
+The indexer process publishes one snapshot file per vault generation:
+
+    header | catalog (JSON) | out_indptr | out_indices | in_indptr | in_indices
+
+The four link graph arrays are raw int64 arrays. Workers map the file and use
+them in place through memoryviews, so every worker shares the same physical
+pages. The catalog is decoded once per snapshot. A small pointer file names
+the current snapshot and is replaced atomically, so readers never see a
+partially written snapshot.
+"""
+
+import os
+import json
+import mmap
+import time
+import struct
+import logging
+from array import array
+# Import the index types
+from obsidian_mcp_server.utils.vault_index import VaultIndex, NoteRecord
+from obsidian_mcp_server.utils.vault_graph import LinkGraph
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"OMCPSNP1"
+HEADER = struct.Struct("<8sqqq5q") # magic, generation, note count, unresolved links, 5 section lengths
+POINTER_SUFFIX = ".current"
+
+
+def _pointer_path(snapshot_dir, vault_name):
+    return os.path.join(snapshot_dir, vault_name + POINTER_SUFFIX)
+
+
+def write_snapshot(index, snapshot_dir, vault_name):
+    """Serializes the index's catalog and link graph and makes it the vault's current snapshot.
+
+    Returns:
+        The generation that was published.
+    """
+    graph = index.link_graph().compacted() # Patched rows folded back into the CSR arrays
+    with index.lock:
+        generation = index.generation
+        paths, records = index._snapshot()
+        catalog = json.dumps([
+            [r.path, r.mtime_ns, r.size, r.links, r.aliases, list(r.tags), r.headings] for r in records
+        ]).encode('utf-8')
+    sections = [catalog] + [array('q', a).tobytes() for a in (graph.out_indptr, graph.out_indices, graph.in_indptr, graph.in_indices)]
+    header = HEADER.pack(MAGIC, generation, len(paths), graph.unresolved, *(len(s) for s in sections))
+    filename = f"{vault_name}.{generation}.{time.time_ns()}.snap"
+    with open(os.path.join(snapshot_dir, filename), 'wb') as f:
+        f.write(header)
+        for section in sections:
+            f.write(section)
+    pointer = _pointer_path(snapshot_dir, vault_name)
+    with open(pointer + ".tmp", 'w', encoding='utf-8') as f:
+        f.write(filename)
+    os.replace(pointer + ".tmp", pointer)
+    _remove_stale_snapshots(snapshot_dir, vault_name, keep=filename)
+    return generation
+
+
+def _remove_stale_snapshots(snapshot_dir, vault_name, keep):
+    # Workers still mapping an old file keep it alive on POSIX; where the OS refuses
+    # to delete a mapped file, it is retried on the next publish
+    for filename in os.listdir(snapshot_dir):
+        if filename.startswith(vault_name + ".") and filename.endswith(".snap") and filename != keep:
+            try:
+                os.remove(os.path.join(snapshot_dir, filename))
+            except OSError:
+                pass
+
+
+class Snapshot:
+    """A mapped snapshot file: decoded catalog plus zero-copy graph arrays."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.generation, self.note_count, self.unresolved, *lengths = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not an index snapshot: {path}")
+        view = memoryview(self._map)
+        offset = HEADER.size
+        sections = []
+        for length in lengths:
+            sections.append(view[offset:offset + length])
+            offset += length
+        self.catalog = json.loads(bytes(sections[0]))
+        self.arrays = [section.cast('q') for section in sections[1:]]
+
+    def records(self):
+        for path, mtime_ns, size, links, aliases, tags, headings in self.catalog:
+            parsed = {"links": links, "aliases": aliases, "tags": tuple(tags), "headings": [tuple(h) for h in headings]}
+            yield NoteRecord(path, mtime_ns, size, parsed)
+
+    def link_graph(self):
+        paths = [entry[0] for entry in self.catalog]
+        return LinkGraph.from_arrays(paths, *self.arrays, unresolved=self.unresolved)
+
+
+class SnapshotIndex(VaultIndex):
+    """Read-only VaultIndex of a request worker, loaded from the indexer's snapshots.
+
+    Instead of walking the vault, refresh() checks the vault's snapshot pointer
+    and swaps in a newer snapshot when one was published. Single-note queries
+    still re-check the note on disk (see VaultIndex.get_record).
+    """
+
+    def __init__(self, vault_path, snapshot_dir, vault_name):
+        super().__init__(vault_path)
+        self._pointer = _pointer_path(snapshot_dir, vault_name)
+        self._snapshot_dir = snapshot_dir
+        self._loaded_name = None
+        self._mapped = None # Keeps the current snapshot mapped while its graph is in use
+
+    def refresh(self, force=False):
+        with self.lock:
+            try:
+                with open(self._pointer, 'r', encoding='utf-8') as f:
+                    name = f.read().strip()
+            except OSError:
+                name = None
+            if name is None or (name == self._loaded_name and not force):
+                if name is None and not self._scanned:
+                    super().refresh(force) # No snapshot published yet: index locally
+                return
+            self._load(Snapshot(os.path.join(self._snapshot_dir, name)))
+            self._loaded_name = name
+            self._scanned = True
+
+    def _load(self, snapshot):
+        """Replaces the catalog with the snapshot's and feeds changed notes to components."""
+        old = self._notes
+        self._notes = {record.path: record for record in snapshot.records()}
+        self._catalog_bytes = sum(record.estimated_bytes() for record in self._notes.values())
+        for path in old.keys() - self._notes.keys():
+            self.resolver.remove(path)
+            for component in self._components.values():
+                component.note_removed(path)
+        for path, record in self._notes.items():
+            previous = old.get(path)
+            if previous is not None and previous.mtime_ns == record.mtime_ns and previous.size == record.size:
+                continue
+            self.resolver.add(path, record.aliases)
+            if self._components:
+                try:
+                    text = self._read_note(path).decode('utf-8')
+                except Exception as e:
+                    logger.warning(f"[Snapshot] Skipping unreadable note {path}: {e}")
+                    continue
+                for component in self._components.values():
+                    component.note_indexed(path, text)
+        self.generation = max(self.generation + 1, snapshot.generation)
+        self.link_generation += 1
+        self.path_generation += 1
+        self._graph = snapshot.link_graph()
+        self._graph_dirty.clear()
+        self._graph_stale = False
+        self._graph_generation = self.generation
+        self._mapped = snapshot
+
+    def _journal_external(self, changes):
+        pass # The indexer process journals external changes
+
+    def link_graph(self):
+        self.refresh()
+        with self.lock:
+            if self._graph_generation != self.generation:
+                # A note changed locally since the snapshot (see get_record): rebuild in process
+                self._graph = LinkGraph.from_index(self)
+                self._graph_generation = self.generation
+            return self._graph
+
+
+def publish_all(vaults, snapshot_dir, published):
+    """Refreshes every vault's index and publishes those whose generation moved.
+
+    Args:
+        vaults: Iterable of vault_registry.Vault objects.
+        snapshot_dir: Directory shared with the workers.
+        published: Dict of vault name -> last published generation (updated in place).
+    """
+    from obsidian_mcp_server.utils import vault_registry
+    for vault in vaults:
+        with vault_registry.use_vault(vault.name):
+            index = vault.index
+            index.refresh(force=True)
+            if published.get(vault.name) != index.generation:
+                published[vault.name] = write_snapshot(index, snapshot_dir, vault.name)
+                logger.debug(f"[Snapshot] Published vault '{vault.name}' generation {published[vault.name]}")
@@ -0,0 +1,151 @@
+"""Obsidian-style wikilink resolution over basename and alias indexes."""
+
+import posixpath
+import re
+
+# Start of the subpath part of a link: [[Note#Heading]], [[Note#^block]] or [[Note^block]]
+SUBPATH_REGEX = re.compile(r"[#^]")
+
+_MISSING = object()
+
+MAX_CACHED_RESOLUTIONS = 16384 # The cache starts over when full; building the link graph alone resolves every link once
+
+
+def split_link(link):
+    """Splits a raw link target into (path, subpath).
+
+    Example: 'Folder/Note#Heading' -> ('Folder/Note', '#Heading').
+    """
+    link = link.strip()
+    match = SUBPATH_REGEX.search(link)
+    if match:
+        return link[:match.start()].strip(), link[match.start():]
+    return link, ""
+
+
+def link_key(target):
+    """Normalizes a link path for lookups: forward slashes, lowercase, no .md."""
+    key = target.replace('\\', '/').strip().lower()
+    return key[:-3] if key.endswith('.md') else key
+
+
+def is_attachment_link(target):
+    """True for links to non-note files such as images or PDFs ([[diagram.png]])."""
+    extension = posixpath.splitext(target)[1].lower()
+    return bool(extension) and extension != '.md' and ' ' not in extension
+
+
+def extract_aliases(metadata):
+    """Returns the list of aliases declared in a note's frontmatter ('aliases' or 'alias')."""
+    if not isinstance(metadata, dict):
+        return []
+    raw = metadata.get('aliases', metadata.get('alias'))
+    if isinstance(raw, str):
+        raw = raw.split(',')
+    if not isinstance(raw, list):
+        return []
+    return [str(a).strip() for a in raw if a is not None and str(a).strip()]
+
+
+class LinkResolver:
+    """Resolves link targets to note paths the way Obsidian does.
+
+    Lookup order for a link target:
+      1. Exact vault-relative path (with or without .md).
+      2. Path relative to the linking note's folder.
+      3. Notes with the same basename (and matching folder suffix if the link
+         has one), preferring the linking note's folder, then the shortest path.
+      4. Frontmatter aliases.
+    Each lookup is a dict access; results are cached per (target, source folder)
+    and the cache is cleared when notes or aliases are added or removed, or
+    when it reaches MAX_CACHED_RESOLUTIONS entries.
+    """
+
+    def __init__(self):
+        self._by_key = {}    # 'folder/note' -> 'Folder/Note.md'
+        self._by_name = {}   # 'note' -> set of paths with that basename
+        self._by_alias = {}  # 'alias' -> set of paths declaring it
+        self._aliases = {}   # path -> tuple of alias keys
+        self._cache = {}
+
+    def add(self, path, aliases=()):
+        """Registers a note (or updates its aliases)."""
+        key = link_key(path)
+        alias_keys = tuple(sorted({link_key(a) for a in aliases}))
+        if self._by_key.get(key) == path and self._aliases.get(path, ()) == alias_keys:
+            return # Nothing that affects resolution changed
+        if key in self._by_key:
+            self.remove(self._by_key[key])
+        self._by_key[key] = path
+        self._by_name.setdefault(posixpath.basename(key), set()).add(path)
+        for alias in alias_keys:
+            self._by_alias.setdefault(alias, set()).add(path)
+        self._aliases[path] = alias_keys
+        self._cache.clear()
+
+    def remove(self, path):
+        """Unregisters a note."""
+        key = link_key(path)
+        if self._by_key.get(key) != path:
+            return
+        del self._by_key[key]
+        name = posixpath.basename(key)
+        self._by_name[name].discard(path)
+        if not self._by_name[name]:
+            del self._by_name[name]
+        for alias in self._aliases.pop(path, ()):
+            self._by_alias[alias].discard(path)
+            if not self._by_alias[alias]:
+                del self._by_alias[alias]
+        self._cache.clear()
+
+    def claimants(self, path):
+        """Returns the notes whose links a new note at `path` could take over.
+
+        These are the notes sharing its basename (a link by name or by a
+        relative path may switch to an exact-path match) and the notes
+        declaring its name or path as an alias (names win over aliases).
+        """
+        key = link_key(path)
+        name = posixpath.basename(key)
+        found = set(self._by_name.get(name, ()))
+        found.update(self._by_alias.get(name, ()), self._by_alias.get(key, ()))
+        return found
+
+    def resolve(self, link, source_path=None):
+        """Returns the note path a raw link target points to, or None if unresolved.
+
+        Args:
+            link: The raw text inside [[...]] (alias part already removed).
+            source_path: Relative path of the note containing the link.
+        """
+        target, _ = split_link(link)
+        if not target:
+            return source_path # [[#Heading]] refers to the linking note itself
+        source_dir = posixpath.dirname(source_path) if source_path else ""
+        cache_key = (link_key(target), source_dir)
+        result = self._cache.get(cache_key, _MISSING)
+        if result is _MISSING:
+            result = self._resolve_uncached(cache_key[0], source_dir)
+            if len(self._cache) >= MAX_CACHED_RESOLUTIONS:
+                self._cache.clear()
+            self._cache[cache_key] = result
+        return result
+
+    def _resolve_uncached(self, key, source_dir):
+        if key in self._by_key:
+            return self._by_key[key]
+        if source_dir:
+            relative = posixpath.normpath(posixpath.join(source_dir.lower(), key))
+            if relative in self._by_key:
+                return self._by_key[relative]
+        candidates = self._by_name.get(posixpath.basename(key), ())
+        if '/' in key:
+            candidates = [p for p in candidates if link_key(p).endswith('/' + key)]
+        if candidates:
+            local = [p for p in candidates if posixpath.dirname(p) == source_dir]
+            return min(local or candidates, key=lambda p: (len(p), p))
+        aliased = self._by_alias.get(key)
+        if aliased:
+            return min(aliased, key=lambda p: (len(p), p))
+        return None
@@ -0,0 +1,99 @@
+"""Markdown parsing helpers shared by the vault index and readers."""
+
+import re
+from bisect import bisect_right
+from obsidian_mcp_server.utils.exceptions import SectionNotFoundError
+from obsidian_mcp_server.utils import call_trace
+
+# Same inline tag rule as vault_reader.get_all_tags: #tag, #nested/tag (not ## Header or word#tag)
+INLINE_TAG_REGEX = re.compile(r"(?:^|\s)#([\w-]+(?:/[\w-]+)*)")
+
+# ATX headings ('## Title'), matched on raw bytes so offsets are byte offsets
+HEADING_REGEX = re.compile(rb"^(#{1,6})[ \t]+(.*?)[ \t]*#*[ \t]*\r?$", re.MULTILINE)
+FENCE_REGEX = re.compile(rb"^[ \t]{0,3}(?:```|~~~)", re.MULTILINE)
+
+
+def frontmatter_end(data):
+    """Returns the byte offset where the body starts (0 if there is no frontmatter).
+
+    Follows the same '---' split rule used throughout the readers and writers.
+    """
+    if not data.startswith(b"---"):
+        return 0
+    closing = data.find(b"---", 3)
+    return 0 if closing == -1 else closing + 3
+
+
+def note_body(text):
+    """Returns the text after the frontmatter (the whole text if there is none)."""
+    if text.startswith("---"):
+        parts = text.split("---", 2)
+        if len(parts) == 3:
+            return parts[2]
+    return text
+
+
+def parse_frontmatter(text):
+    """Returns the note's YAML frontmatter as a dict ({} if absent or invalid)."""
+    import yaml # Imported on first use (PyYAML adds noticeably to server startup)
+    if not text.startswith("---"):
+        return {}
+    parts = text.split("---", 2)
+    if len(parts) < 3:
+        return {}
+    try:
+        with call_trace.phase("yaml"):
+            metadata = yaml.safe_load(parts[1])
+    except yaml.YAMLError:
+        return {}
+    return metadata if isinstance(metadata, dict) else {}
+
+
+def extract_tags(metadata, body):
+    """Collects frontmatter 'tags' (string or list) and inline #tags from the body."""
+    tags = set()
+    tags_meta = metadata.get('tags') if isinstance(metadata, dict) else None
+    if isinstance(tags_meta, list):
+        tags.update(t.strip() for t in tags_meta if isinstance(t, str) and t.strip())
+    elif isinstance(tags_meta, str):
+        tags.update(t for t in re.split(r'[\s,]+', tags_meta) if t)
+    tags.update(match.group(1) for match in INLINE_TAG_REGEX.finditer(body))
+    return tags
+
+
+def parse_headings(data, body_start=0):
+    """Builds a note outline from raw bytes.
+
+    Headings inside fenced code blocks are ignored. A section runs from its
+    heading line to the next heading of the same or a higher level (or EOF).
+
+    Returns:
+        A list of (level, text, byte_start, byte_end) tuples in document order.
+    """
+    fences = [m.start() for m in FENCE_REGEX.finditer(data, body_start)]
+    found = []
+    open_sections = [] # Headings whose section has not ended yet
+    for match in HEADING_REGEX.finditer(data, body_start):
+        # An odd number of fences before the heading means it sits inside a code block
+        if bisect_right(fences, match.start()) % 2:
+            continue
+        level = len(match.group(1))
+        while open_sections and open_sections[-1][0] >= level:
+            open_sections.pop()[3] = match.start()
+        heading = [level, match.group(2).decode('utf-8', errors='replace').strip(), match.start(), len(data)]
+        found.append(heading)
+        open_sections.append(heading)
+    return [tuple(h) for h in found]
+
+
+def find_section(headings, heading):
+    """Finds the outline entry for a heading (case-insensitive, leading '#' optional).
+
+    Raises:
+        SectionNotFoundError: If no heading matches.
+    """
+    wanted = heading.strip().lstrip('#').strip().lower()
+    for entry in headings:
+        if entry[1].lower() == wanted:
+            return entry
+    raise SectionNotFoundError(f"Heading not found: {heading}")
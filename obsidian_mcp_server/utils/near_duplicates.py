@@ -0,0 +1,213 @@
+"""Near-duplicate detection with MinHash signatures and LSH banding.
+
+Each note body is reduced to its set of word shingles (runs of SHINGLE_SIZE
+words) and summarized by a MinHash signature of SIGNATURE_SIZE slots; the
+share of equal slots between two signatures estimates the Jaccard similarity
+of their shingle sets. Signatures use one-permutation hashing (each shingle
+is hashed once and lands in one slot, empty slots borrow from the next filled
+one), so computing one costs a single pass over the note.
+
+The signatures are split into BANDS bands, and notes whose band values agree
+share an LSH bucket. Only notes sharing a bucket are compared, so finding all
+duplicates is near-linear in the number of notes rather than quadratic. With
+16 bands of 4 slots, pairs above about 0.5 similarity are found reliably
+(above 0.8, with probability over 0.999).
+
+The index is a VaultIndex component updated per changed note, so queries
+never read files.
+"""
+
+import re
+import logging
+from array import array
+# Import index, parser and exceptions
+from obsidian_mcp_server.utils import vault_index
+from obsidian_mcp_server.utils.markdown_parser import note_body
+from obsidian_mcp_server.utils.exceptions import VaultError
+
+logger = logging.getLogger(__name__)
+
+WORD_REGEX = re.compile(r"\w+")
+
+SHINGLE_SIZE = 3       # Words per shingle
+SIGNATURE_SIZE = 64    # MinHash slots per note
+BANDS = 16             # LSH bands (SIGNATURE_SIZE / BANDS slots each)
+MIN_SHINGLES = 8       # Shorter notes are not indexed (near-empty notes all look alike)
+
+_SLOT_BITS = 6                       # log2(SIGNATURE_SIZE): top hash bits choose the slot
+_VALUE_BITS = 64 - _SLOT_BITS
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_EMPTY = _VALUE_MASK + 1             # Larger than any slot value
+
+
+def minhash_signature(text):
+    """Returns the MinHash signature of a note's body, or None if it has too few shingles."""
+    words = WORD_REGEX.findall(note_body(text).lower())
+    shingles = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    signature = [_EMPTY] * SIGNATURE_SIZE
+    for shingle in shingles:
+        h = hash(shingle) & 0xFFFFFFFFFFFFFFFF
+        slot = h >> _VALUE_BITS
+        value = h & _VALUE_MASK
+        if value < signature[slot]:
+            signature[slot] = value
+    # Densify: an empty slot takes the value of the next filled slot (circularly),
+    # tagged with the distance so that it does not collide with that slot's own value
+    for slot in range(SIGNATURE_SIZE):
+        if signature[slot] == _EMPTY:
+            distance = 1
+            while signature[(slot + distance) % SIGNATURE_SIZE] >= _EMPTY: # Empty, or densified above
+                distance += 1
+            signature[slot] = distance * _EMPTY + signature[(slot + distance) % SIGNATURE_SIZE]
+    return array('Q', signature)
+
+
+def estimate_similarity(a, b):
+    """Estimated Jaccard similarity of two signatures (the share of equal slots)."""
+    return sum(1 for x, y in zip(a, b) if x == y) / SIGNATURE_SIZE
+
+
+class MinHashIndex:
+    """Index component holding a MinHash signature per note and its LSH buckets (see VaultIndex.get_component)."""
+
+    ROWS = SIGNATURE_SIZE // BANDS
+
+    def __init__(self):
+        self._signatures = {}                        # note path -> signature (array of SIGNATURE_SIZE)
+        # band -> {band hash: note path, or set of paths once several share the bucket}
+        self._buckets = [{} for _ in range(BANDS)]
+
+    def _band_keys(self, signature):
+        rows = self.ROWS
+        return [hash(tuple(signature[band * rows:(band + 1) * rows])) for band in range(BANDS)]
+
+    def note_indexed(self, path, text):
+        self.note_removed(path)
+        signature = minhash_signature(text)
+        if signature is None:
+            return
+        self._signatures[path] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            buckets = self._buckets[band]
+            members = buckets.get(key)
+            if members is None:
+                buckets[key] = path # Most buckets hold a single note
+            elif isinstance(members, str):
+                buckets[key] = {members, path}
+            else:
+                members.add(path)
+
+    def note_removed(self, path):
+        signature = self._signatures.pop(path, None)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            buckets = self._buckets[band]
+            members = buckets.get(key)
+            if members == path:
+                del buckets[key]
+            elif isinstance(members, set):
+                members.discard(path)
+                if len(members) == 1:
+                    buckets[key] = members.pop()
+
+    def estimated_bytes(self):
+        return len(self._signatures) * (SIGNATURE_SIZE * 8 + 200 + BANDS * 70)
+
+    def similar(self, path, threshold):
+        """Returns (path, similarity) pairs of the notes sharing a bucket with `path` and at least as similar as threshold."""
+        signature = self._signatures.get(path)
+        if signature is None:
+            return []
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            members = self._buckets[band].get(key)
+            if isinstance(members, set):
+                candidates.update(members)
+        candidates.discard(path)
+        found = []
+        for candidate in candidates:
+            similarity = estimate_similarity(signature, self._signatures[candidate])
+            if similarity >= threshold:
+                found.append((candidate, similarity))
+        return found
+
+    def duplicate_pairs(self, threshold):
+        """Yields (path_a, path_b, similarity) for every candidate pair from the buckets at or above threshold."""
+        seen = set()
+        for buckets in self._buckets:
+            for members in buckets.values():
+                if isinstance(members, str):
+                    continue
+                ordered = sorted(members)
+                for i, a in enumerate(ordered):
+                    for b in ordered[i + 1:]:
+                        if (a, b) in seen:
+                            continue
+                        seen.add((a, b))
+                        similarity = estimate_similarity(self._signatures[a], self._signatures[b])
+                        if similarity >= threshold:
+                            yield a, b, similarity
+
+
+def _check_threshold(threshold):
+    if not 0 < threshold <= 1:
+        raise VaultError(f"[Duplicates] threshold must be between 0 (exclusive) and 1, got {threshold}")
+
+
+def find_duplicate_notes(threshold=0.8, limit=100):
+    """Finds pairs of notes whose bodies are near-duplicates.
+
+    Args:
+        threshold: Minimum estimated Jaccard similarity of the notes' word
+            shingles (1.0 means the same text). Reliable from about 0.5 up.
+        limit: Maximum number of pairs to return.
+
+    Returns:
+        A dict with 'pairs' ({'paths': [a, b], 'similarity'} dicts, most
+        similar first) and 'total', the number of pairs found before the limit.
+    Raises:
+        VaultError: If threshold or limit is invalid.
+    """
+    _check_threshold(threshold)
+    if limit < 1:
+        raise VaultError(f"[Duplicates] limit must be at least 1, got {limit}")
+    index = vault_index.get_index()
+    minhash = index.get_component("minhash", MinHashIndex)
+    with index.lock:
+        pairs = list(minhash.duplicate_pairs(threshold))
+    pairs.sort(key=lambda p: (-p[2], p[0], p[1]))
+    return {
+        "pairs": [{"paths": [a, b], "similarity": round(similarity, 4)} for a, b, similarity in pairs[:limit]],
+        "total": len(pairs),
+    }
+
+
+def find_similar_by_content(note_path, threshold=0.5, k=10):
+    """Finds the notes whose text overlaps most with a note (near-duplicates and copied passages).
+
+    Unlike find_related_notes, which ranks notes by shared vocabulary, this
+    compares word sequences, so it finds notes copied or derived from this one.
+
+    Args:
+        note_path: Path of the note to compare against.
+        threshold: Minimum estimated Jaccard similarity of word shingles.
+        k: Maximum number of results.
+
+    Returns:
+        A list of {'path', 'similarity'} dicts, most similar first (empty if
+        the note is too short to compare).
+    Raises:
+        NoteNotFoundError: If the note does not exist.
+        VaultError: If threshold is invalid.
+    """
+    _check_threshold(threshold)
+    index = vault_index.get_index()
+    record = index.get_record(note_path) # Validates the path and refreshes this note
+    minhash = index.get_component("minhash", MinHashIndex)
+    with index.lock:
+        similar = minhash.similar(record.path, threshold)
+    similar.sort(key=lambda p: (-p[1], p[0]))
+    return [{"path": path, "similarity": round(similarity, 4)} for path, similarity in similar[:max(k, 0)]]
@@ -0,0 +1,242 @@
+"""Moving and renaming notes and folders with [[link]] rewriting.
+
+Only the notes that refer to a moved note, or to a note whose links the moved
+note would take over at its new path, are read and rewritten: they are found
+through the backlinks of the link graph (and, for attachments inside a moved
+folder, the raw links kept in the index catalog), so a move never scans the
+vault.
+
+A move runs as one write set. The referring notes are backed up, and their
+new contents are staged as temporary files in the backup directory. Then the
+note or folder is renamed, and the staged files replace the originals. Each
+step is an atomic rename, and a failure before the move leaves the vault
+untouched.
+"""
+
+import os
+import re
+import posixpath
+import logging
+# Import config, index, journal and exceptions
+from obsidian_mcp_server.config import settings
+from obsidian_mcp_server.utils import vault_index, vault_writer, change_journal
+from obsidian_mcp_server.utils.link_resolver import LinkResolver, split_link, link_key, is_attachment_link
+from obsidian_mcp_server.utils.vault_registry import vault_root
+from obsidian_mcp_server.utils.exceptions import VaultError, NoteNotFoundError, InvalidPathError, NoteCreationError
+
+logger = logging.getLogger(__name__)
+
+# [[target]], [[target#Heading]], [[target|alias]] (and embeds, whose '!' stays outside the match)
+WIKILINK_REGEX = re.compile(r"\[\[([^\]|]+)(\|[^\]]+)?\]\]")
+
+
+def _vault_relative(relative_path, what):
+    """Normalizes a vault-relative path, rejecting paths that leave the vault."""
+    path = vault_index.normalize_note_path(relative_path).strip('/')
+    if os.path.isabs(relative_path) or path in ("", ".", "..") or path.startswith("../"):
+        raise InvalidPathError(f"[Move] {what} path outside vault or empty: {relative_path}")
+    return path
+
+
+class _Rewriter:
+    """Computes the new link text for links to moved notes.
+
+    Links are checked against a resolver of the vault as it will be after the
+    move, so a link that the moved note would take over from another note
+    (an exact path beats a basename, a name beats an alias) is pinned to the
+    full path of the note it points to now.
+    """
+
+    def __init__(self, index, moves, folders=()):
+        self.index = index
+        self.moves = moves     # old path -> new path
+        self.folders = folders # (old folder, new folder) pairs, for attachment links
+        self.names = {}        # basename key -> number of notes with it after the move
+        self.after = LinkResolver() # Resolution once the move is done
+        for record in index.records():
+            path = moves.get(record.path, record.path)
+            name = posixpath.basename(link_key(path))
+            self.names[name] = self.names.get(name, 0) + 1
+            self.after.add(path, record.aliases)
+
+    def _full_or_short(self, target, path):
+        """Writes a link to `path` as its bare name if that is unambiguous, else as its full path."""
+        short = '/' not in target and not target.startswith('.')
+        if short and self.names.get(posixpath.basename(link_key(path))) == 1:
+            text = posixpath.basename(path)[:-3] # Obsidian's default "shortest path" link
+        else:
+            text = path[:-3]
+        return text + (".md" if target.lower().endswith(".md") else "")
+
+    def _new_target(self, target, resolved, source_path):
+        """Returns the link target to write instead of `target`, or None to keep it."""
+        key = link_key(target)
+        if resolved in self.moves:
+            if key != link_key(resolved) and key != posixpath.basename(link_key(resolved)) and '/' not in key:
+                return None # Alias links ([[Nickname]]) follow the note wherever it goes
+            text = self._full_or_short(target, self.moves[resolved])
+        elif source_path in self.moves and (target.startswith('.') or self.names.get(key, 0) > 1):
+            # A link from a moved note resolved relative to its old folder: pin it down
+            text = resolved[:-3] + (".md" if target.lower().endswith(".md") else "")
+        else:
+            return None
+        return None if text == target else text
+
+    def _attachment_target(self, target):
+        for old_folder, new_folder in self.folders:
+            if target.lower().startswith(old_folder.lower() + "/"):
+                return new_folder + target[len(old_folder):]
+        return None
+
+    def rewrite(self, text, source_path):
+        """Returns (new text, number of links rewritten) for one note, using pre-move resolution."""
+        count = 0
+        def replace(match):
+            nonlocal count
+            target, subpath = split_link(match.group(1))
+            if not target:
+                return match.group(0) # [[#Heading]] stays valid wherever the note goes
+            resolved = self.index.resolve_link(target, source_path)
+            display = match.group(2) or ''
+            if resolved is not None:
+                new_target = self._new_target(target, resolved, source_path)
+                expected = self.moves.get(resolved, resolved)
+                written = target if new_target is None else new_target
+                if self.after.resolve(written, self.moves.get(source_path, source_path)) != expected:
+                    new_target = expected[:-3] + (".md" if target.lower().endswith(".md") else "")
+                    if not display and posixpath.basename(link_key(target)) != posixpath.basename(link_key(expected)):
+                        display = "|" + target # An alias link keeps showing the alias
+            else:
+                new_target = self._attachment_target(target) if is_attachment_link(target) else None
+            if new_target is None:
+                return match.group(0)
+            count += 1
+            return f"[[{new_target}{subpath}{display}]]"
+        return WIKILINK_REGEX.sub(replace, text), count
+
+
+def _apply(index, moves, rename, referring, backup, rewriter):
+    """Stages the rewritten notes, performs the rename, then installs the staged notes.
+
+    Returns:
+        A dict with 'moved' (old -> new paths), 'rewritten' notes and 'links_updated'.
+    """
+    root = vault_root()
+    staging_dir = os.path.join(root, settings.backup_dir_name, ".pending")
+    staged = [] # (temporary file, final path)
+    links_updated = 0
+    try:
+        for path in sorted(referring):
+            with open(os.path.join(root, path), 'r', encoding='utf-8', newline='') as f:
+                text = f.read()
+            new_text, count = rewriter.rewrite(text, path)
+            if not count:
+                continue
+            if backup and not vault_writer._create_backup(path):
+                raise VaultError(f"[Move] Backup failed for {path}. Aborting move.")
+            os.makedirs(staging_dir, exist_ok=True)
+            temporary = os.path.join(staging_dir, f"{len(staged)}-{os.getpid()}.md.tmp")
+            with open(temporary, 'w', encoding='utf-8', newline='') as f:
+                f.write(new_text)
+            staged.append((temporary, moves.get(path, path)))
+            links_updated += count
+        rename()
+    except Exception:
+        for temporary, _ in staged:
+            os.remove(temporary)
+        raise
+    for temporary, final_path in staged:
+        os.replace(temporary, os.path.join(root, final_path))
+    # Keep the index and the change journal in step with the write set
+    journal = []
+    for old_path, new_path in moves.items():
+        index.notify_deleted(old_path)
+        index.notify_changed(new_path)
+        journal.append(("move", new_path, old_path))
+    rewritten = sorted(final for _, final in staged)
+    for path in rewritten:
+        if path not in moves.values():
+            index.notify_changed(path)
+            journal.append(("edit", path))
+    change_journal.record_changes(journal)
+    return {"moved": moves, "rewritten": rewritten, "links_updated": links_updated}
+
+
+def _referring_notes(index, moves):
+    """Returns the notes whose links a move may change: the moved notes, the notes
+    linking to them, and the notes linking to notes whose links the moved notes
+    could take over at their new paths (see LinkResolver.claimants)."""
+    graph = index.link_graph()
+    targets = set(moves)
+    for destination in moves.values():
+        targets.update(p for p in index.resolver.claimants(destination) if p not in moves)
+    referring = set(moves)
+    for path in targets:
+        referring.update(graph.paths[i] for i in graph.predecessors(graph.node_id(path)))
+    return referring
+
+
+def move_note(source_path, destination_path, backup=True):
+    """Moves or renames a note and rewrites the links that point to it.
+
+    Args:
+        source_path: Vault-relative path of the note.
+        destination_path: New vault-relative path ('.md' is added if missing).
+        backup: If True (default), backs up every note whose links are rewritten.
+
+    Returns:
+        A dict with 'moved' ({old: new}), 'rewritten' (notes whose links
+        changed) and 'links_updated' (number of links rewritten).
+    Raises:
+        NoteNotFoundError, InvalidPathError, NoteCreationError (destination exists), VaultError
+    """
+    source = _vault_relative(source_path, "Source")
+    destination = _vault_relative(destination_path, "Destination")
+    if not destination.lower().endswith(".md"):
+        destination += ".md"
+    root = vault_root()
+    index = vault_index.get_index()
+    record = index.get_record(source) # Raises NoteNotFoundError
+    if os.path.exists(os.path.join(root, destination)):
+        raise NoteCreationError(f"[Move] Destination already exists: {destination}")
+    moves = {record.path: destination}
+    def rename():
+        os.makedirs(os.path.dirname(os.path.join(root, destination)), exist_ok=True)
+        os.rename(os.path.join(root, record.path), os.path.join(root, destination))
+    with index.lock:
+        rewriter = _Rewriter(index, moves)
+        return _apply(index, moves, rename, _referring_notes(index, moves), backup, rewriter)
+
+
+def move_folder(source_folder, destination_folder, backup=True):
+    """Moves or renames a folder with everything in it and rewrites links to its notes.
+
+    Links to attachments inside the folder that spell out the folder path
+    ([[Folder/image.png]]) are rewritten as well.
+
+    Returns:
+        A dict with 'moved' ({old: new} for every note), 'rewritten' and 'links_updated'.
+    Raises:
+        NoteNotFoundError, InvalidPathError, NoteCreationError (destination exists), VaultError
+    """
+    source = _vault_relative(source_folder, "Source")
+    destination = _vault_relative(destination_folder, "Destination")
+    root = vault_root()
+    if not os.path.isdir(os.path.join(root, source)):
+        raise NoteNotFoundError(f"[Move] Folder not found: {source}")
+    if os.path.exists(os.path.join(root, destination)):
+        raise NoteCreationError(f"[Move] Destination already exists: {destination}")
+    if (destination + "/").startswith(source + "/"):
+        raise InvalidPathError(f"[Move] Cannot move folder {source} into itself")
+    index = vault_index.get_index()
+    prefix = source + "/"
+    def rename():
+        os.makedirs(os.path.dirname(os.path.join(root, destination)), exist_ok=True)
+        os.rename(os.path.join(root, source), os.path.join(root, destination))
+    with index.lock:
+        moves = {p: destination + "/" + p[len(prefix):] for p in index.note_paths() if p.startswith(prefix)}
+        referring = _referring_notes(index, moves)
+        referring.update(r.path for r in index.records()
+                         if any(is_attachment_link(l) and l.lower().startswith(prefix.lower()) for l in r.links))
+        rewriter = _Rewriter(index, moves, folders=[(source, destination)])
+        return _apply(index, moves, rename, referring, backup, rewriter)
@@ -0,0 +1,201 @@
+"""Line-ranged and tail reads for large notes, without loading the whole file."""
+
+import os
+import threading
+from array import array
+from collections import OrderedDict
+# Import exceptions
+from obsidian_mcp_server.utils.exceptions import VaultError, NoteNotFoundError, InvalidPathError
+from obsidian_mcp_server.utils.vault_registry import vault_root
+from obsidian_mcp_server.utils import call_trace
+
+BLOCK_SIZE = 64 * 1024      # Bytes read per I/O call
+LINE_INDEX_STRIDE = 1024    # One cached byte offset every N lines
+MAX_CACHED_NOTES = 256      # Line-offset indexes kept in memory
+
+
+class _LineIndex:
+    """Sparse line-offset index: offsets[k] is the byte offset of line k * LINE_INDEX_STRIDE."""
+    __slots__ = ("mtime_ns", "size", "offsets")
+
+    def __init__(self, mtime_ns, size):
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.offsets = array('q', [0])
+
+
+_line_indexes = OrderedDict() # full path -> _LineIndex (LRU)
+_line_indexes_lock = threading.Lock()
+
+
+def _resolve_note(note_path):
+    """Validates a note path and returns (full_path, stat_result)."""
+    full_path = os.path.join(vault_root(), note_path)
+    if not os.path.abspath(full_path).startswith(os.path.abspath(vault_root())):
+        raise InvalidPathError(f"[Range] Attempted access outside vault: {note_path}")
+    try:
+        st = os.stat(full_path)
+    except FileNotFoundError:
+        raise NoteNotFoundError(f"Note not found: {note_path}") from None
+    if not os.path.isfile(full_path):
+        raise NoteNotFoundError(f"Note not found: {note_path}")
+    return full_path, st
+
+
+def _get_line_index(full_path, st):
+    """Returns the cached line index for a file, discarding it if the file changed."""
+    with _line_indexes_lock:
+        index = _line_indexes.get(full_path)
+        if index is None or index.mtime_ns != st.st_mtime_ns or index.size != st.st_size:
+            index = _LineIndex(st.st_mtime_ns, st.st_size)
+            _line_indexes[full_path] = index
+        _line_indexes.move_to_end(full_path)
+        while len(_line_indexes) > MAX_CACHED_NOTES:
+            _line_indexes.popitem(last=False)
+        return index
+
+
+def _seek_to_line(f, index, line):
+    """Positions `f` at the start of 0-based `line`, extending the sparse index on the way.
+
+    Returns:
+        The byte offset of the line, or None if the file has fewer lines.
+    """
+    checkpoint = min(line // LINE_INDEX_STRIDE, len(index.offsets) - 1)
+    position = index.offsets[checkpoint]
+    current = checkpoint * LINE_INDEX_STRIDE
+    f.seek(position)
+    while current < line:
+        block = f.read(BLOCK_SIZE)
+        if not block:
+            return None
+        start = 0
+        while current < line:
+            newline = block.find(b'\n', start)
+            if newline == -1:
+                break
+            current += 1
+            start = newline + 1
+            if current % LINE_INDEX_STRIDE == 0 and current // LINE_INDEX_STRIDE == len(index.offsets):
+                index.offsets.append(position + start)
+        if current == line:
+            f.seek(position + start)
+            return position + start
+        position += len(block)
+    if position >= index.size:
+        return None # Line starts exactly at EOF: nothing to read
+    return position
+
+
+def get_note_range(note_path, start_line=1, end_line=None):
+    """Reads lines start_line..end_line (1-based, inclusive) of a note.
+
+    Only the requested slice is read: a sparse per-note index of line offsets
+    lets later calls seek close to any previously visited line.
+
+    Returns:
+        A dict with the 'content', the actual 'start_line'/'end_line' returned,
+        and 'next_line' (the line to request next, or None at end of file).
+    """
+    if start_line < 1 or (end_line is not None and end_line < start_line):
+        raise VaultError(f"[Range] Invalid line range {start_line}-{end_line}. Lines are 1-based and inclusive.")
+    full_path, st = _resolve_note(note_path)
+    index = _get_line_index(full_path, st)
+    wanted = None if end_line is None else end_line - start_line + 1
+    try:
+        with open(full_path, 'rb') as f:
+            if _seek_to_line(f, index, start_line - 1) is None:
+                return {"content": "", "start_line": start_line, "end_line": start_line - 1, "next_line": None}
+            chunks = []
+            lines_read = 0
+            at_eof = False
+            while wanted is None or lines_read < wanted:
+                block = f.read(BLOCK_SIZE)
+                if not block:
+                    at_eof = True
+                    break
+                if wanted is not None:
+                    cut = -1
+                    for _ in range(wanted - lines_read):
+                        cut = block.find(b'\n', cut + 1)
+                        if cut == -1:
+                            break
+                        lines_read += 1
+                    if cut != -1 and lines_read == wanted:
+                        chunks.append(block[:cut + 1])
+                        at_eof = f.tell() - len(block) + cut + 1 >= st.st_size
+                        break
+                else:
+                    lines_read += block.count(b'\n')
+                chunks.append(block)
+    except Exception as e:
+        raise VaultError(f"[Range] Error reading lines of {note_path}: {e}") from e
+    data = b"".join(chunks)
+    call_trace.count_read(len(data))
+    if at_eof and data and not data.endswith(b'\n'):
+        lines_read += 1 # Last line without a trailing newline
+    last_line = start_line + lines_read - 1
+    return {
+        "content": data.decode('utf-8', errors='replace'),
+        "start_line": start_line,
+        "end_line": last_line,
+        "next_line": None if at_eof else last_line + 1,
+    }
+
+
+def get_note_tail(note_path, n_lines=50, end_offset=None):
+    """Reads the last `n_lines` lines of a note by scanning blocks backwards from the end.
+
+    Args:
+        note_path: Path to the note relative to the vault root.
+        n_lines: Number of lines to return.
+        end_offset: Read the lines ending before this byte offset instead of
+            the end of the file (pass a previous 'start_offset' to page back).
+
+    Returns:
+        A dict with the 'content', its 'start_offset'/'end_offset' in bytes and
+        'has_more' (True if earlier lines exist before start_offset).
+    """
+    if n_lines < 1:
+        raise VaultError(f"[Tail] n_lines must be at least 1, got {n_lines}")
+    full_path, st = _resolve_note(note_path)
+    end = st.st_size if end_offset is None else max(0, min(end_offset, st.st_size))
+    try:
+        with open(full_path, 'rb') as f:
+            position = end
+            chunks = []
+            newlines = 0
+            start = 0
+            # A trailing newline terminates the last line rather than starting a new one
+            if end > 0:
+                f.seek(end - 1)
+                if f.read(1) == b'\n':
+                    newlines = -1
+            while position > 0:
+                read_size = min(BLOCK_SIZE, position)
+                position -= read_size
+                f.seek(position)
+                block = f.read(read_size)
+                cut = len(block)
+                while True:
+                    cut = block.rfind(b'\n', 0, cut)
+                    if cut == -1:
+                        break
+                    newlines += 1
+                    if newlines == n_lines:
+                        break
+                if cut != -1:
+                    chunks.append(block[cut + 1:])
+                    start = position + cut + 1
+                    break
+                chunks.append(block)
+    except Exception as e:
+        raise VaultError(f"[Tail] Error reading end of {note_path}: {e}") from e
+    data = b"".join(reversed(chunks))
+    call_trace.count_read(len(data))
+    return {
+        "content": data.decode('utf-8', errors='replace'),
+        "start_offset": start,
+        "end_offset": end,
+        "has_more": start > 0,
+    }
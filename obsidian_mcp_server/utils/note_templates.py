@@ -0,0 +1,150 @@
+"""Note templates compiled once and re-read only when the template file changes.
+
+A template is split into literal text and `{{placeholders}}` when it is
+loaded, so rendering a note is a single join. Supported placeholders:
+
+    {{date}}            The note's date in OMCP_DAILY_NOTE_FORMAT
+    {{date:YYYY-MM-DD}} The note's date in a moment.js-style format (as in Obsidian)
+    {{time}}            The creation time as HH:mm ({{time:FORMAT}} also works)
+    {{title}}           The note's file name without .md
+    {{name}}            Any other variable passed to render() (or configured in
+                        OMCP_DAILY_NOTE_TEMPLATE_VARIABLES)
+
+Unknown placeholders are left in the note unchanged.
+"""
+
+import os
+import re
+import datetime
+import threading
+import logging
+from functools import lru_cache
+# Import exceptions
+from obsidian_mcp_server.utils.exceptions import VaultError, InvalidPathError
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_REGEX = re.compile(r"{{\s*(\w+)(?::([^{}]*))?\s*}}")
+
+# moment.js format tokens (longest first) -> strftime codes; [text] is literal text.
+# Formats are scanned by runs of letters: a run made only of tokens is converted,
+# any other run (a word, an unsupported token) is kept literally as a whole.
+MOMENT_TOKEN_REGEX = re.compile(r"YYYY|YY|MMMM|MMM|MM|M|DDDD|DDD|DD|Do|D|dddd|ddd|HH|H|hh|h|mm|ss|A|WW|W")
+MOMENT_RUN_REGEX = re.compile(r"\[[^\]]*\]|[A-Za-z]+")
+MOMENT_STRFTIME_MAP = {
+    'YYYY': '%Y', 'YY': '%y',
+    'MMMM': '%B', 'MMM': '%b', 'MM': '%m',
+    'DDDD': '%j', 'DD': '%d',
+    'dddd': '%A', 'ddd': '%a',
+    'HH': '%H', 'hh': '%I', 'mm': '%M', 'ss': '%S', 'A': '%p',
+    'WW': '%V',
+}
+
+
+@lru_cache(maxsize=64)
+def moment_to_strftime(moment_format):
+    """Converts a moment.js-style date format (YYYY-MM-DD, dddd, ...) to a strftime format."""
+    def convert(match):
+        run = match.group(0)
+        if run.startswith('['):
+            return run[1:-1]
+        tokens, position = [], 0
+        while position < len(run):
+            token = MOMENT_TOKEN_REGEX.match(run, position)
+            if token is None:
+                return run # Not made of tokens: literal text
+            tokens.append(token.group(0))
+            position = token.end()
+        # Tokens without a strftime code (unpadded, ordinal) are filled in by format_moment()
+        return "".join(MOMENT_STRFTIME_MAP.get(token, "{" + token + "}") for token in tokens)
+    return MOMENT_RUN_REGEX.sub(convert, moment_format.replace('%', '%%').replace('{', '{{').replace('}', '}}'))
+
+
+def _ordinal(number):
+    """Returns a number with its English ordinal suffix (1st, 2nd, 3rd, 4th, 11th, ...)."""
+    if 11 <= number % 100 <= 13:
+        return f"{number}th"
+    return f"{number}" + {1: "st", 2: "nd", 3: "rd"}.get(number % 10, "th")
+
+
+def format_moment(moment, moment_format):
+    """Formats a date or datetime with a moment.js-style format."""
+    text = moment.strftime(moment_to_strftime(moment_format))
+    hour = getattr(moment, "hour", 0)
+    unpadded = {"M": moment.month, "D": moment.day, "Do": _ordinal(moment.day), "DDD": moment.timetuple().tm_yday,
+                "W": moment.isocalendar()[1], "H": hour, "h": (hour % 12) or 12}
+    return text.format(**unpadded)
+
+
+class CompiledTemplate:
+    """A template split into literal text and placeholders."""
+
+    def __init__(self, text):
+        self.parts = [] # Literal strings and (name, format, original text) placeholders, in order
+        position = 0
+        for match in PLACEHOLDER_REGEX.finditer(text):
+            if match.start() > position:
+                self.parts.append(text[position:match.start()])
+            self.parts.append((match.group(1), match.group(2), match.group(0)))
+            position = match.end()
+        if position < len(text):
+            self.parts.append(text[position:])
+
+    def render(self, date, title, default_date_format, variables=None, now=None):
+        """Returns the template text with its placeholders filled in.
+
+        Args:
+            date: The note's date (datetime.date).
+            title: The note's file name without extension.
+            default_date_format: strftime format used by a bare {{date}}.
+            variables: Dict of custom placeholder values.
+            now: Creation time for {{time}} (defaults to now).
+        """
+        now = now or datetime.datetime.now()
+        variables = variables or {}
+        rendered = []
+        for part in self.parts:
+            if isinstance(part, str):
+                rendered.append(part)
+                continue
+            name, moment_format, original = part
+            if name == "date":
+                rendered.append(format_moment(date, moment_format) if moment_format else date.strftime(default_date_format))
+            elif name == "time":
+                rendered.append(format_moment(now, moment_format or "HH:mm"))
+            elif name == "title":
+                rendered.append(title)
+            elif name in variables:
+                rendered.append(str(variables[name]))
+            else:
+                rendered.append(original)
+        return "".join(rendered)
+
+
+_templates = {} # absolute path -> (mtime_ns, size, CompiledTemplate)
+_templates_lock = threading.Lock()
+
+
+def get_template(vault_path, relative_path):
+    """Returns the compiled template at relative_path, re-reading it only if it changed on disk.
+
+    Raises:
+        InvalidPathError: If the template lies outside the vault.
+        VaultError: If the template cannot be read.
+    """
+    full_path = os.path.abspath(os.path.join(vault_path, relative_path))
+    if not full_path.startswith(os.path.abspath(vault_path)):
+        raise InvalidPathError(f"[Template] Template outside vault: {relative_path}")
+    try:
+        st = os.stat(full_path)
+        with _templates_lock:
+            cached = _templates.get(full_path)
+            if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+                return cached[2]
+        with open(full_path, 'r', encoding='utf-8') as f:
+            template = CompiledTemplate(f.read())
+    except OSError as e:
+        raise VaultError(f"[Template] Cannot read template {relative_path}: {e}") from e
+    with _templates_lock:
+        _templates[full_path] = (st.st_mtime_ns, st.st_size, template)
+    return template
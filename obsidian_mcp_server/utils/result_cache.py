@@ -0,0 +1,142 @@
+"""Bounded cache of tool results, invalidated per vault and dependency class.
+
+Entries are keyed by (vault, tool name, normalized arguments) and remember the
+generation of the vault's index they were computed at. Invalidation is not
+per entry: it covers every entry of one vault in one dependency class.
+
+*   "notes": the result depends on note content. Any change to the vault's
+    notes, whether written through vault_writer or detected on disk by the
+    index rescan, bumps the index generation. Every "notes" entry of that
+    vault then stops matching.
+*   "links": the result depends only on which notes exist and how they link
+    (backlinks, orphans, centrality, ...). These entries follow the index's
+    link_generation. It moves only when a note is created, deleted or moved,
+    or when a note's links or aliases change. Edits to note text keep them valid.
+
+Entries of other vaults stay valid in both cases. Only derived results are
+cached. Tools that return note content read the files on every call.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+# Import config and index
+from obsidian_mcp_server.config import settings
+from obsidian_mcp_server.utils import vault_index, vault_registry
+
+
+class ResultCache:
+    """LRU of tool results bounded by the approximate size of the cached values."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict() # key -> (generation of its dependency class, value, size)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {}              # tool name -> [hits, misses]
+
+    @staticmethod
+    def _size(key, value):
+        try:
+            return len(key) + len(value if isinstance(value, str) else json.dumps(value, default=str))
+        except (TypeError, ValueError):
+            return len(key) + len(repr(value))
+
+    def get_or_compute(self, tool_name, arguments, compute, depends="notes"):
+        """Returns the cached result for this call, or computes and caches it.
+
+        Args:
+            tool_name: Name of the tool (part of the key).
+            arguments: Dict of the call's arguments (normalized into the key).
+            compute: Zero-argument callable producing the result. Exceptions propagate
+                and are not cached.
+            depends: Dependency class, "notes" or "links" (see the module docstring).
+        """
+        vault = vault_registry.current_vault()
+        index = vault_index.get_index()
+        index.refresh() # Picks up external edits (rate-limited), which bumps the generation
+        generation = index.link_generation if depends == "links" else index.generation
+        key = json.dumps([vault.name, tool_name, arguments], sort_keys=True, default=str)
+        with self._lock:
+            stats = self._stats.setdefault(tool_name, [0, 0])
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == generation:
+                self._entries.move_to_end(key)
+                stats[0] += 1
+                return entry[1]
+            stats[1] += 1
+        value = compute()
+        size = self._size(key, value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            if size <= self.max_bytes:
+                self._entries[key] = (generation, value, size)
+                self._bytes += size
+                while self._bytes > self.max_bytes:
+                    _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                    self._bytes -= evicted_size
+        return value
+
+    def evict(self, nbytes):
+        """Drops least recently used entries until about nbytes are freed. Returns the bytes freed."""
+        freed = 0
+        with self._lock:
+            while self._entries and freed < nbytes:
+                _, (_, _, size) = self._entries.popitem(last=False)
+                self._bytes -= size
+                freed += size
+        return freed
+
+    def cached_bytes(self):
+        return self._bytes
+
+    def stats(self):
+        """Returns overall and per-tool hit/miss counts and hit rates, plus the cache's size."""
+        with self._lock:
+            hits = sum(h for h, _ in self._stats.values())
+            misses = sum(m for _, m in self._stats.values())
+            return {
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "tools": {
+                    name: {"hits": h, "misses": m, "hit_rate": round(h / (h + m), 4) if h + m else 0.0}
+                    for name, (h, m) in sorted(self._stats.items())
+                },
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Returns the process-wide ResultCache, or None if OMCP_RESULT_CACHE_MB is 0."""
+    global _cache
+    if settings.result_cache_mb <= 0:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache(settings.result_cache_mb * 1024 * 1024)
+        return _cache
+
+
+def cached_call(tool_name, arguments, compute, depends="notes"):
+    """Runs compute() through the result cache (or directly if caching is disabled)."""
+    cache = get_result_cache()
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(tool_name, arguments, compute, depends)
+
+
+def get_cache_stats():
+    """Returns the result cache statistics ({'enabled': False} if disabled)."""
+    cache = get_result_cache()
+    if cache is None:
+        return {"enabled": False}
+    return dict(cache.stats(), enabled=True)
@@ -0,0 +1,183 @@
+"""Vault-wide index of checkbox tasks (`- [ ] ...`) and in-place task toggling.
+
+The index is a VaultIndex component: it parses the tasks of each note when the
+note is indexed and is updated per changed note, so queries never read files.
+"""
+
+import os
+import re
+import logging
+from bisect import bisect_right
+# Import index, parser, journal and exceptions
+from obsidian_mcp_server.utils import vault_index, vault_writer, change_journal, call_trace
+from obsidian_mcp_server.utils.markdown_parser import INLINE_TAG_REGEX
+from obsidian_mcp_server.utils.vault_registry import vault_root
+from obsidian_mcp_server.utils.exceptions import VaultError, InvalidPathError, BackupError
+
+logger = logging.getLogger(__name__)
+
+# List item with a checkbox: '- [ ] text', '* [x] text', '1. [ ] text'
+TASK_REGEX = re.compile(r"^[ \t]*(?:[-*+]|\d+[.)])[ \t]+\[(.)\][ \t]+(.*?)[ \t]*\r?$", re.MULTILINE)
+FENCE_REGEX = re.compile(r"^[ \t]{0,3}(?:```|~~~)", re.MULTILINE)
+FENCE_BYTES_REGEX = re.compile(FENCE_REGEX.pattern.encode('ascii'), re.MULTILINE) # For toggle_task's raw bytes
+# Due dates: Tasks-plugin emoji format or a Dataview inline field
+DUE_REGEX = re.compile(r"(?:📅|\bdue::)\s*(\d{4}-\d{2}-\d{2})")
+
+STATUS_NAMES = {' ': "open", 'x': "done", 'X': "done", '-': "cancelled", '/': "in_progress"}
+
+
+def status_name(mark):
+    """Maps a checkbox character to a status name (other characters are returned as-is)."""
+    return STATUS_NAMES.get(mark, mark)
+
+
+def parse_tasks(text):
+    """Returns the tasks of a note as (line, mark, text, due, tags) tuples, outside code blocks.
+
+    `line` is 1-based, `due` an ISO date string or None, `tags` a tuple.
+    """
+    fences = [m.start() for m in FENCE_REGEX.finditer(text)]
+    tasks = []
+    line, position = 1, 0
+    for match in TASK_REGEX.finditer(text):
+        if fences and bisect_right(fences, match.start()) % 2:
+            continue # Inside a fenced code block
+        line += text.count('\n', position, match.start())
+        position = match.start()
+        task_text = match.group(2)
+        due = DUE_REGEX.search(task_text)
+        tags = tuple(sorted(set(m.group(1) for m in INLINE_TAG_REGEX.finditer(task_text))))
+        tasks.append((line, match.group(1), task_text, due.group(1) if due else None, tags))
+    return tasks
+
+
+class TaskIndex:
+    """Index component holding the parsed tasks of every note (see VaultIndex.get_component)."""
+
+    def __init__(self):
+        self._tasks = {} # note path -> list of (line, mark, text, due, tags); notes without tasks are absent
+
+    def note_indexed(self, path, text):
+        tasks = parse_tasks(text) if '[' in text else []
+        if tasks:
+            self._tasks[path] = tasks
+        else:
+            self._tasks.pop(path, None)
+
+    def note_removed(self, path):
+        self._tasks.pop(path, None)
+
+    def estimated_bytes(self):
+        return sum(len(tasks) * 400 + sum(len(t[2]) for t in tasks) for tasks in self._tasks.values())
+
+    def query(self, statuses=None, due_before=None, tag=None, prefix=None):
+        """Yields (path, task) pairs matching the filters, in path and line order."""
+        for path in sorted(self._tasks):
+            if prefix and not path.startswith(prefix):
+                continue
+            for task in self._tasks[path]:
+                _, mark, _, due, tags = task
+                if statuses is not None and status_name(mark) not in statuses:
+                    continue
+                if due_before is not None and (due is None or due >= due_before):
+                    continue
+                if tag and not any(t == tag or t.startswith(tag + "/") for t in tags):
+                    continue
+                yield path, task
+
+
+def query_tasks(status="open", due_before=None, tag=None, folder=None, limit=100):
+    """Finds tasks across the vault from the task index.
+
+    Args:
+        status: 'open', 'done', 'cancelled', 'in_progress', another checkbox
+            character, a comma-separated list of these, or 'all'.
+        due_before: Only tasks due before this date (YYYY-MM-DD, exclusive).
+        tag: Only tasks with this tag or one nested under it ('#' optional).
+        folder: Only tasks in notes under this folder (vault-relative).
+        limit: Maximum number of tasks to return.
+
+    Returns:
+        A dict with 'tasks' (dicts with path, line, status, text, due and tags)
+        and 'total', the number of matching tasks before the limit.
+    Raises:
+        InvalidPathError: If the folder lies outside the vault.
+        VaultError: If limit or due_before is invalid.
+    """
+    if limit < 1:
+        raise VaultError(f"[Tasks] limit must be at least 1, got {limit}")
+    if due_before is not None and not re.fullmatch(r"\d{4}-\d{2}-\d{2}", due_before):
+        raise VaultError(f"[Tasks] Invalid due_before '{due_before}'. Use YYYY-MM-DD.")
+    statuses = None if not status or status == "all" else {s.strip() for s in status.split(',')}
+    prefix = None
+    if folder and folder not in (".", "/"):
+        prefix = vault_index.normalize_note_path(folder).strip('/')
+        if os.path.isabs(folder) or prefix == ".." or prefix.startswith("../"):
+            raise InvalidPathError(f"[Tasks] Folder outside vault: {folder}")
+        prefix += "/"
+    index = vault_index.get_index()
+    tasks = index.get_component("tasks", TaskIndex)
+    found, total = [], 0
+    with index.lock:
+        for path, (line, mark, text, due, tags) in tasks.query(statuses, due_before, tag.lstrip('#') if tag else None, prefix):
+            total += 1
+            if len(found) < limit:
+                found.append({"path": path, "line": line, "status": status_name(mark), "text": text, "due": due, "tags": list(tags)})
+    return {"tasks": found, "total": total}
+
+
+def toggle_task(relative_path, line, backup=True):
+    """Toggles the checkbox on one line of a note, rewriting only that character.
+
+    An open task becomes done ('x'); any other status becomes open (' ').
+    Checkboxes inside fenced code blocks are not tasks (as in parse_tasks).
+
+    Args:
+        relative_path: Path of the note relative to the vault root.
+        line: 1-based line number of the task (as returned by query_tasks).
+        backup: If True (default), creates a backup before modifying.
+
+    Returns:
+        A dict with the task's 'path', 'line', new 'status' and 'text'.
+    Raises:
+        NoteNotFoundError: If the note does not exist.
+        BackupError: If the backup fails.
+        VaultError: If the line is not a task.
+    """
+    index = vault_index.get_index()
+    record = index.get_record(relative_path) # Validates the path, raises NoteNotFoundError
+    full_path = os.path.join(vault_root(), record.path)
+    with open(full_path, 'r+b') as f:
+        data = f.read()
+        call_trace.count_read(len(data))
+        start = 0
+        for _ in range(line - 1):
+            start = data.find(b'\n', start) + 1
+            if start == 0:
+                break
+        end = data.find(b'\n', start)
+        line_text = data[start:end if end != -1 else len(data)].decode('utf-8', errors='replace')
+        match = TASK_REGEX.match(line_text) if line >= 1 and (start or line == 1) else None
+        if match is not None:
+            fences = [m.start() for m in FENCE_BYTES_REGEX.finditer(data, 0, start)]
+            if len(fences) % 2:
+                match = None # Inside a fenced code block
+        if match is None:
+            raise VaultError(f"[Tasks] Line {line} of {record.path} is not a task")
+        new_mark = 'x' if match.group(1) == ' ' else ' '
+        mark_offset = start + len(line_text[:match.start(1)].encode('utf-8'))
+        if len(match.group(1).encode('utf-8')) != 1:
+            raise VaultError(f"[Tasks] Cannot toggle status '{match.group(1)}' in place on line {line} of {record.path}")
+        if backup:
+            try:
+                if not vault_writer._create_backup(record.path):
+                    raise BackupError(f"[Tasks] Backup failed or source missing for {record.path}. Aborting toggle.")
+            except BackupError:
+                raise # Propagate
+            except Exception as backup_e:
+                raise BackupError(f"[Tasks] Error during backup process for {record.path}: {backup_e}") from backup_e
+        f.seek(mark_offset)
+        f.write(new_mark.encode('ascii'))
+    vault_index.notify_changed(record.path)
+    change_journal.record_change("edit", record.path)
+    return {"path": record.path, "line": line, "status": status_name(new_mark), "text": match.group(2)}
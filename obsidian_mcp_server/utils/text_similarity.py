@@ -0,0 +1,139 @@
+"""Local BM25 similarity engine for finding related notes."""
+
+import heapq
+import math
+import re
+from array import array
+from collections import Counter
+from obsidian_mcp_server.utils import vault_index
+from obsidian_mcp_server.utils.markdown_parser import note_body
+
+# Words of two or more letters (digits and underscores split words)
+TOKEN_REGEX = re.compile(r"[^\W\d_]{2,}")
+
+STOPWORDS = frozenset("""
+a an and are as at be but by for from has have he her his i if in into is it its me my no not of on or our
+she so that the their them then there these they this to was we were what when which who will with you your
+""".split())
+
+MAX_QUERY_TERMS = 64          # Highest-weighted terms of the source note used as the query
+COMMON_TERM_FRACTION = 0.2    # Terms in more than this share of notes carry too little signal to scan
+
+
+def tokenize(text):
+    """Lowercases and splits text into indexable terms (stopwords removed)."""
+    return [t for t in TOKEN_REGEX.findall(text.lower()) if t not in STOPWORDS]
+
+
+class BM25Model:
+    """Sparse term-by-note matrix scored with Okapi BM25, updated per note.
+
+    The matrix is stored by column (term id -> {doc id: term frequency}), so
+    scoring a query only touches the postings of the query's own terms. Each
+    note's row is kept as parallel `array`s of term ids and frequencies.
+    """
+
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self._term_ids = {}       # term -> term id
+        self._postings = []       # term id -> {doc id: tf}
+        self._doc_ids = {}        # note path -> doc id
+        self._doc_paths = []      # doc id -> note path (None once removed)
+        self._free_ids = []       # Reusable doc ids of removed notes
+        self._doc_terms = {}      # doc id -> (array of term ids, array of tfs)
+        self._doc_lengths = {}    # doc id -> number of terms
+        self._total_length = 0
+
+    # --- Index component interface (see VaultIndex.get_component) ---
+
+    def note_indexed(self, path, text):
+        self.note_removed(path)
+        counts = Counter(tokenize(note_body(text)))
+        doc_id = self._free_ids.pop() if self._free_ids else len(self._doc_paths)
+        if doc_id == len(self._doc_paths):
+            self._doc_paths.append(path)
+        else:
+            self._doc_paths[doc_id] = path
+        self._doc_ids[path] = doc_id
+        term_ids = array('l')
+        frequencies = array('l')
+        for term, tf in counts.items():
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                term_id = self._term_ids[term] = len(self._postings)
+                self._postings.append({})
+            self._postings[term_id][doc_id] = tf
+            term_ids.append(term_id)
+            frequencies.append(tf)
+        self._doc_terms[doc_id] = (term_ids, frequencies)
+        length = sum(counts.values())
+        self._doc_lengths[doc_id] = length
+        self._total_length += length
+
+    def note_removed(self, path):
+        doc_id = self._doc_ids.pop(path, None)
+        if doc_id is None:
+            return
+        term_ids, _ = self._doc_terms.pop(doc_id)
+        for term_id in term_ids:
+            del self._postings[term_id][doc_id]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        self._doc_paths[doc_id] = None
+        self._free_ids.append(doc_id)
+
+    def estimated_bytes(self):
+        """Rough memory footprint: postings entries dominate."""
+        postings = sum(len(p) for p in self._postings)
+        return postings * 60 + len(self._term_ids) * 100 + len(self._doc_ids) * 200
+
+    # --- Scoring ---
+
+    def _idf(self, document_frequency, n_docs):
+        return math.log(1.0 + (n_docs - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def related(self, path, k=10):
+        """Returns the k notes most similar to `path` as (path, score) pairs."""
+        doc_id = self._doc_ids.get(path)
+        n_docs = len(self._doc_ids)
+        if doc_id is None or n_docs < 2:
+            return []
+        average_length = self._total_length / n_docs or 1.0
+        common_cutoff = max(50, int(n_docs * COMMON_TERM_FRACTION))
+        term_ids, frequencies = self._doc_terms[doc_id]
+        weighted = []
+        for term_id, tf in zip(term_ids, frequencies):
+            df = len(self._postings[term_id])
+            if df < 2 or df > common_cutoff:
+                continue # Unique to this note, or too common to discriminate
+            weighted.append((tf * self._idf(df, n_docs), tf, term_id))
+        query = heapq.nlargest(MAX_QUERY_TERMS, weighted)
+        scores = {}
+        for _, query_tf, term_id in query:
+            postings = self._postings[term_id]
+            idf = self._idf(len(postings), n_docs)
+            for other_id, tf in postings.items():
+                if other_id == doc_id:
+                    continue
+                norm = self.k1 * (1.0 - self.b + self.b * self._doc_lengths[other_id] / average_length)
+                scores[other_id] = scores.get(other_id, 0.0) + query_tf * idf * tf * (self.k1 + 1.0) / (tf + norm)
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(self._doc_paths[other_id], score) for other_id, score in top]
+
+
+def find_related_notes(note_path, k=10):
+    """Finds the notes whose wording is most similar to a note (BM25 over note bodies).
+
+    Args:
+        note_path: Path of the note to find related notes for.
+        k: Number of results.
+
+    Returns:
+        A list of {'path', 'score'} dicts, most similar first.
+    """
+    index = vault_index.get_index()
+    record = index.get_record(note_path) # Validates the path and refreshes this note
+    model = index.get_component("bm25", BM25Model)
+    with index.lock:
+        related = model.related(record.path, max(k, 0))
+    return [{"path": path, "score": round(score, 4)} for path, score in related]
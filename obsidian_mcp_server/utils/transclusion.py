@@ -0,0 +1,164 @@
+"""Expansion of `![[embeds]]` into the content they show, in a single call.
+
+Embeds of whole notes (`![[Note]]`), sections (`![[Note#Heading]]`,
+`![[#Heading]]`) and blocks (`![[Note#^id]]`) are resolved with the index's
+link resolver and replaced by the embedded text, recursively. A note or
+section already being expanded further up the chain is not expanded again
+(cycle), and neither are embeds beyond max_depth. Embedded note bodies and
+sections are cached, keyed by note and subpath and validated against the
+note's indexed mtime and size, so a fragment embedded many times (or by many
+notes) is read once.
+"""
+
+import os
+import re
+import threading
+import logging
+from bisect import bisect_right
+from collections import OrderedDict
+# Import index, parser and exceptions
+from obsidian_mcp_server.utils import vault_index, markdown_parser, call_trace
+from obsidian_mcp_server.utils.link_resolver import split_link, is_attachment_link
+from obsidian_mcp_server.utils.exceptions import VaultError, NoteNotFoundError, SectionNotFoundError
+
+logger = logging.getLogger(__name__)
+
+# ![[target]], ![[target#Heading]], ![[target#^block]], ![[target|size or alias]]
+EMBED_REGEX = re.compile(r"!\[\[([^\]|]*)(?:\|[^\]]*)?\]\]")
+FENCE_REGEX = re.compile(r"^[ \t]{0,3}(?:```|~~~)", re.MULTILINE)
+
+MAX_CACHED_BYTES = 8 * 1024 * 1024 # Embedded fragments kept in memory (LRU)
+
+_fragments = OrderedDict() # (full path, subpath) -> (mtime_ns, size, text)
+_fragments_bytes = 0
+_fragments_lock = threading.Lock()
+
+
+def _read_fragment(index, record, subpath):
+    """Returns the text an embed of record's note with this subpath shows (cached).
+
+    The whole note is shown without its frontmatter, a '#Heading' subpath as
+    the section under that heading, a '#^id' subpath as the block ending in ^id.
+
+    Raises:
+        SectionNotFoundError: If the heading or block does not exist.
+    """
+    global _fragments_bytes
+    full_path = os.path.join(index.vault_path, record.path)
+    key = (full_path, subpath)
+    with _fragments_lock:
+        cached = _fragments.get(key)
+        if cached is not None and cached[0] == record.mtime_ns and cached[1] == record.size:
+            _fragments.move_to_end(key)
+            return cached[2]
+    with call_trace.phase("read"), open(full_path, 'rb') as f:
+        if subpath.startswith("#") and not subpath.startswith("#^"):
+            _, _, start, end = markdown_parser.find_section(record.headings, subpath[1:])
+            f.seek(start)
+            data = f.read(end - start)
+        else:
+            data = f.read()
+    call_trace.count_read(len(data))
+    text = data.decode('utf-8', errors='replace')
+    if not subpath:
+        text = markdown_parser.note_body(text).lstrip('\r\n')
+    elif subpath.startswith("#^") or subpath.startswith("^"):
+        block_id = subpath.lstrip('#^')
+        match = re.search(r"^(.*?)[ \t]+\^" + re.escape(block_id) + r"[ \t]*\r?$", text, re.MULTILINE)
+        if match is None:
+            raise SectionNotFoundError(f"Block not found: ^{block_id}")
+        text = match.group(1)
+    with _fragments_lock:
+        previous = _fragments.pop(key, None)
+        if previous is not None:
+            _fragments_bytes -= len(previous[2])
+        _fragments[key] = (record.mtime_ns, record.size, text)
+        _fragments_bytes += len(text)
+        while _fragments_bytes > MAX_CACHED_BYTES and len(_fragments) > 1:
+            _, (_, _, evicted) = _fragments.popitem(last=False)
+            _fragments_bytes -= len(evicted)
+    return text
+
+
+def get_note_expanded(note_path, max_depth=3, max_bytes=200000):
+    """Returns a note with its embeds replaced by the embedded content.
+
+    Args:
+        note_path: Path to the note relative to the vault root.
+        max_depth: How many levels of nested embeds to expand (0 returns the note as is).
+        max_bytes: Maximum size of the assembled content, in UTF-8 bytes.
+
+    Returns:
+        A dict with the assembled 'content', the number of 'embeds' expanded,
+        the embeds left as written because they are 'unresolved' (missing
+        notes, headings or blocks) or form 'cycles', and 'truncated' (True if
+        the content was cut at max_bytes or embeds beyond max_depth remain).
+    Raises:
+        NoteNotFoundError: If the note does not exist.
+        VaultError: If max_depth or max_bytes is invalid, or the note cannot be read.
+    """
+    if max_depth < 0:
+        raise VaultError(f"[Expand] max_depth must be at least 0, got {max_depth}")
+    if max_bytes < 1:
+        raise VaultError(f"[Expand] max_bytes must be at least 1, got {max_bytes}")
+    index = vault_index.get_index()
+    root = index.get_record(note_path) # Validates the path, raises NoteNotFoundError
+    try:
+        with call_trace.phase("read"), open(os.path.join(index.vault_path, root.path), 'r', encoding='utf-8') as f:
+            content = f.read()
+        call_trace.count_read(len(content))
+    except FileNotFoundError:
+        raise NoteNotFoundError(f"[Expand] Note not found: {note_path}") from None
+    except Exception as e:
+        raise VaultError(f"[Expand] Error reading note {note_path}: {e}") from e
+
+    result = {"embeds": 0, "unresolved": [], "cycles": [], "truncated": False}
+    budget = [max_bytes] # Characters still allowed; expansion stops once spent
+
+    def expand(text, source_path, depth, chain):
+        fences = [m.start() for m in FENCE_REGEX.finditer(text)]
+        parts, position = [], 0
+        for match in EMBED_REGEX.finditer(text):
+            if fences and bisect_right(fences, match.start()) % 2:
+                continue # Inside a fenced code block
+            target, subpath = split_link(match.group(1))
+            if is_attachment_link(target):
+                continue # Images, PDFs and other files stay as embeds
+            if depth >= max_depth or budget[0] <= 0:
+                result["truncated"] = True
+                continue
+            path = index.resolve_link(match.group(1), source_path)
+            record = None
+            if path is not None:
+                try:
+                    record = index.get_record(path)
+                except NoteNotFoundError:
+                    pass
+            if record is None:
+                result["unresolved"].append(match.group(0))
+                continue
+            key = (record.path, subpath.lower())
+            if key in chain:
+                result["cycles"].append(match.group(0))
+                continue
+            try:
+                fragment = _read_fragment(index, record, subpath)
+            except (SectionNotFoundError, OSError):
+                result["unresolved"].append(match.group(0))
+                continue
+            budget[0] -= len(fragment)
+            parts.append(text[position:match.start()])
+            parts.append(expand(fragment, record.path, depth + 1, chain | {key}))
+            result["embeds"] += 1
+            position = match.end()
+        parts.append(text[position:])
+        return "".join(parts)
+
+    assembled = expand(content, root.path, 0, frozenset({(root.path, "")}))
+    encoded = assembled.encode('utf-8')
+    if len(encoded) > max_bytes:
+        assembled = encoded[:max_bytes].decode('utf-8', errors='ignore')
+        result["truncated"] = True
+    for listed in ("unresolved", "cycles"):
+        result[listed] = list(dict.fromkeys(result[listed])) # Each embed once, in order
+    return {"path": root.path, "content": assembled, **result}
@@ -0,0 +1,169 @@
+"""Bulk export of vault notes as JSONL records or a tar stream.
+
+Notes are selected from the index catalog (no file is opened for filtering),
+read in parallel on the shared I/O pool with a bounded number of reads in
+flight, and emitted one at a time in path order. Memory use therefore stays
+constant whatever the size of the vault.
+"""
+
+import io
+import os
+import json
+import tarfile
+import datetime
+import logging
+from collections import deque
+# Import index, parser and exceptions
+from obsidian_mcp_server.config import settings
+from obsidian_mcp_server.utils import vault_index, markdown_parser, vault_registry, call_trace
+from obsidian_mcp_server.utils.exceptions import VaultError, InvalidPathError
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_since(modified_since):
+    """Converts an ISO date/datetime (local time unless it has an offset) to ns since the epoch."""
+    try:
+        moment = datetime.datetime.fromisoformat(modified_since)
+    except ValueError:
+        raise VaultError(f"[Export] Invalid modified_since '{modified_since}'. Use YYYY-MM-DD or an ISO datetime.") from None
+    return int(moment.timestamp() * 1_000_000_000)
+
+
+def select_notes(folder=None, tag=None, modified_since=None, after=None):
+    """Returns the catalog records matching the filters, sorted by path.
+
+    Args:
+        folder: Only notes in this folder (vault-relative, recursive).
+        tag: Only notes with this tag or one nested under it ('#' optional).
+        modified_since: Only notes modified at or after this ISO date/datetime.
+        after: Only notes whose path sorts after this one (for paging).
+
+    Raises:
+        InvalidPathError: If the folder lies outside the vault.
+        VaultError: If modified_since cannot be parsed.
+    """
+    prefix = None
+    if folder and folder not in (".", "/"):
+        prefix = vault_index.normalize_note_path(folder).strip('/')
+        if os.path.isabs(folder) or prefix == ".." or prefix.startswith("../"):
+            raise InvalidPathError(f"[Export] Folder outside vault: {folder}")
+        prefix += "/"
+    tag = tag.lstrip('#') if tag else None
+    since_ns = _parse_since(modified_since) if modified_since else None
+    selected = []
+    for record in vault_index.get_index().records():
+        if prefix and not record.path.startswith(prefix):
+            continue
+        if after is not None and record.path <= after:
+            continue
+        if since_ns is not None and record.mtime_ns < since_ns:
+            continue
+        if tag and not any(t == tag or t.startswith(tag + "/") for t in record.tags):
+            continue
+        selected.append(record)
+    selected.sort(key=lambda r: r.path)
+    return selected
+
+
+def _read_note(vault_path, relative_path):
+    with call_trace.phase("read"), open(os.path.join(vault_path, relative_path), 'rb') as f:
+        data = f.read()
+    call_trace.count_read(len(data))
+    return data
+
+
+def iter_note_data(records):
+    """Yields (record, raw bytes) for each record, in order, reading ahead in parallel.
+
+    At most 2 * OMCP_IO_WORKERS reads are in flight. Notes that cannot be read
+    (e.g. deleted since the catalog was refreshed) are skipped with a warning.
+    """
+    vault_path = vault_registry.vault_root()
+    window = max(1, 2 * settings.io_workers)
+    pending = deque()
+    records = iter(records)
+    for record in records:
+        pending.append((record, vault_registry.submit_io(_read_note, vault_path, record.path)))
+        if len(pending) >= window:
+            break
+    while pending:
+        record, future = pending.popleft()
+        following = next(records, None)
+        if following is not None:
+            pending.append((following, vault_registry.submit_io(_read_note, vault_path, following.path)))
+        try:
+            data = future.result()
+        except OSError as e:
+            logger.warning(f"[Export] Skipping unreadable note {record.path}: {e}")
+            continue
+        yield record, data
+
+
+def note_to_dict(record, data):
+    """Builds the export record of one note: path, modified, frontmatter, body, links and tags."""
+    text = data.decode('utf-8', errors='replace')
+    body_start = markdown_parser.frontmatter_end(data)
+    body = data[body_start:].decode('utf-8', errors='replace') if body_start else text
+    return {
+        "path": record.path,
+        "modified": datetime.datetime.fromtimestamp(record.mtime_ns / 1e9).isoformat(),
+        "frontmatter": markdown_parser.parse_frontmatter(text) if body_start else {},
+        "body": body[1:] if body.startswith('\n') else body, # Drop the newline closing the frontmatter
+        "links": list(record.links),
+        "tags": list(record.tags),
+    }
+
+
+def write_jsonl(out, **filters):
+    """Writes one JSON object per line (see note_to_dict) for every matching note.
+
+    Args:
+        out: Binary file object, e.g. sys.stdout.buffer.
+        **filters: folder, tag and modified_since (see select_notes).
+
+    Returns:
+        The number of notes written.
+    """
+    count = 0
+    for record, data in iter_note_data(select_notes(**filters)):
+        line = json.dumps(note_to_dict(record, data), ensure_ascii=False, default=str)
+        out.write(line.encode('utf-8') + b"\n")
+        count += 1
+    return count
+
+
+def write_tar(out, **filters):
+    """Writes every matching note, unchanged, as an uncompressed tar stream.
+
+    Args:
+        out: Binary file object (written sequentially; need not be seekable).
+        **filters: folder, tag and modified_since (see select_notes).
+
+    Returns:
+        The number of notes written.
+    """
+    count = 0
+    with tarfile.open(fileobj=out, mode="w|", format=tarfile.PAX_FORMAT) as tar:
+        for record, data in iter_note_data(select_notes(**filters)):
+            info = tarfile.TarInfo(record.path)
+            info.size = len(data)
+            info.mtime = record.mtime_ns // 1_000_000_000
+            tar.addfile(info, io.BytesIO(data))
+            count += 1
+    return count
+
+
+def export_page(folder=None, tag=None, modified_since=None, after=None, limit=100):
+    """Returns one page of export records, for clients that cannot consume a stream.
+
+    Returns:
+        A dict with the page's 'notes' and 'next_after', the value to pass as
+        `after` for the next page (None when the export is complete).
+    """
+    if limit < 1:
+        raise VaultError(f"[Export] limit must be at least 1, got {limit}")
+    records = select_notes(folder, tag, modified_since, after)
+    page = records[:limit]
+    notes = [note_to_dict(record, data) for record, data in iter_note_data(page)]
+    return {"notes": notes, "next_after": page[-1].path if len(records) > limit else None}
@@ -0,0 +1,297 @@
+"""Link graph analytics over a compact CSR adjacency of the vault."""
+
+from array import array
+from collections import deque
+from obsidian_mcp_server.utils.exceptions import VaultError, NoteNotFoundError
+from obsidian_mcp_server.utils import vault_index
+
+
+class LinkGraph:
+    """Directed note graph stored as integer-indexed CSR arrays.
+
+    Node ids are positions in `paths` (sorted relative note paths). Outgoing
+    edges of node i are `out_indices[out_indptr[i]:out_indptr[i + 1]]`; the
+    transposed graph (`in_indptr`/`in_indices`) serves backlink traversals.
+    Edges are de-duplicated and self-links are dropped.
+
+    When only some notes' links change, patched() re-resolves just those notes
+    and records their new rows (and the affected backlink rows) in small
+    overlay dicts that take precedence over the CSR arrays; compacted() folds
+    the overlays back into fresh arrays once they grow.
+    """
+
+    def __init__(self, paths, adjacency, unresolved_counts=None):
+        self.paths = paths
+        self.ids = {p: i for i, p in enumerate(paths)}
+        self.unresolved = 0 # Number of link occurrences that matched no note
+        self._unresolved_counts = unresolved_counts # Per node (None for graphs loaded from a snapshot)
+        self._out_rows = {}        # node -> patched successors (sorted array), overriding the CSR row
+        self._in_rows = {}         # node -> patched predecessors (sorted array)
+        self._unresolved_rows = {} # node -> patched unresolved link count
+        self.out_indptr, self.out_indices = self._to_csr(adjacency)
+        reverse = [[] for _ in paths]
+        for source, targets in enumerate(adjacency):
+            for target in targets:
+                reverse[target].append(source)
+        self.in_indptr, self.in_indices = self._to_csr(reverse)
+
+    @staticmethod
+    def _to_csr(adjacency):
+        indptr = array('l', [0])
+        indices = array('l')
+        for targets in adjacency:
+            indices.extend(targets)
+            indptr.append(len(indices))
+        return indptr, indices
+
+    @classmethod
+    def from_index(cls, index):
+        """Builds the graph from a VaultIndex snapshot (no file I/O)."""
+        paths, records = index._snapshot()
+        ids = {p: i for i, p in enumerate(paths)}
+        adjacency = []
+        unresolved_counts = array('l')
+        for source_id, record in enumerate(records):
+            targets, unresolved = _resolve_targets(index, record, ids, source_id)
+            adjacency.append(targets)
+            unresolved_counts.append(unresolved)
+        graph = cls(paths, adjacency, unresolved_counts)
+        graph.unresolved = sum(unresolved_counts)
+        return graph
+
+    def patched(self, index, changed_paths):
+        """Returns a copy of the graph with the links of changed_paths re-resolved.
+
+        Only valid while the set of notes and their aliases are unchanged (so
+        no other note's links can resolve differently); the caller rebuilds the
+        graph with from_index otherwise. Costs O(links of the changed notes),
+        plus an O(edges) compaction once the overlays pass 1/8 of the nodes.
+        """
+        graph = LinkGraph.__new__(LinkGraph)
+        graph.__dict__.update(self.__dict__)
+        graph._out_rows = dict(self._out_rows)
+        graph._in_rows = dict(self._in_rows)
+        graph._unresolved_rows = dict(self._unresolved_rows)
+        for path in changed_paths:
+            node = graph.ids[path]
+            targets, unresolved = _resolve_targets(index, index._notes[path], graph.ids, node)
+            old = set(graph.successors(node))
+            new = set(targets)
+            for target in old - new:
+                graph._in_rows[target] = array('l', (s for s in graph.predecessors(target) if s != node))
+            for target in new - old:
+                graph._in_rows[target] = array('l', sorted([*graph.predecessors(target), node]))
+            graph._out_rows[node] = array('l', targets)
+            graph.unresolved += unresolved - graph._unresolved_count(node)
+            graph._unresolved_rows[node] = unresolved
+        if len(graph._out_rows) + len(graph._in_rows) > max(64, len(graph.paths) // 8):
+            return graph.compacted()
+        return graph
+
+    def compacted(self):
+        """Returns the graph with its patched rows folded into fresh CSR arrays (self if none)."""
+        if not (self._out_rows or self._in_rows):
+            return self
+        n = len(self.paths)
+        graph = LinkGraph(self.paths, [self.successors(i) for i in range(n)],
+                          array('l', (self._unresolved_count(i) for i in range(n))))
+        graph.unresolved = self.unresolved
+        return graph
+
+    def _unresolved_count(self, node):
+        count = self._unresolved_rows.get(node)
+        if count is None:
+            count = self._unresolved_counts[node]
+        return count
+
+    @classmethod
+    def from_arrays(cls, paths, out_indptr, out_indices, in_indptr, in_indices, unresolved=0):
+        """Wraps prebuilt CSR arrays (e.g. memoryviews over a mapped index snapshot) without copying."""
+        graph = cls.__new__(cls)
+        graph.paths = paths
+        graph.ids = {p: i for i, p in enumerate(paths)}
+        graph.unresolved = unresolved
+        graph._unresolved_counts = None
+        graph._out_rows, graph._in_rows, graph._unresolved_rows = {}, {}, {}
+        graph.out_indptr, graph.out_indices = out_indptr, out_indices
+        graph.in_indptr, graph.in_indices = in_indptr, in_indices
+        return graph
+
+    def successors(self, node):
+        row = self._out_rows.get(node)
+        if row is not None:
+            return row
+        return self.out_indices[self.out_indptr[node]:self.out_indptr[node + 1]]
+
+    def predecessors(self, node):
+        row = self._in_rows.get(node)
+        if row is not None:
+            return row
+        return self.in_indices[self.in_indptr[node]:self.in_indptr[node + 1]]
+
+    def out_degree(self, node):
+        row = self._out_rows.get(node)
+        if row is not None:
+            return len(row)
+        return self.out_indptr[node + 1] - self.out_indptr[node]
+
+    def in_degree(self, node):
+        row = self._in_rows.get(node)
+        if row is not None:
+            return len(row)
+        return self.in_indptr[node + 1] - self.in_indptr[node]
+
+    def neighbors(self, node, direction):
+        if direction == "out":
+            return self.successors(node)
+        if direction == "in":
+            return self.predecessors(node)
+        return list(self.successors(node)) + list(self.predecessors(node))
+
+    def estimated_bytes(self):
+        """Rough memory footprint: the id map, the CSR arrays and the patched rows."""
+        arrays = (self.out_indptr, self.out_indices, self.in_indptr, self.in_indices)
+        patched = sum(100 + len(row) * row.itemsize for rows in (self._out_rows, self._in_rows) for row in rows.values())
+        return len(self.paths) * 110 + sum(len(a) * a.itemsize for a in arrays) + patched
+
+    def node_id(self, note_path):
+        """Maps a note path to its node id, raising if it is not in the graph."""
+        note_id = self.ids.get(vault_index.normalize_note_path(note_path))
+        if note_id is None:
+            raise NoteNotFoundError(f"[Graph] Note not found in link graph: {note_path}")
+        return note_id
+
+
+def _resolve_targets(index, record, ids, source_id):
+    """Returns (sorted target node ids, number of unresolved links) of one note's links."""
+    targets = set()
+    unresolved = 0
+    for link in record.links:
+        target_path = index.resolve_link(link, record.path)
+        if target_path is None:
+            unresolved += 1
+        elif ids[target_path] != source_id:
+            targets.add(ids[target_path])
+    return sorted(targets), unresolved
+
+
+def _validate_direction(direction):
+    if direction not in ("out", "in", "both"):
+        raise VaultError(f"[Graph] Invalid direction '{direction}'. Use 'out', 'in' or 'both'.")
+
+
+def get_neighborhood(note_path, depth=1, direction="both"):
+    """Finds all notes within `depth` link hops of a note (breadth-first).
+
+    Args:
+        note_path: The relative path of the starting note.
+        depth: Maximum number of hops to follow.
+        direction: 'out' (follow links), 'in' (follow backlinks) or 'both'.
+
+    Returns:
+        A dict mapping each reachable note path to its hop distance (the
+        starting note itself is excluded).
+    """
+    _validate_direction(direction)
+    if depth < 0:
+        raise VaultError(f"[Graph] depth must be non-negative, got {depth}")
+    graph = vault_index.get_index().link_graph()
+    start = graph.node_id(note_path)
+    distances = {start: 0}
+    frontier = deque([start])
+    while frontier:
+        node = frontier.popleft()
+        if distances[node] == depth:
+            continue
+        for neighbor in graph.neighbors(node, direction):
+            if neighbor not in distances:
+                distances[neighbor] = distances[node] + 1
+                frontier.append(neighbor)
+    del distances[start]
+    return {graph.paths[n]: d for n, d in sorted(distances.items(), key=lambda item: (item[1], graph.paths[item[0]]))}
+
+
+def find_shortest_path(source_path, target_path, directed=False):
+    """Finds the shortest chain of links between two notes.
+
+    Args:
+        source_path: Relative path of the note to start from.
+        target_path: Relative path of the note to reach.
+        directed: If True, only follow links in their written direction.
+
+    Returns:
+        The list of note paths from source to target (inclusive), or an empty
+        list if the notes are not connected.
+    """
+    graph = vault_index.get_index().link_graph()
+    source = graph.node_id(source_path)
+    target = graph.node_id(target_path)
+    direction = "out" if directed else "both"
+    parents = {source: -1}
+    frontier = deque([source])
+    while frontier and target not in parents:
+        node = frontier.popleft()
+        for neighbor in graph.neighbors(node, direction):
+            if neighbor not in parents:
+                parents[neighbor] = node
+                frontier.append(neighbor)
+    if target not in parents:
+        return []
+    path = []
+    node = target
+    while node != -1:
+        path.append(graph.paths[node])
+        node = parents[node]
+    return path[::-1]
+
+
+def find_orphan_notes():
+    """Returns notes with neither outgoing links nor backlinks."""
+    graph = vault_index.get_index().link_graph()
+    return [p for i, p in enumerate(graph.paths) if graph.out_degree(i) == 0 and graph.in_degree(i) == 0]
+
+
+def find_dead_end_notes():
+    """Returns notes that are linked to but have no outgoing links of their own."""
+    graph = vault_index.get_index().link_graph()
+    return [p for i, p in enumerate(graph.paths) if graph.out_degree(i) == 0 and graph.in_degree(i) > 0]
+
+
+def compute_pagerank(damping=0.85, max_iterations=50, tolerance=1.0e-6):
+    """Computes PageRank centrality for every note by power iteration.
+
+    Rank held by notes without outgoing links is redistributed uniformly.
+
+    Returns:
+        A (graph, ranks) tuple; ranks is an array of scores indexed by node id.
+    """
+    graph = vault_index.get_index().link_graph()
+    n = len(graph.paths)
+    if n == 0:
+        return graph, array('d')
+    ranks = array('d', [1.0 / n]) * n
+    out_degrees = [graph.out_degree(i) for i in range(n)]
+    for _ in range(max_iterations):
+        dangling = sum(ranks[i] for i in range(n) if out_degrees[i] == 0)
+        base = (1.0 - damping) / n + damping * dangling / n
+        new_ranks = array('d', [base]) * n
+        for i in range(n):
+            if out_degrees[i]:
+                share = damping * ranks[i] / out_degrees[i]
+                for j in graph.successors(i):
+                    new_ranks[j] += share
+        delta = sum(abs(new_ranks[i] - ranks[i]) for i in range(n))
+        ranks = new_ranks
+        if delta < tolerance:
+            break
+    return graph, ranks
+
+
+def get_central_notes(limit=20, damping=0.85):
+    """Returns the `limit` highest-PageRank notes as (path, score, in-degree, out-degree) dicts."""
+    graph, ranks = compute_pagerank(damping=damping)
+    top = sorted(range(len(ranks)), key=lambda i: ranks[i], reverse=True)[:max(limit, 0)]
+    return [
+        {"path": graph.paths[i], "score": round(ranks[i], 6), "backlinks": graph.in_degree(i), "outgoing": graph.out_degree(i)}
+        for i in top
+    ]
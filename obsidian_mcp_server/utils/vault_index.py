@@ -0,0 +1,471 @@
+"""In-memory index of vault notes, kept up to date incrementally.
+
+The index walks the vault once, parses every note a single time and then only
+re-parses notes whose mtime/size changed (external edits) or that were touched
+through vault_writer (which notifies the index directly).
+"""
+
+import os
+import re
+import sys
+import time
+import itertools
+import threading
+import logging
+from array import array
+from collections import deque
+# Import config and exceptions
+from obsidian_mcp_server.config import settings
+from obsidian_mcp_server.utils.exceptions import VaultError, NoteNotFoundError, InvalidPathError
+from obsidian_mcp_server.utils.link_resolver import LinkResolver, extract_aliases, is_attachment_link, split_link
+from obsidian_mcp_server.utils import markdown_parser, vault_registry, call_trace, change_journal
+
+logger = logging.getLogger(__name__)
+
+# Same link syntax as vault_reader.get_outgoing_links: [[target]] or [[target|alias]]
+LINK_REGEX = re.compile(r"\[\[([^\]|]+)(?:\|[^\]]+)?\]\]")
+
+
+class NoteRecord:
+    """Parsed, cached state of a single note.
+
+    The catalog holds one record per note, so records are kept compact: link
+    targets and tags (which repeat across notes) are interned, sequences are
+    tuples, and the heading outline is packed into one integer array plus a
+    tuple of heading texts.
+    """
+    __slots__ = ("path", "mtime_ns", "size", "links", "aliases", "tags", "_heading_texts", "_heading_bounds")
+
+    def __init__(self, path, mtime_ns, size, parsed):
+        self.path = path          # Relative path, forward slashes
+        self.mtime_ns = mtime_ns  # Used to detect external changes
+        self.size = size
+        self.links = tuple(map(sys.intern, parsed["links"]))  # Raw link targets, in order of appearance
+        self.aliases = tuple(parsed["aliases"])               # Frontmatter aliases
+        self.tags = tuple(map(sys.intern, parsed["tags"]))    # Frontmatter and inline tags
+        headings = parsed["headings"]
+        self._heading_texts = tuple(text for _, text, _, _ in headings)
+        # level, byte_start, byte_end of each heading (None if the note has none)
+        self._heading_bounds = array('q', [v for level, _, start, end in headings for v in (level, start, end)]) if headings else None
+
+    @property
+    def headings(self):
+        """The (level, text, byte_start, byte_end) outline, in document order."""
+        bounds = self._heading_bounds
+        return tuple((bounds[3 * i], text, bounds[3 * i + 1], bounds[3 * i + 2]) for i, text in enumerate(self._heading_texts))
+
+    def estimated_bytes(self):
+        """Rough memory footprint of the record and its catalog and resolver entries."""
+        return 1250 + 3 * len(self.path) + 16 * len(self.links) + 16 * len(self.tags) + 80 * len(self._heading_texts)
+
+
+def normalize_note_path(relative_path):
+    """Normalizes a relative note path to the index's key format (forward slashes, no './')."""
+    return os.path.normpath(relative_path).replace('\\', '/')
+
+
+def parse_note(data):
+    """Extracts every indexed field from a note's raw bytes in one parse pass.
+
+    Returns:
+        A dict with the raw 'links', frontmatter 'aliases', 'tags' and the
+        heading outline ('headings') of the note.
+
+    Raises:
+        UnicodeDecodeError: If the note is not valid UTF-8.
+    """
+    text = data.decode('utf-8')
+    body_start = markdown_parser.frontmatter_end(data)
+    metadata = markdown_parser.parse_frontmatter(text)
+    body = data[body_start:].decode('utf-8') if body_start else text
+    return {
+        "links": LINK_REGEX.findall(text),
+        "aliases": extract_aliases(metadata),
+        "tags": tuple(sorted(markdown_parser.extract_tags(metadata, body))),
+        "headings": markdown_parser.parse_headings(data, body_start),
+    }
+
+
+class VaultIndex:
+    """Catalog of the notes in one vault, with lazily rebuilt derived structures."""
+
+    def __init__(self, vault_path):
+        self.vault_path = os.path.abspath(vault_path)
+        self.lock = threading.RLock() # Guards the catalog and its components
+        self._notes = {}        # relative path -> NoteRecord
+        self._catalog_bytes = 0 # Sum of the records' estimated_bytes()
+        self.resolver = LinkResolver()
+        self._scanned = False
+        self._last_scan = 0.0
+        self.generation = 0     # Bumped on every change to the catalog
+        self.link_generation = 0 # Bumped only when notes, their links or their aliases change
+        self.path_generation = 0 # Bumped only when notes are added or removed (a move is both)
+        self._graph = None      # Cached vault_graph.LinkGraph
+        self._graph_generation = -1
+        self._graph_dirty = set()   # Notes whose links changed since the graph was built (see link_graph)
+        self._graph_stale = False   # True once notes or aliases changed: the graph must be rebuilt
+        self._components = {}   # name -> derived index fed with note text (see get_component)
+
+    # --- Catalog maintenance ---
+
+    def _iter_note_files(self):
+        """Yields (relative_path, stat_result) for every markdown note in the vault."""
+        for root, dirs, files in os.walk(self.vault_path):
+            # Skip hidden directories (.obsidian, .trash) and the backup directory
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d != settings.backup_dir_name]
+            for filename in files:
+                if not filename.lower().endswith('.md'):
+                    continue
+                full_path = os.path.join(root, filename)
+                try:
+                    st = os.stat(full_path)
+                except OSError:
+                    continue # Vanished between listdir and stat
+                relative_path = os.path.relpath(full_path, self.vault_path).replace('\\', '/')
+                yield relative_path, st
+
+    def _read_note(self, relative_path):
+        with call_trace.phase("read"):
+            with open(os.path.join(self.vault_path, relative_path), 'rb') as f:
+                data = f.read()
+        call_trace.count_read(len(data))
+        return data
+
+    def _index_note(self, relative_path, st, data=None):
+        """Reads (unless `data` is given), parses and stores one note.
+
+        Returns:
+            The note's record, or None if it cannot be read.
+        """
+        try:
+            if data is None:
+                data = self._read_note(relative_path)
+            with call_trace.phase("parse"):
+                parsed = parse_note(data)
+        except Exception as e:
+            logger.warning(f"[Index] Skipping unreadable note {relative_path}: {e}")
+            return None
+        record = NoteRecord(relative_path, st.st_mtime_ns, st.st_size, parsed)
+        previous = self._notes.get(relative_path)
+        if previous is not None:
+            self._catalog_bytes -= previous.estimated_bytes()
+        self._notes[relative_path] = record
+        self._catalog_bytes += record.estimated_bytes()
+        self.resolver.add(relative_path, record.aliases)
+        self.generation += 1
+        if previous is None:
+            self.path_generation += 1
+        if previous is None or previous.links != record.links or previous.aliases != record.aliases:
+            self.link_generation += 1
+        if self._graph is not None:
+            if previous is not None and previous.aliases == record.aliases:
+                self._graph_dirty.add(relative_path) # Only this note's own links can have changed
+            else:
+                self._graph_stale = True # Other notes' links may now resolve differently
+        if self._components:
+            text = data.decode('utf-8')
+            for name, component in self._components.items():
+                try:
+                    component.note_indexed(relative_path, text)
+                except Exception as e:
+                    logger.warning(f"[Index] {name} failed to index {relative_path}: {e}")
+        return record
+
+    def _drop_record(self, relative_path):
+        record = self._notes.pop(relative_path, None)
+        if record is not None:
+            self._catalog_bytes -= record.estimated_bytes()
+            self.resolver.remove(relative_path)
+            self.generation += 1
+            self.link_generation += 1
+            self.path_generation += 1
+            self._graph_stale = True
+            for component in self._components.values():
+                component.note_removed(relative_path)
+
+    def refresh(self, force=False):
+        """Brings the catalog up to date with the files on disk.
+
+        A full stat walk runs at most once per `index_rescan_interval` seconds;
+        only new or modified notes are re-read.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self._scanned and not force and now - self._last_scan < settings.index_rescan_interval:
+                return
+            try:
+                first_scan = not self._scanned
+                seen = set()
+                changed = []
+                journal = []
+                with call_trace.phase("walk"):
+                    for relative_path, st in self._iter_note_files():
+                        seen.add(relative_path)
+                        record = self._notes.get(relative_path)
+                        if record is None or record.mtime_ns != st.st_mtime_ns or record.size != st.st_size:
+                            changed.append((relative_path, st))
+                # Reads run on the shared I/O pool; parsing stays on this thread. At most
+                # 2 * OMCP_IO_WORKERS reads are in flight (as in vault_export.iter_note_data),
+                # so a cold scan never holds more than that many notes' bytes at once.
+                window = max(1, 2 * settings.io_workers)
+                pending = deque()
+                queued = iter(changed)
+                for relative_path, st in itertools.islice(queued, window):
+                    pending.append((relative_path, st, vault_registry.submit_io(self._read_note, relative_path)))
+                while pending:
+                    relative_path, st, future = pending.popleft()
+                    following = next(queued, None)
+                    if following is not None:
+                        pending.append((*following, vault_registry.submit_io(self._read_note, following[0])))
+                    try:
+                        data = future.result()
+                    except Exception as e:
+                        logger.warning(f"[Index] Skipping unreadable note {relative_path}: {e}")
+                        continue
+                    op = "edit" if relative_path in self._notes else "create"
+                    if self._index_note(relative_path, st, data) is not None:
+                        journal.append((op, relative_path))
+                for relative_path in [p for p in self._notes if p not in seen]:
+                    self._drop_record(relative_path)
+                    journal.append(("delete", relative_path))
+            except Exception as e:
+                raise VaultError(f"Error indexing vault {self.vault_path}: {e}") from e
+            if not first_scan: # The first scan only builds the catalog
+                self._journal_external(journal)
+            self._scanned = True
+            self._last_scan = now
+
+    def _journal_external(self, changes):
+        """Records changes found on disk (not made through vault_writer) in the change journal."""
+        journal = change_journal.get_change_journal(self.vault_path)
+        if journal is not None:
+            journal.record(changes, source="external")
+
+    def notify_changed(self, relative_path):
+        """Re-indexes a single note after it was written through vault_writer."""
+        with self.lock:
+            if not self._scanned:
+                return # Nothing cached yet; the first refresh() will pick it up
+            relative_path = normalize_note_path(relative_path)
+            full_path = os.path.join(self.vault_path, relative_path)
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                self.notify_deleted(relative_path)
+                return
+            self._index_note(relative_path, st)
+
+    def notify_deleted(self, relative_path):
+        """Drops a note from the catalog after it was removed through vault_writer."""
+        with self.lock:
+            self._drop_record(normalize_note_path(relative_path))
+
+    # --- Queries ---
+
+    def note_paths(self):
+        """Returns the sorted relative paths of all indexed notes."""
+        self.refresh()
+        with self.lock:
+            return sorted(self._notes)
+
+    def get_record(self, relative_path):
+        """Returns the NoteRecord for a note, raising if it is not in the vault.
+
+        The note itself is always re-checked on disk, so a single-note query
+        never sees stale data even between full rescans.
+        """
+        relative_path = normalize_note_path(relative_path)
+        full_path = os.path.join(self.vault_path, relative_path)
+        if not os.path.abspath(full_path).startswith(self.vault_path):
+            raise InvalidPathError(f"[Index] Attempted access outside vault: {relative_path}")
+        self.refresh()
+        with self.lock:
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                if relative_path in self._notes:
+                    self._drop_record(relative_path)
+                    self._journal_external([("delete", relative_path)])
+                raise NoteNotFoundError(f"[Index] Note not found: {relative_path}") from None
+            record = self._notes.get(relative_path)
+            if record is None or record.mtime_ns != st.st_mtime_ns or record.size != st.st_size:
+                op = "create" if record is None else "edit"
+                record = self._index_note(relative_path, st)
+                if record is None:
+                    raise VaultError(f"[Index] Could not read note: {relative_path}")
+                self._journal_external([(op, relative_path)])
+            return record
+
+    def get_component(self, name, factory):
+        """Returns a derived index that is fed the text of every note.
+
+        The component is created on first use with `factory()`, backfilled by
+        reading every note once, and from then on kept current through its
+        note_indexed(path, text) / note_removed(path) methods.
+        """
+        self.refresh()
+        with self.lock:
+            component = self._components.get(name)
+            if component is None:
+                component = factory()
+                for relative_path in sorted(self._notes):
+                    try:
+                        text = self._read_note(relative_path).decode('utf-8')
+                        with call_trace.phase("index"):
+                            component.note_indexed(relative_path, text)
+                    except Exception as e:
+                        logger.warning(f"[Index] {name} skipping note {relative_path}: {e}")
+                self._components[name] = component
+        vault_registry.enforce_memory_budget()
+        return component
+
+    def estimated_bytes(self):
+        """Rough memory footprint of the catalog and its derived indexes."""
+        with self.lock:
+            total = self._catalog_bytes
+            if self._graph is not None:
+                total += self._graph.estimated_bytes()
+            for component in self._components.values():
+                total += getattr(component, "estimated_bytes", lambda: 0)()
+            return total
+
+    def drop_components(self):
+        """Discards all derived indexes (rebuilt on next use). Returns the bytes freed."""
+        with self.lock:
+            freed = sum(getattr(c, "estimated_bytes", lambda: 0)() for c in self._components.values())
+            if self._graph is not None:
+                freed += self._graph.estimated_bytes()
+            self._components.clear()
+            self._graph = None
+            self._graph_generation = -1
+            self._graph_dirty.clear()
+            self._graph_stale = False
+            return freed
+
+    def records(self):
+        """Returns a snapshot list of all NoteRecords."""
+        self.refresh()
+        with self.lock:
+            return list(self._notes.values())
+
+    def resolve_link(self, link, source_path=None):
+        """Resolves a raw link target to a note path, or None if unresolved."""
+        with self.lock:
+            return self.resolver.resolve(link, source_path)
+
+    def link_graph(self):
+        """Returns the CSR link graph, kept current with the catalog.
+
+        Edits that leave the set of notes and their aliases unchanged (the
+        usual writes and external edits) are patched in by re-resolving only
+        the edited notes' links. Creating, deleting or moving a note, or
+        changing its aliases, can change how any note's links resolve, so the
+        graph is then rebuilt from the catalog on next use (O(links in the
+        vault), no file I/O).
+        """
+        from obsidian_mcp_server.utils.vault_graph import LinkGraph
+        self.refresh()
+        with self.lock:
+            if self._graph is None or self._graph_stale:
+                self._graph = LinkGraph.from_index(self)
+            elif self._graph_dirty:
+                self._graph = self._graph.patched(self, self._graph_dirty)
+            self._graph_dirty.clear()
+            self._graph_stale = False
+            self._graph_generation = self.generation
+            return self._graph
+
+    def _snapshot(self):
+        """Returns (paths, records) sorted by path, for building derived structures."""
+        with self.lock:
+            paths = sorted(self._notes)
+            return paths, [self._notes[p] for p in paths]
+
+
+def get_index():
+    """Returns the VaultIndex of the current vault."""
+    return vault_registry.current_vault().index
+
+
+def notify_changed(relative_path):
+    """Tells the current vault's index that a note was created or modified."""
+    vault = vault_registry.current_vault()
+    if vault.index_loaded:
+        vault.index.notify_changed(relative_path)
+
+
+def notify_deleted(relative_path):
+    """Tells the current vault's index that a note was deleted."""
+    vault = vault_registry.current_vault()
+    if vault.index_loaded:
+        vault.index.notify_deleted(relative_path)
+
+
+def get_resolved_links(note_path):
+    """Resolves every outgoing link of a note.
+
+    Returns:
+        A list of dicts with the raw 'link', its 'subpath' (e.g. '#Heading')
+        and the resolved 'target' note path (None if unresolved).
+    """
+    index = get_index()
+    record = index.get_record(note_path)
+    resolved = []
+    for link in record.links:
+        _, subpath = split_link(link)
+        resolved.append({"link": link, "subpath": subpath, "target": index.resolve_link(link, record.path)})
+    return resolved
+
+
+def get_unresolved_links():
+    """Finds links that do not resolve to any note, grouped by linking note.
+
+    Links to attachments (e.g. [[image.png]]) are not notes and are skipped.
+    """
+    index = get_index()
+    unresolved = {}
+    for record in sorted(index.records(), key=lambda r: r.path):
+        missing = [
+            link for link in record.links
+            if not is_attachment_link(split_link(link)[0]) and index.resolve_link(link, record.path) is None
+        ]
+        if missing:
+            unresolved[record.path] = missing
+    return unresolved
+
+
+def get_note_outline(note_path):
+    """Returns a note's headings as dicts with level, text and byte range."""
+    record = get_index().get_record(note_path)
+    return [{"level": level, "heading": text, "start": start, "end": end} for level, text, start, end in record.headings]
+
+
+def get_note_section(note_path, heading, include_heading=True):
+    """Reads one section of a note by seeking straight to its byte range.
+
+    Args:
+        note_path: Path to the note relative to the vault root.
+        heading: Heading text to look for (case-insensitive, '#' prefix optional).
+        include_heading: If False, the heading line itself is omitted.
+
+    Returns:
+        The section text, up to the next heading of the same or higher level.
+    Raises:
+        SectionNotFoundError: If the heading does not exist in the note.
+    """
+    index = get_index()
+    record = index.get_record(note_path)
+    _, _, start, end = markdown_parser.find_section(record.headings, heading)
+    try:
+        with open(os.path.join(index.vault_path, record.path), 'rb') as f:
+            f.seek(start)
+            data = f.read(end - start)
+        call_trace.count_read(len(data))
+    except FileNotFoundError:
+        raise NoteNotFoundError(f"[Section] Note not found: {note_path}") from None
+    except Exception as e:
+        raise VaultError(f"[Section] Error reading section '{heading}' of {note_path}: {e}") from e
+    text = data.decode('utf-8', errors='replace')
+    if not include_heading:
+        text = text.split('\n', 1)[1] if '\n' in text else ""
+    return text
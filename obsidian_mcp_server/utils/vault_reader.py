@@ -1,12 +1,13 @@
 import os
-import yaml # Added for metadata parsing
 import re # Added for link/tag parsing
+import logging
 # Import config and exceptions
 from obsidian_mcp_server.config import settings
 from obsidian_mcp_server.utils.exceptions import VaultError, NoteNotFoundError, InvalidPathError, MetadataError
+from obsidian_mcp_server.utils import vault_index, call_trace
+from obsidian_mcp_server.utils.vault_registry import vault_root
 
-# Use vault path from settings
-VAULT_PATH = settings.obsidian_vault_path
+logger = logging.getLogger(__name__)
 
 def list_folders(relative_path="."):
     """Lists subfolders within a given relative path inside the vault.
@@ -17,9 +18,9 @@ def list_folders(relative_path="."):
     Returns:
         A list of folder names. Returns None if the path is invalid.
     """
-    base_path = os.path.join(VAULT_PATH, relative_path)
-    # Security check (ensure it's within VAULT_PATH after joining)
-    if not os.path.abspath(base_path).startswith(os.path.abspath(VAULT_PATH)):
+    base_path = os.path.join(vault_root(), relative_path)
+    # Security check (ensure it's within the vault after joining)
+    if not os.path.abspath(base_path).startswith(os.path.abspath(vault_root())):
         raise InvalidPathError(f"Attempted access outside vault: {relative_path}")
     if not os.path.isdir(base_path):
         raise InvalidPathError(f"Directory not found or invalid: {relative_path}")
@@ -40,8 +41,8 @@ def list_notes(relative_path="."):
     Returns:
         A list of note filenames (including .md extension). Returns None if path invalid.
     """
-    base_path = os.path.join(VAULT_PATH, relative_path)
-    if not os.path.abspath(base_path).startswith(os.path.abspath(VAULT_PATH)):
+    base_path = os.path.join(vault_root(), relative_path)
+    if not os.path.abspath(base_path).startswith(os.path.abspath(vault_root())):
         raise InvalidPathError(f"Attempted access outside vault: {relative_path}")
     if not os.path.isdir(base_path):
         raise InvalidPathError(f"Directory not found or invalid: {relative_path}")
@@ -64,13 +65,14 @@ def get_note_content(note_path):
         The content of the note as a string, or None if the file
         cannot be found or read.
     """
-    full_path = os.path.join(VAULT_PATH, note_path)
-    if not os.path.abspath(full_path).startswith(os.path.abspath(VAULT_PATH)):
+    full_path = os.path.join(vault_root(), note_path)
+    if not os.path.abspath(full_path).startswith(os.path.abspath(vault_root())):
         raise InvalidPathError(f"Attempted access outside vault: {note_path}")
 
     try:
-        with open(full_path, 'r', encoding='utf-8') as f:
+        with call_trace.phase("read"), open(full_path, 'r', encoding='utf-8') as f:
             content = f.read()
+        call_trace.count_read(len(content))
         return content
     except FileNotFoundError:
         raise NoteNotFoundError(f"Note not found: {note_path}") from None
@@ -87,17 +89,19 @@ def get_note_metadata(note_path):
         A dictionary representing the YAML metadata, or an empty dict
         if no frontmatter exists or there's an error.
     """
-    full_path = os.path.join(VAULT_PATH, note_path)
-    if not os.path.abspath(full_path).startswith(os.path.abspath(VAULT_PATH)):
+    import yaml # Imported on first use
+    full_path = os.path.join(vault_root(), note_path)
+    if not os.path.abspath(full_path).startswith(os.path.abspath(vault_root())):
         raise InvalidPathError(f"Attempted access outside vault: {note_path}")
 
     try:
-        with open(full_path, 'r', encoding='utf-8') as f:
+        with call_trace.phase("read"), open(full_path, 'r', encoding='utf-8') as f:
             content = f.read()
     except FileNotFoundError:
         raise NoteNotFoundError(f"Note not found: {note_path}") from None
     except Exception as e:
         raise VaultError(f"Error reading note {note_path} for metadata: {e}") from e
+    call_trace.count_read(len(content))
 
     if not content.startswith("---"):
         return {}
@@ -108,11 +112,12 @@ def get_note_metadata(note_path):
 
     frontmatter_yaml = parts[1]
     try:
-        metadata = yaml.safe_load(frontmatter_yaml)
+        with call_trace.phase("yaml"):
+            metadata = yaml.safe_load(frontmatter_yaml)
         return metadata if isinstance(metadata, dict) else {}
     except yaml.YAMLError as e:
         # Log warning but don't raise - treat as note with no valid metadata
-        print(f"Warning [Meta]: Could not parse YAML in {note_path}: {e}")
+        logger.warning(f"[Meta] Could not parse YAML in {note_path}: {e}")
         return {}
     except Exception as e:
         raise MetadataError(f"Unexpected error parsing YAML in {note_path}: {e}") from e
@@ -158,7 +163,8 @@ def get_all_tags() -> list[str]:
     # Doesn't match: ## Header, word#tag, # (just hash)
     inline_tag_regex = re.compile(r"(?:^|\s)#([\w-]+(?:/[\w-]+)*)")
 
-    for root, _, files in os.walk(VAULT_PATH):
+    vault_path = vault_root()
+    for root, _, files in os.walk(vault_path):
         # Skip backup directory
         if os.path.basename(root) == settings.backup_dir_name:
              continue
@@ -168,7 +174,7 @@ def get_all_tags() -> list[str]:
              
         for filename in files:
             if filename.lower().endswith('.md'):
-                relative_path = os.path.relpath(os.path.join(root, filename), VAULT_PATH)
+                relative_path = os.path.relpath(os.path.join(root, filename), vault_path)
                 relative_path = relative_path.replace('\\', '/') # Normalize path
                 
                 try:
@@ -198,73 +204,42 @@ def get_all_tags() -> list[str]:
                              body_content = parts[2]
                              
                     # Find inline tags in the body
-                    for match in inline_tag_regex.finditer(body_content):
-                        all_tags.add(match.group(1))
+                    with call_trace.phase("regex"):
+                        for match in inline_tag_regex.finditer(body_content):
+                            all_tags.add(match.group(1))
                         
                 except (NoteNotFoundError, InvalidPathError, MetadataError, VaultError) as e:
-                    print(f"Warning [Tags]: Skipping note due to error: {relative_path} - {e}")
+                    logger.warning(f"[Tags] Skipping note due to error: {relative_path} - {e}")
                 except Exception as e:
-                    print(f"Warning [Tags]: Unexpected error processing note {relative_path}: {e}")
+                    logger.warning(f"[Tags] Unexpected error processing note {relative_path}: {e}")
 
     return sorted(list(all_tags))
 
 def get_backlinks(target_note_path: str) -> list[str]:
     """Finds all notes in the vault that link to the target note.
 
+    Links are resolved the way Obsidian does (see link_resolver), so
+    [[My Note]], [[Folder/My Note#Heading]] and alias links all count.
+
     Args:
         target_note_path: The relative path of the note whose backlinks are sought.
 
     Returns:
         A list of relative paths of notes that link to the target note.
     """
-    backlinks = []
-    # Normalize the target path for comparison
-    normalized_target = target_note_path.replace('\\', '/').lower()
-    # Also consider target without extension for links like [[My Note]]
-    target_no_ext, _ = os.path.splitext(normalized_target)
-    
-    # 1. Check if the target note itself exists (optional, but good practice)
-    target_full_path = os.path.join(VAULT_PATH, target_note_path)
-    if not os.path.abspath(target_full_path).startswith(os.path.abspath(VAULT_PATH)):
+    # 1. Check if the target note itself exists
+    target_full_path = os.path.join(vault_root(), target_note_path)
+    if not os.path.abspath(target_full_path).startswith(os.path.abspath(vault_root())):
         raise InvalidPathError(f"[Backlinks] Target path outside vault: {target_note_path}")
     if not os.path.isfile(target_full_path):
         raise NoteNotFoundError(f"[Backlinks] Target note not found: {target_note_path}")
 
-    # 2. Walk through the vault
-    for root, _, files in os.walk(VAULT_PATH):
-        # Skip backup directory and hidden dirs
-        if os.path.basename(root) == settings.backup_dir_name or os.path.basename(root).startswith('.'):
-            continue
-
-        for filename in files:
-            if filename.lower().endswith('.md'):
-                linking_note_rel_path = os.path.relpath(os.path.join(root, filename), VAULT_PATH)
-                linking_note_rel_path = linking_note_rel_path.replace('\\', '/') # Normalize
-
-                # Don't check the target note itself
-                if linking_note_rel_path.lower() == normalized_target:
-                    continue
-                
-                try:
-                    # Use get_outgoing_links which handles reading the file
-                    outgoing_links = get_outgoing_links(linking_note_rel_path)
-                    
-                    # Check if any outgoing link matches the target (with or without extension)
-                    for link in outgoing_links:
-                        normalized_link = link.replace('\\', '/').lower()
-                        link_no_ext, _ = os.path.splitext(normalized_link)
-                        
-                        # Match if link equals target (with/without ext) or link (without ext) equals target (without ext)
-                        if normalized_link == normalized_target or link_no_ext == target_no_ext:
-                            backlinks.append(linking_note_rel_path)
-                            break # Found a link, no need to check further links in this file
-                            
-                except (NoteNotFoundError, InvalidPathError, VaultError) as e:
-                    print(f"Warning [Backlinks]: Skipping note due to error reading links: {linking_note_rel_path} - {e}")
-                except Exception as e:
-                    print(f"Warning [Backlinks]: Unexpected error processing note {linking_note_rel_path}: {e}")
-
-    return sorted(list(set(backlinks))) # Return unique, sorted list
+    # 2. Look up incoming edges in the indexed link graph
+    index = vault_index.get_index()
+    target = index.get_record(target_note_path) # Ensures the target itself is indexed
+    graph = index.link_graph()
+    node = graph.node_id(target.path)
+    return sorted(graph.paths[i] for i in graph.predecessors(node))
 
 # Example usage (for testing - can be removed later)
 if __name__ == '__main__':
@@ -342,10 +317,10 @@ if __name__ == '__main__':
         print("Skipping backlink test setup/cleanup (vault_writer not available)")
         # Attempt cleanup even on error
         try:
-            if os.path.exists(os.path.join(VAULT_PATH, linking_note_path)):
+            if os.path.exists(os.path.join(vault_root(), linking_note_path)):
                  delete_note(linking_note_path, backup=False)
                  print("Cleanup attempted for linking note after error.")
-            if os.path.exists(os.path.join(VAULT_PATH, test_backlink_target)):
+            if os.path.exists(os.path.join(vault_root(), test_backlink_target)):
                  delete_note(test_backlink_target, backup=False)
                  print("Cleanup attempted for target note after error.")
         except Exception as cleanup_e:
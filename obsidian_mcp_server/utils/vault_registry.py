@@ -0,0 +1,197 @@
+"""Registry of the vaults served by this process.
+
+Each vault has its own catalog and indexes; the I/O worker pool and the index
+memory budget are shared by all of them. Tools select a vault per call with
+`use_vault(name)`, and the utility modules look up the active vault with
+`current_vault()` / `vault_root()` instead of holding their own copy of the path.
+"""
+
+import os
+import time
+import threading
+import contextvars
+import logging
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+# Import config and exceptions
+from obsidian_mcp_server.config import settings
+from obsidian_mcp_server.utils.exceptions import VaultError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_VAULT_NAME = "default"
+
+
+class Vault:
+    """One served vault: its root path plus lazily built per-vault state."""
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = os.path.abspath(path)
+        self.last_used = 0.0
+        self.append_queue = None # Set by append_queue.get_append_queue()
+        self._index = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self):
+        """The vault's VaultIndex, created on first use."""
+        with self._lock:
+            if self._index is None:
+                if _index_factory is not None:
+                    self._index = _index_factory(self)
+                else:
+                    from obsidian_mcp_server.utils.vault_index import VaultIndex
+                    self._index = VaultIndex(self.path)
+            return self._index
+
+    @property
+    def index_loaded(self):
+        return self._index is not None
+
+
+_vaults = {}
+_vaults_lock = threading.Lock()
+_current_vault = contextvars.ContextVar("omcp_current_vault", default=None)
+_io_pool = None
+_index_factory = None # Replaces VaultIndex, e.g. with snapshot-backed indexes in worker processes
+_warm_up_started = False
+
+
+def _load_vaults():
+    """Builds the registry from settings on first use (the default vault plus OMCP_VAULTS)."""
+    if not _vaults:
+        _vaults[DEFAULT_VAULT_NAME] = Vault(DEFAULT_VAULT_NAME, settings.obsidian_vault_path)
+        for name, path in settings.vaults.items():
+            _vaults[name] = Vault(name, path)
+        for vault in _vaults.values():
+            if not os.path.isdir(vault.path):
+                logger.warning(f"[Registry] Vault '{vault.name}' path is not a directory: {vault.path}")
+    return _vaults
+
+
+def get_vault(name=None):
+    """Returns the named vault (the default vault if name is None or empty)."""
+    with _vaults_lock:
+        vaults = _load_vaults()
+    vault = vaults.get(name or DEFAULT_VAULT_NAME)
+    if vault is None:
+        raise VaultError(f"Unknown vault '{name}'. Configured vaults: {', '.join(sorted(vaults))}")
+    return vault
+
+
+def list_vaults():
+    """Returns the configured vaults as dicts with name, path and whether they are indexed."""
+    with _vaults_lock:
+        vaults = _load_vaults()
+    return [{"name": v.name, "path": v.path, "indexed": v.index_loaded} for v in vaults.values()]
+
+
+def iter_vaults():
+    """Returns all configured Vault objects."""
+    with _vaults_lock:
+        return list(_load_vaults().values())
+
+
+def set_index_factory(factory):
+    """Makes vaults build their index with factory(vault) (call before any index is used)."""
+    global _index_factory
+    _index_factory = factory
+
+
+def current_vault():
+    """Returns the vault selected for the current call (see use_vault)."""
+    return _current_vault.get() or get_vault()
+
+
+def vault_root():
+    """Returns the absolute root path of the current vault."""
+    return current_vault().path
+
+
+@contextmanager
+def use_vault(name=None):
+    """Makes the named vault current for the duration of the block (and threads it starts via submit_io)."""
+    vault = get_vault(name)
+    vault.last_used = time.monotonic()
+    token = _current_vault.set(vault)
+    try:
+        yield vault
+    finally:
+        _current_vault.reset(token)
+
+
+def get_io_pool():
+    """Returns the thread pool shared by all vaults for file reads."""
+    global _io_pool
+    with _vaults_lock:
+        if _io_pool is None:
+            _io_pool = ThreadPoolExecutor(max_workers=settings.io_workers, thread_name_prefix="omcp-io")
+        return _io_pool
+
+
+def submit_io(fn, *args):
+    """Runs fn(*args) on the shared I/O pool, keeping the caller's current vault."""
+    context = contextvars.copy_context()
+    return get_io_pool().submit(context.run, fn, *args)
+
+
+def enforce_memory_budget():
+    """Frees memory while the indexes and cached results exceed OMCP_INDEX_MEMORY_BUDGET_MB.
+
+    Cached tool results (which hold note bodies and other large values) are
+    evicted first. If that is not enough, the derived indexes of the least
+    recently used vaults are dropped. Catalogs are kept, as are the current
+    vault's indexes; dropped components are rebuilt on their next use.
+    """
+    from obsidian_mcp_server.utils import result_cache
+    budget = settings.index_memory_budget_mb * 1024 * 1024
+    if budget <= 0:
+        return
+    current = current_vault()
+    with _vaults_lock:
+        loaded = [v for v in _load_vaults().values() if v.index_loaded]
+    cache = result_cache.get_result_cache()
+    total = sum(v.index.estimated_bytes() for v in loaded) + (cache.cached_bytes() if cache else 0)
+    if total > budget and cache is not None:
+        freed = cache.evict(total - budget)
+        if freed:
+            logger.info(f"[Registry] Memory budget exceeded; evicted ~{freed} bytes of cached results")
+            total -= freed
+    for vault in sorted(loaded, key=lambda v: v.last_used):
+        if total <= budget:
+            break
+        if vault is current:
+            continue
+        freed = vault.index.drop_components()
+        if freed:
+            logger.info(f"[Registry] Memory budget exceeded; dropped ~{freed} bytes of indexes for vault '{vault.name}'")
+            total -= freed
+
+
+def start_warm_up():
+    """Builds every vault's catalog and link graph on a background thread.
+
+    Called once the transport is ready, so the first tool calls find the indexes
+    already loaded instead of paying for a full vault scan. Runs once per process.
+    """
+    global _warm_up_started
+    with _vaults_lock:
+        if _warm_up_started or not settings.index_warm_up:
+            return
+        _warm_up_started = True
+    threading.Thread(target=_warm_up, name="omcp-warm-up", daemon=True).start()
+
+
+def _warm_up():
+    with _vaults_lock:
+        vaults = list(_load_vaults().values())
+    for vault in vaults:
+        started = time.perf_counter()
+        try:
+            with use_vault(vault.name):
+                vault.index.link_graph()
+        except Exception as e:
+            logger.warning(f"[Registry] Warm-up of vault '{vault.name}' failed: {e}")
+            continue
+        logger.info(f"[Registry] Warmed up vault '{vault.name}' in {time.perf_counter() - started:.2f}s")
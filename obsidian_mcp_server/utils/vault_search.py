@@ -1,10 +1,10 @@
 import os
-import yaml # Needed for metadata search
-from obsidian_mcp_server.config import settings
+import logging
 from obsidian_mcp_server.utils.exceptions import VaultError # Only need base VaultError here
+from obsidian_mcp_server.utils.vault_registry import vault_root
+from obsidian_mcp_server.utils import call_trace
 
-# Use config settings
-VAULT_PATH = settings.obsidian_vault_path
+logger = logging.getLogger(__name__)
 
 def search_notes_content(query):
     """Searches the content of all markdown notes for a query string.
@@ -17,24 +17,27 @@ def search_notes_content(query):
     """
     matches = []
     query_lower = query.lower()
+    vault_path = vault_root()
     try:
-        for root, dirs, files in os.walk(VAULT_PATH):
+        for root, dirs, files in os.walk(vault_path):
             # Optional: Skip hidden directories like .obsidian, .trash, .vault_backups
             dirs[:] = [d for d in dirs if not d.startswith('.')]
 
             for filename in files:
                 if filename.lower().endswith('.md'):
                     full_path = os.path.join(root, filename)
-                    relative_path = os.path.relpath(full_path, VAULT_PATH).replace('\\', '/')
+                    relative_path = os.path.relpath(full_path, vault_path).replace('\\', '/')
 
                     try:
-                        with open(full_path, 'r', encoding='utf-8') as f:
+                        with call_trace.phase("read"), open(full_path, 'r', encoding='utf-8') as f:
                             content = f.read()
-                        if query_lower in content.lower():
-                            matches.append(relative_path)
+                        call_trace.count_read(len(content))
+                        with call_trace.phase("match"):
+                            if query_lower in content.lower():
+                                matches.append(relative_path)
                     except Exception as e:
                         # Log non-critical read errors during search, but continue
-                        print(f"Warning [Search]: Error reading {relative_path}: {e}")
+                        logger.warning(f"[Search] Error reading {relative_path}: {e}")
                         continue
 
         return matches
@@ -52,20 +55,23 @@ def search_notes_metadata(query):
     Returns:
         A list of relative note paths where the query was found in metadata values.
     """
+    import yaml # Imported on first use
     matches = []
     query_lower = query.lower()
+    vault_path = vault_root()
     try:
-        for root, dirs, files in os.walk(VAULT_PATH):
+        for root, dirs, files in os.walk(vault_path):
             dirs[:] = [d for d in dirs if not d.startswith('.')]
 
             for filename in files:
                 if filename.lower().endswith('.md'):
                     full_path = os.path.join(root, filename)
-                    relative_path = os.path.relpath(full_path, VAULT_PATH).replace('\\', '/')
+                    relative_path = os.path.relpath(full_path, vault_path).replace('\\', '/')
 
                     try:
-                        with open(full_path, 'r', encoding='utf-8') as f:
+                        with call_trace.phase("read"), open(full_path, 'r', encoding='utf-8') as f:
                             content = f.read()
+                        call_trace.count_read(len(content))
 
                         if not content.startswith("---"):
                             continue # No frontmatter
@@ -76,7 +82,8 @@ def search_notes_metadata(query):
 
                         frontmatter_yaml = parts[1]
                         try:
-                            metadata = yaml.safe_load(frontmatter_yaml)
+                            with call_trace.phase("yaml"):
+                                metadata = yaml.safe_load(frontmatter_yaml)
                             if isinstance(metadata, dict):
                                 # Recursively check values in the metadata dict/list structure
                                 if _check_metadata_values(metadata, query_lower):
@@ -85,11 +92,11 @@ def search_notes_metadata(query):
                             # Ignore notes with invalid YAML for this search
                             continue
                         except Exception as e_parse:
-                            print(f"Warning [MetaSearch]: Error parsing metadata for {relative_path}: {e_parse}")
+                            logger.warning(f"[MetaSearch] Error parsing metadata for {relative_path}: {e_parse}")
                             continue
 
                     except Exception as e_read:
-                        print(f"Warning [MetaSearch]: Error reading {relative_path}: {e_read}")
+                        logger.warning(f"[MetaSearch] Error reading {relative_path}: {e_read}")
                         continue
 
         return matches
@@ -127,8 +134,9 @@ def search_folders(query):
     """
     matches = []
     query_lower = query.lower()
+    vault_path = vault_root()
     try:
-        for root, dirs, files in os.walk(VAULT_PATH):
+        for root, dirs, files in os.walk(vault_path):
             # Modify dirs in place to control the walk
             # Keep only directories not starting with '.' for further traversal
             dirs[:] = [d for d in dirs if not d.startswith('.')]
@@ -136,7 +144,7 @@ def search_folders(query):
             for dirname in dirs:
                 if query_lower in dirname.lower():
                     full_path = os.path.join(root, dirname)
-                    relative_path = os.path.relpath(full_path, VAULT_PATH).replace('\\', '/')
+                    relative_path = os.path.relpath(full_path, vault_path).replace('\\', '/')
                     matches.append(relative_path)
 
         # We only need to check the directories found during the walk
@@ -1,17 +1,18 @@
 import os
+import re
 import shutil
 import datetime
-import yaml # Needed for writing metadata later
 import logging # Import logging
 # Import config and exceptions
 from obsidian_mcp_server.config import settings
 from obsidian_mcp_server.utils.exceptions import VaultError, NoteNotFoundError, InvalidPathError, MetadataError, BackupError, NoteCreationError
 from obsidian_mcp_server.utils.vault_reader import get_note_content
+from obsidian_mcp_server.utils import vault_index, change_journal
+from obsidian_mcp_server.utils.vault_registry import vault_root
 
 logger = logging.getLogger(__name__) # Get logger for this module
 
 # Use config settings
-VAULT_PATH = settings.obsidian_vault_path
 BACKUP_DIR_NAME = settings.backup_dir_name
 
 
@@ -26,13 +27,13 @@ def _create_backup(relative_note_path):
     Returns:
         True if backup was successful, False otherwise.
     """
-    source_full_path = os.path.join(VAULT_PATH, relative_note_path)
+    source_full_path = os.path.join(vault_root(), relative_note_path)
 
-    if not os.path.abspath(source_full_path).startswith(os.path.abspath(VAULT_PATH)):
+    if not os.path.abspath(source_full_path).startswith(os.path.abspath(vault_root())):
         raise InvalidPathError(f"[Backup] Attempted access outside vault: {relative_note_path}")
     if not os.path.isfile(source_full_path):
         # Don't raise NoteNotFoundError here? Maybe backup shouldn't fail if note gone.
-        print(f"Warning [Backup]: Source file not found, cannot create backup: {relative_note_path}")
+        logger.warning(f"[Backup] Source file not found, cannot create backup: {relative_note_path}")
         return False # Indicate backup wasn't created, but maybe allow operation?
 
     try:
@@ -41,7 +42,7 @@ def _create_backup(relative_note_path):
         backup_filename = f"{os.path.basename(relative_note_path)}.{timestamp}.bak"
         # Preserve directory structure within backup folder
         relative_dir = os.path.dirname(relative_note_path)
-        backup_subdir = os.path.join(VAULT_PATH, BACKUP_DIR_NAME, relative_dir)
+        backup_subdir = os.path.join(vault_root(), BACKUP_DIR_NAME, relative_dir)
         backup_full_path = os.path.join(backup_subdir, backup_filename)
 
         # Create backup directory if it doesn't exist
@@ -68,9 +69,10 @@ def create_note(relative_note_path, content="", metadata=None):
     Returns:
         True if note creation was successful, False otherwise.
     """
-    full_path = os.path.join(VAULT_PATH, relative_note_path)
+    import yaml # Imported on first use
+    full_path = os.path.join(vault_root(), relative_note_path)
 
-    if not os.path.abspath(full_path).startswith(os.path.abspath(VAULT_PATH)):
+    if not os.path.abspath(full_path).startswith(os.path.abspath(vault_root())):
         raise InvalidPathError(f"[Create] Attempted access outside vault: {relative_note_path}")
     if os.path.exists(full_path):
         raise NoteCreationError(f"[Create] File already exists: {relative_note_path}")
@@ -98,6 +100,8 @@ def create_note(relative_note_path, content="", metadata=None):
         with open(full_path, 'w', encoding='utf-8') as f:
             f.write(file_content)
 
+        vault_index.notify_changed(relative_note_path)
+        change_journal.record_change("create", relative_note_path)
         # print(f"Note created successfully: {relative_note_path}")
         return True # Success
 
@@ -118,9 +122,9 @@ def edit_note(relative_note_path, new_content, backup=True):
     Returns:
         True if the note was edited successfully, False otherwise.
     """
-    full_path = os.path.join(VAULT_PATH, relative_note_path)
+    full_path = os.path.join(vault_root(), relative_note_path)
 
-    if not os.path.abspath(full_path).startswith(os.path.abspath(VAULT_PATH)):
+    if not os.path.abspath(full_path).startswith(os.path.abspath(vault_root())):
         raise InvalidPathError(f"[Edit] Attempted access outside vault: {relative_note_path}")
     if not os.path.isfile(full_path):
         raise NoteNotFoundError(f"[Edit] File does not exist: {relative_note_path}")
@@ -137,28 +141,31 @@ def edit_note(relative_note_path, new_content, backup=True):
     try:
         with open(full_path, 'w', encoding='utf-8') as f:
             f.write(new_content)
+        vault_index.notify_changed(relative_note_path)
+        change_journal.record_change("edit", relative_note_path)
         # print(f"Note edited successfully: {relative_note_path}")
         return True
     except Exception as e:
         raise VaultError(f"Error writing edited note {relative_note_path}: {e}") from e
 
 
-def append_to_note(relative_note_path, content_to_append, backup=True):
+def append_to_note(relative_note_path, content_to_append, backup=True, durable=False):
     """Appends content to the end of an existing note using 'ab' mode.
 
     Args:
         relative_note_path: The path to the note file relative to the vault root.
         content_to_append: The string content to append to the note.
         backup: If True (default), creates a backup before modifying.
+        durable: If True, fsyncs the note before returning.
 
     Returns:
         True if the content was appended successfully.
     Raises:
         NoteNotFoundError, InvalidPathError, BackupError, VaultError
     """
-    full_path = os.path.join(VAULT_PATH, relative_note_path)
+    full_path = os.path.join(vault_root(), relative_note_path)
 
-    if not os.path.abspath(full_path).startswith(os.path.abspath(VAULT_PATH)):
+    if not os.path.abspath(full_path).startswith(os.path.abspath(vault_root())):
         raise InvalidPathError(f"[Append] Attempted access outside vault: {relative_note_path}")
     if not os.path.isfile(full_path):
         raise NoteNotFoundError(f"[Append] File does not exist: {relative_note_path}")
@@ -182,6 +189,11 @@ def append_to_note(relative_note_path, content_to_append, backup=True):
             f_append.write(b'\n')
             # Write the content (encoded)
             f_append.write(content_to_append.encode('utf-8'))
+            if durable:
+                f_append.flush()
+                os.fsync(f_append.fileno())
+        vault_index.notify_changed(relative_note_path)
+        change_journal.record_change("append", relative_note_path)
         return True
     except IOError as e:
         raise VaultError(f"IOError appending to note {relative_note_path}: {e}") from e
@@ -189,9 +201,228 @@ def append_to_note(relative_note_path, content_to_append, backup=True):
         raise VaultError(f"Unexpected error appending to note {relative_note_path}: {e}") from e
 
 
+# Top-level frontmatter key at column 0: plain, "double-quoted" or 'single-quoted'
+FRONTMATTER_KEY_REGEX = re.compile(r"""^(?:"([^"\n]*)"|'([^'\n]*)'|([^\s#'"{\[\-?:|>][^:\n]*?))[ \t]*:(?:[ \t]|\r?$)""")
+# Single-line scalar value with an optional trailing comment
+SCALAR_LINE_REGEX = re.compile(r"^[^:\n]*:[ \t]*(?:[^\s#|>&*!\[{][^\n]*?)?(?P<comment>[ \t]+#[^\n]*)?(?P<eol>\r?\n?)$")
+
+
+def _frontmatter_blocks(lines):
+    """Maps each top-level key of the frontmatter lines to its (first, last) line index.
+
+    A key's block runs to its last indented or '- ' item line; blank and comment
+    lines after it are left outside. Returns None if some top-level line is not
+    a simple key (flow continuations, complex keys) or a key repeats.
+    """
+    blocks = {}
+    key, first, last = None, 0, 0
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped or stripped.startswith('#'):
+            continue
+        if line[0] in ' \t' or line.startswith('- ') or line.rstrip('\r\n') == '-':
+            if key is None:
+                return None
+            last = i
+            continue
+        match = FRONTMATTER_KEY_REGEX.match(line)
+        if not match:
+            return None
+        if key is not None:
+            blocks[key] = (first, last)
+        key = next(g for g in match.groups() if g is not None)
+        if key in blocks:
+            return None
+        first = last = i
+    if key is not None:
+        blocks[key] = (first, last)
+    return blocks
+
+
+def _splice_frontmatter(frontmatter_yaml, existing_metadata, metadata_updates):
+    """Returns frontmatter_yaml with only the updated keys' lines replaced or appended.
+
+    Every other line (key order, comments, quoting, blank lines) is kept as is,
+    and a scalar replacing a one-line scalar keeps its trailing comment. Only
+    the updated keys are dumped. Returns None if the frontmatter's layout is
+    too unusual to edit line by line, or the result does not parse back to the
+    merged metadata; the caller then re-dumps the whole frontmatter.
+    """
+    import yaml # Imported on first use
+    newline = "\r\n" if "\r\n" in frontmatter_yaml else "\n"
+    lines = frontmatter_yaml.splitlines(keepends=True)
+    blocks = _frontmatter_blocks(lines)
+    if blocks is None:
+        return None
+    edits = [] # (first, last, new lines), applied bottom-up
+    appended = []
+    for key, value in metadata_updates.items():
+        dumped = yaml.dump({key: value}, allow_unicode=True, default_flow_style=False, sort_keys=False, width=1 << 30)
+        new_lines = [line + newline for line in dumped.splitlines()]
+        block = blocks.get(str(key))
+        if block is not None and key in existing_metadata and existing_metadata[key] == value:
+            continue # Unchanged: keep the line as written
+        if block is None:
+            appended.extend(new_lines)
+            continue
+        first, last = block
+        scalar = SCALAR_LINE_REGEX.match(lines[first])
+        if first == last and len(new_lines) == 1 and scalar:
+            # Keep the old line's trailing comment and line ending
+            new_lines = [new_lines[0].rstrip("\r\n") + (scalar.group("comment") or "") + (scalar.group("eol") or newline)]
+        edits.append((first, last, new_lines))
+    for first, last, new_lines in sorted(edits, reverse=True):
+        lines[first:last + 1] = new_lines
+    if appended:
+        if lines and not lines[-1].endswith("\n"):
+            lines[-1] += newline
+        elif not lines:
+            lines.append(newline)
+        lines.extend(appended)
+    spliced = "".join(lines)
+    try:
+        if yaml.safe_load(spliced) != {**existing_metadata, **metadata_updates}:
+            return None
+    except yaml.YAMLError:
+        return None
+    return spliced
+
+
+def merge_metadata(content, metadata_updates, relative_note_path, head_only=False):
+    """Returns a note's content with metadata_updates merged into its YAML frontmatter.
+
+    Valid frontmatter is edited in place (see _splice_frontmatter) and the body
+    is kept byte for byte. Existing frontmatter that is not a valid YAML
+    mapping is discarded (with a warning).
+
+    With head_only, `content` is only the frontmatter region (up to and
+    including the closing '---', or empty if the note has none) and the
+    result is its replacement: the caller keeps the body bytes as they are,
+    so nothing is added after the closing '---' of existing frontmatter.
+
+    Raises:
+        MetadataError: If the updated YAML cannot be dumped.
+    """
+    import yaml # Imported on first use
+    # --- Parse existing metadata & body ---
+    existing_metadata = {}
+    body_content = content
+    if content.startswith("---"):
+        parts = content.split("---", 2)
+        if len(parts) >= 3:
+            frontmatter_yaml = parts[1]
+            body_content = parts[2].lstrip() # Remove leading whitespace/newline
+            try:
+                loaded_meta = yaml.safe_load(frontmatter_yaml)
+                if isinstance(loaded_meta, dict):
+                    existing_metadata = loaded_meta
+                    # --- Fast path: splice the updated keys into the existing YAML ---
+                    spliced = _splice_frontmatter(frontmatter_yaml, loaded_meta, metadata_updates)
+                    if spliced is not None:
+                        return "---" + spliced + "---" + parts[2]
+                else:
+                    # Log warning but proceed, treating existing as invalid
+                    logger.warning(f"[Meta] Existing frontmatter in {relative_note_path} is not a dictionary. Discarding.")
+            except yaml.YAMLError as e:
+                # Log warning but proceed, treating existing as invalid
+                logger.warning(f"[Meta] Could not parse existing YAML in {relative_note_path}: {e}. Discarding existing.")
+        # else: Malformed frontmatter, treat whole file as body
+
+    # --- Update metadata dictionary ---
+    updated_metadata = existing_metadata.copy()
+    updated_metadata.update(metadata_updates)
+
+    # --- Construct new content string ---
+    new_full_content = ""
+    if updated_metadata:
+        try:
+            new_yaml = yaml.dump(updated_metadata, allow_unicode=True, default_flow_style=False)
+            # Use concatenation
+            if head_only: # The body follows unchanged; only new frontmatter needs a line break after it
+                new_full_content = "---\n" + new_yaml + ("---" if content else "---\n")
+            else:
+                new_full_content = "---\n" + new_yaml + "---\n\n" + body_content
+        except yaml.YAMLError as e:
+            # Raise specific error for YAML dumping failure
+            raise MetadataError(f"[Meta] Failed to dump updated YAML for {relative_note_path}: {e}") from e
+    else:
+        # If no metadata after update, just write the body content back
+        new_full_content = body_content
+    return new_full_content
+
+
+HEAD_CHUNK_SIZE = 64 * 1024 # Read size while looking for the end of the frontmatter
+
+
+def _read_frontmatter_region(f):
+    """Reads from the start of an open binary file up to the end of its frontmatter.
+
+    Returns:
+        (head, body_offset): the bytes read, and the offset where the body starts
+        (0 if the note has no frontmatter, which is then not read past the first bytes).
+    """
+    from obsidian_mcp_server.utils.markdown_parser import frontmatter_end
+    head = f.read(HEAD_CHUNK_SIZE)
+    if not head.startswith(b"---"):
+        return head, 0
+    while True:
+        body_offset = frontmatter_end(head)
+        if body_offset:
+            return head, body_offset
+        chunk = f.read(HEAD_CHUNK_SIZE)
+        if not chunk:
+            return head, 0 # Unclosed frontmatter: the whole file is body
+        head += chunk
+
+
+def _write_with_new_head(full_path, new_head, body_offset):
+    """Replaces the first body_offset bytes of a file with new_head, leaving the rest as is.
+
+    Same-length heads are overwritten in place. Otherwise the file is rebuilt
+    next to the original (the body copied in the kernel with copy_file_range
+    where available) and swapped in atomically.
+    """
+    if len(new_head) == body_offset:
+        with open(full_path, 'r+b') as f:
+            f.write(new_head)
+        return
+    directory, name = os.path.split(full_path)
+    temp_path = os.path.join(directory, f".{name}.meta.tmp")
+    try:
+        with open(full_path, 'rb') as src, open(temp_path, 'wb') as dst:
+            dst.write(new_head)
+            dst.flush()
+            remaining = os.fstat(src.fileno()).st_size - body_offset
+            offset = body_offset
+            try:
+                while remaining > 0:
+                    copied = os.copy_file_range(src.fileno(), dst.fileno(), remaining, offset)
+                    if copied == 0:
+                        break
+                    offset += copied
+                    remaining -= copied
+            except (AttributeError, OSError): # No copy_file_range (or not across these files)
+                pass
+            src.seek(offset)
+            dst.seek(0, os.SEEK_END)
+            shutil.copyfileobj(src, dst)
+            body_size = os.fstat(src.fileno()).st_size - body_offset
+            if dst.tell() != len(new_head) + body_size: # The body must come through whole
+                raise VaultError(f"[Meta] Body copy of {full_path} is incomplete ({dst.tell() - len(new_head)} of {body_size} bytes)")
+        shutil.copymode(full_path, temp_path)
+        os.replace(temp_path, full_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
 def update_metadata(relative_note_path, metadata_updates, backup=True):
     """Updates the YAML frontmatter of an existing note.
 
+    Only the frontmatter is read and rewritten; the body's bytes are copied
+    through unchanged.
+
     Args:
         relative_note_path: Path to the note relative to the vault root.
         metadata_updates: Dictionary of metadata keys/values to add or overwrite.
@@ -206,59 +437,27 @@ def update_metadata(relative_note_path, metadata_updates, backup=True):
         BackupError: If backup fails during the edit.
         VaultError: For other vault access issues.
     """
-    full_path = os.path.join(VAULT_PATH, relative_note_path)
-    if not os.path.abspath(full_path).startswith(os.path.abspath(VAULT_PATH)):
+    full_path = os.path.join(vault_root(), relative_note_path)
+    if not os.path.abspath(full_path).startswith(os.path.abspath(vault_root())):
         raise InvalidPathError(f"[Meta] Attempted access outside vault: {relative_note_path}")
     # Check existence early - Reading below will fail anyway, but this is clearer.
     if not os.path.isfile(full_path):
          raise NoteNotFoundError(f"[Meta] Note not found for reading: {relative_note_path}")
 
     try: # Outer try block for the whole operation
-        # --- Step 1: Read existing content ---
+        # --- Step 1: Read the frontmatter region ---
         try:
-            with open(full_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(full_path, 'rb') as f:
+                head, body_offset = _read_frontmatter_region(f)
+            frontmatter = head[:body_offset].decode('utf-8')
         except Exception as e:
              # Catch read errors specifically
              raise VaultError(f"[Meta] Error reading note {relative_note_path}: {e}") from e
 
-        # --- Step 2: Parse existing metadata & body ---
-        existing_metadata = {}
-        body_content = content
-        if content.startswith("---"):
-            parts = content.split("---", 2)
-            if len(parts) >= 3:
-                frontmatter_yaml = parts[1]
-                body_content = parts[2].lstrip() # Remove leading whitespace/newline
-                try:
-                    loaded_meta = yaml.safe_load(frontmatter_yaml)
-                    if isinstance(loaded_meta, dict):
-                        existing_metadata = loaded_meta
-                    else:
-                        # Log warning but proceed, treating existing as invalid
-                        print(f"Warning [Meta]: Existing frontmatter in {relative_note_path} is not a dictionary. Discarding.")
-                except yaml.YAMLError as e:
-                    # Log warning but proceed, treating existing as invalid
-                    print(f"Warning [Meta]: Could not parse existing YAML in {relative_note_path}: {e}. Discarding existing.")
-            # else: Malformed frontmatter, treat whole file as body
-
-        # --- Step 3: Update metadata dictionary ---
-        updated_metadata = existing_metadata.copy()
-        updated_metadata.update(metadata_updates)
-
-        # --- Step 4: Construct new content string ---
-        new_full_content = ""
-        if updated_metadata:
-            try:
-                new_yaml = yaml.dump(updated_metadata, allow_unicode=True, default_flow_style=False)
-                # Use concatenation
-                new_full_content = "---\n" + new_yaml + "---\n\n" + body_content
-            except yaml.YAMLError as e:
-                # Raise specific error for YAML dumping failure
-                raise MetadataError(f"[Meta] Failed to dump updated YAML for {relative_note_path}: {e}") from e
-        else:
-            # If no metadata after update, just write the body content back
-            new_full_content = body_content
+        # --- Steps 2-4: Merge the updates into the frontmatter ---
+        new_head = merge_metadata(frontmatter, metadata_updates, relative_note_path, head_only=True).encode('utf-8')
+        if new_head == head[:body_offset]:
+            return True # Nothing to change
 
         # --- Step 5: Perform Backup ---
         if backup:
@@ -270,10 +469,11 @@ def update_metadata(relative_note_path, metadata_updates, backup=True):
             except Exception as backup_e:
                  raise BackupError(f"[Meta] Error during backup process for {relative_note_path}: {backup_e}") from backup_e
 
-        # --- Step 6: Write back updated content ---
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(new_full_content)
+        # --- Step 6: Replace the frontmatter bytes, keeping the body ---
+        _write_with_new_head(full_path, new_head, body_offset)
 
+        vault_index.notify_changed(relative_note_path)
+        change_journal.record_change("metadata", relative_note_path)
         return True
 
     # Handle specific errors caught during steps
@@ -299,10 +499,10 @@ def delete_note(relative_note_path: str, backup: bool = True) -> bool:
         BackupError: If backup is requested and fails.
         VaultError: For other vault access/deletion issues.
     """
-    full_path = os.path.join(VAULT_PATH, relative_note_path)
+    full_path = os.path.join(vault_root(), relative_note_path)
 
     # 1. Path Validation
-    if not os.path.abspath(full_path).startswith(os.path.abspath(VAULT_PATH)):
+    if not os.path.abspath(full_path).startswith(os.path.abspath(vault_root())):
         raise InvalidPathError(f"[Delete] Attempted access outside vault: {relative_note_path}")
 
     # 2. Check Existence
@@ -328,6 +528,8 @@ def delete_note(relative_note_path: str, backup: bool = True) -> bool:
         # Add explicit check
         if not os.path.exists(full_path):
             logger.info(f"[Delete] Verified file does not exist after removal: {relative_note_path}")
+            vault_index.notify_deleted(relative_note_path)
+            change_journal.record_change("delete", relative_note_path)
             return True
         else:
             logger.error(f"[Delete] CRITICAL: os.remove ran but file still exists: {full_path}")
@@ -350,7 +552,7 @@ def delete_note(relative_note_path: str, backup: bool = True) -> bool:
 if __name__ == '__main__':
     # Create a dummy file for testing backup
     dummy_rel_path = "_TestBackupNote.md"
-    dummy_full_path = os.path.join(VAULT_PATH, dummy_rel_path)
+    dummy_full_path = os.path.join(vault_root(), dummy_rel_path)
     try:
         with open(dummy_full_path, "w") as f:
             f.write("This is a test note for backup.\n")
@@ -377,10 +579,10 @@ if __name__ == '__main__':
     if create_note(new_note_rel_path, new_note_content, new_note_meta):
         print("Note creation test successful.")
         # Verify content (optional)
-        # with open(os.path.join(VAULT_PATH, new_note_rel_path), 'r', encoding='utf-8') as f:
+        # with open(os.path.join(vault_root(), new_note_rel_path), 'r', encoding='utf-8') as f:
         #     print("\nCreated note content:\n", f.read())
         # Clean up
-        # os.remove(os.path.join(VAULT_PATH, new_note_rel_path))
+        # os.remove(os.path.join(vault_root(), new_note_rel_path))
         # print(f"Cleaned up dummy note: {new_note_rel_path}")
     else:
         print("Note creation test failed.")
@@ -390,14 +592,14 @@ if __name__ == '__main__':
     edit_content = "# Test Note (Edited)\n\nThis content has been modified."
 
     # Ensure the note exists first (from create test)
-    if os.path.exists(os.path.join(VAULT_PATH, edit_note_rel_path)):
+    if os.path.exists(os.path.join(vault_root(), edit_note_rel_path)):
         if edit_note(edit_note_rel_path, edit_content, backup=True):
             print("Note edit test successful.")
             # Verify content (optional)
-            # with open(os.path.join(VAULT_PATH, edit_note_rel_path), 'r', encoding='utf-8') as f:
+            # with open(os.path.join(vault_root(), edit_note_rel_path), 'r', encoding='utf-8') as f:
             #     print("\nEdited note content:\n", f.read())
             # Clean up (optional)
-            # os.remove(os.path.join(VAULT_PATH, edit_note_rel_path))
+            # os.remove(os.path.join(vault_root(), edit_note_rel_path))
             # print(f"Cleaned up edited note: {edit_note_rel_path}")
         else:
             print("Note edit test failed.")
@@ -408,20 +610,20 @@ if __name__ == '__main__':
     append_note_rel_path = "_TestNewNote.md" # Same note as edit test
     append_content = "\n---\nThis content was appended."
 
-    if os.path.exists(os.path.join(VAULT_PATH, append_note_rel_path)):
+    if os.path.exists(os.path.join(vault_root(), append_note_rel_path)):
         if append_to_note(append_note_rel_path, append_content, backup=True):
             print("Note append test successful.")
             # Verify content (optional)
-            # with open(os.path.join(VAULT_PATH, append_note_rel_path), 'r', encoding='utf-8') as f:
+            # with open(os.path.join(vault_root(), append_note_rel_path), 'r', encoding='utf-8') as f:
             #     print("\nAppended note content:\n", f.read())
             # Clean up final test note
-            os.remove(os.path.join(VAULT_PATH, append_note_rel_path))
+            os.remove(os.path.join(vault_root(), append_note_rel_path))
             print(f"Cleaned up final test note: {append_note_rel_path}")
         else:
             print("Note append test failed.")
             # Clean up if append failed but file exists
-            if os.path.exists(os.path.join(VAULT_PATH, append_note_rel_path)):
-                 os.remove(os.path.join(VAULT_PATH, append_note_rel_path))
+            if os.path.exists(os.path.join(vault_root(), append_note_rel_path)):
+                 os.remove(os.path.join(vault_root(), append_note_rel_path))
                  print(f"Cleaned up test note after failed append: {append_note_rel_path}")
 
     else:
@@ -440,18 +642,18 @@ if __name__ == '__main__':
             # Verify (optional)
             # final_meta = vault_reader.get_note_metadata(meta_note_rel_path) # Needs vault_reader import
             # print(f"Updated metadata: {final_meta}")
-            # with open(os.path.join(VAULT_PATH, meta_note_rel_path), 'r', encoding='utf-8') as f:
+            # with open(os.path.join(vault_root(), meta_note_rel_path), 'r', encoding='utf-8') as f:
             #     print("\nUpdated note content:\n", f.read())
         else:
             print("Metadata update test failed.")
         # Clean up
-        os.remove(os.path.join(VAULT_PATH, meta_note_rel_path))
+        os.remove(os.path.join(vault_root(), meta_note_rel_path))
         print(f"Cleaned up metadata test note: {meta_note_rel_path}")
     else:
         print("Skipping metadata update test: Failed to create initial note.")
 
     # Final backup cleanup (ensure it runs after all tests)
-    backup_path = os.path.join(VAULT_PATH, BACKUP_DIR_NAME)
+    backup_path = os.path.join(vault_root(), BACKUP_DIR_NAME)
     if os.path.isdir(backup_path):
         try:
             shutil.rmtree(backup_path)
@@ -0,0 +1,20 @@
+"""HTTP protocol for the request workers started by workers.serve().
+
+uvicorn binds the shared socket of a multi-worker server without an explicit
+protocol number, and asyncio only disables Nagle's algorithm on connections
+whose socket reports IPPROTO_TCP. Without TCP_NODELAY every keep-alive
+response waits on the client's delayed ACK (~40ms per call).
+"""
+
+import socket
+from uvicorn.protocols.http.auto import AutoHTTPProtocol
+
+
+class NoDelayHTTPProtocol(AutoHTTPProtocol):
+    """uvicorn's default HTTP protocol with TCP_NODELAY set on every connection."""
+
+    def connection_made(self, transport):
+        sock = transport.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        super().connection_made(transport)
@@ -0,0 +1,169 @@
+"""Multi-process serving: one indexer process and several request workers.
+
+`obsidian-mcp-server --transport streamable-http --workers N` starts:
+
+*   The indexer (the launching process). It owns every vault's catalog,
+    publishes immutable index snapshots (see utils/index_snapshot.py) after
+    each change, and executes all write tools, so writes are serialized in
+    one place.
+*   N uvicorn worker processes sharing the listening socket. Each serves the
+    MCP app over stateless streamable HTTP, answers reads from the mapped
+    snapshots and forwards write tools to the indexer.
+"""
+
+import os
+import shutil
+import secrets
+import tempfile
+import threading
+import logging
+from multiprocessing.connection import Listener, Client
+# Import config, registry and exceptions
+from obsidian_mcp_server.config import settings
+from obsidian_mcp_server.utils import vault_registry, index_snapshot
+from obsidian_mcp_server.utils.exceptions import VaultError
+
+logger = logging.getLogger(__name__)
+
+# Handshake between the indexer and the workers it starts (inherited through the environment)
+ENV_SNAPSHOT_DIR = "OMCP_WORKER_SNAPSHOT_DIR"
+ENV_INDEXER_ADDRESS = "OMCP_WORKER_INDEXER_ADDRESS"
+ENV_INDEXER_AUTHKEY = "OMCP_WORKER_INDEXER_AUTHKEY"
+
+
+def is_worker():
+    """True in a request worker process started by serve()."""
+    return ENV_SNAPSHOT_DIR in os.environ
+
+
+# --- Indexer side ---
+
+class Indexer:
+    """Owns the vault indexes, publishes snapshots and executes forwarded writes."""
+
+    def __init__(self, snapshot_dir):
+        self.snapshot_dir = snapshot_dir
+        self.authkey = secrets.token_bytes(32)
+        self.listener = Listener(("127.0.0.1", 0), authkey=self.authkey)
+        self._write_lock = threading.Lock() # Serializes writes and snapshot publishing
+        self._published = {}                # vault name -> last published generation
+        self._stop = threading.Event()
+
+    @property
+    def address(self):
+        host, port = self.listener.address
+        return f"{host}:{port}"
+
+    def start(self):
+        """Publishes the initial snapshots, then starts the publisher and RPC threads."""
+        self.publish(vault_registry.iter_vaults())
+        threading.Thread(target=self._publish_loop, name="omcp-publisher", daemon=True).start()
+        threading.Thread(target=self._accept_loop, name="omcp-indexer", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        self.listener.close()
+
+    def publish(self, vaults):
+        with self._write_lock:
+            index_snapshot.publish_all(vaults, self.snapshot_dir, self._published)
+
+    def _publish_loop(self):
+        # Picks up edits made outside the server (e.g. in Obsidian itself)
+        while not self._stop.wait(settings.index_rescan_interval):
+            try:
+                self.publish(vault_registry.iter_vaults())
+            except Exception as e:
+                logger.error(f"[Indexer] Failed to publish snapshots: {e}")
+
+    def _accept_loop(self):
+        while not self._stop.is_set():
+            try:
+                connection = self.listener.accept()
+            except Exception as e:
+                if not self._stop.is_set():
+                    logger.warning(f"[Indexer] Rejected worker connection: {e}")
+                continue
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection):
+        """Executes the write tool calls sent by one worker, in order."""
+        from obsidian_mcp_server.mcp_server import WRITE_TOOLS
+        with connection:
+            while True:
+                try:
+                    name, vault, args, kwargs = connection.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    with self._write_lock:
+                        with vault_registry.use_vault(vault) as target:
+                            result = WRITE_TOOLS[name](*args, **kwargs)
+                        # Publish before replying, so the caller's next read sees its own write
+                        index_snapshot.publish_all([target], self.snapshot_dir, self._published)
+                    reply = (True, result)
+                except Exception as e:
+                    reply = (False, e if isinstance(e, VaultError) else VaultError(f"{type(e).__name__}: {e}"))
+                connection.send(reply)
+
+
+def serve(workers):
+    """Runs the indexer in this process and `workers` request worker processes (blocks until shutdown)."""
+    import uvicorn
+    from obsidian_mcp_server.worker_http import NoDelayHTTPProtocol
+    snapshot_dir = tempfile.mkdtemp(prefix="omcp-snapshots-")
+    indexer = Indexer(snapshot_dir)
+    try:
+        indexer.start()
+        os.environ[ENV_SNAPSHOT_DIR] = snapshot_dir
+        os.environ[ENV_INDEXER_ADDRESS] = indexer.address
+        os.environ[ENV_INDEXER_AUTHKEY] = indexer.authkey.hex()
+        uvicorn.run(
+            "obsidian_mcp_server.workers:create_worker_app", factory=True,
+            host=settings.server_host, port=settings.server_port, workers=workers,
+            http=NoDelayHTTPProtocol
+        )
+    finally:
+        indexer.stop()
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+
+# --- Worker side ---
+
+_connection = None
+_connection_lock = threading.Lock()
+
+
+def create_worker_app():
+    """uvicorn app factory, called once in each worker process."""
+    from obsidian_mcp_server.mcp_server import mcp_app
+    snapshot_dir = os.environ[ENV_SNAPSHOT_DIR]
+    vault_registry.set_index_factory(
+        lambda vault: index_snapshot.SnapshotIndex(vault.path, snapshot_dir, vault.name)
+    )
+    # No per-client session state: any worker can serve any request
+    mcp_app.settings.stateless_http = True
+    mcp_app.settings.json_response = True
+    return mcp_app.streamable_http_app()
+
+
+def forward_write(name, vault, args, kwargs):
+    """Executes a write tool in the indexer process and returns its result.
+
+    Raises:
+        VaultError (or subclasses): Raised by the tool, or if the indexer is unreachable.
+    """
+    global _connection
+    with _connection_lock:
+        try:
+            if _connection is None:
+                host, port = os.environ[ENV_INDEXER_ADDRESS].rsplit(":", 1)
+                _connection = Client((host, int(port)), authkey=bytes.fromhex(os.environ[ENV_INDEXER_AUTHKEY]))
+            _connection.send((name, vault, args, kwargs))
+            ok, value = _connection.recv()
+        except (EOFError, OSError) as e:
+            _connection = None # Reconnect on the next write
+            raise VaultError(f"[Workers] Indexer unavailable for {name}: {e}") from e
+    if not ok:
+        raise value
+    return value